@@ -0,0 +1,177 @@
+"""Write generated projects straight into a tar.gz or zip archive.
+
+Projects shipped to other systems used to be rendered to disk, archived and
+then deleted. Here the project is rendered in memory, the post-generation
+hook's renames and deletions are applied to the file list, and each file is
+streamed into the archive, so no project directory is ever written.
+
+Archive members keep the template file's permissions and are stored under
+the project directory name, so extracting an archive gives the same tree
+that ``nhs-rap-template`` would have written.
+"""
+
+import gzip
+import io
+import os
+import tarfile
+import time
+import zipfile
+from enum import Enum
+from pathlib import Path
+from typing import Any, BinaryIO
+
+from nhse_rap_cookiecutter.rendering import RenderedFile, render_project_in_memory
+from nhse_rap_cookiecutter.update import ANSWERS_FILE, with_template_source
+
+
+class ArchiveFormat(str, Enum):
+    """Archive formats a project can be written to."""
+
+    TAR_GZ = "tar.gz"
+    ZIP = "zip"
+
+
+def file_mode(rendered_file: RenderedFile) -> int:
+    """Return the permission bits of the template file a project file came from."""
+    try:
+        return rendered_file.source.stat().st_mode & 0o777
+    except OSError:
+        return 0o644
+
+
+def record_source(files: dict[str, RenderedFile], source: str | None, commit: str | None) -> None:
+    """Record the template source in an in-memory project's answers file.
+
+    Parameters
+    ----------
+    files : dict[str, RenderedFile]
+        Project files by relative path, updated in place
+    source : str | None
+        Template path, URL or abbreviation; nothing is recorded if None
+    commit : str | None
+        Template commit to record alongside ``source``
+    """
+    if source is None or ANSWERS_FILE not in files:
+        return
+    answers = files[ANSWERS_FILE]
+    content = with_template_source(answers.content.decode("utf-8"), source, commit)
+    files[ANSWERS_FILE] = RenderedFile(answers.path, content.encode("utf-8"), answers.source)
+
+
+def write_archive(
+    files: dict[str, RenderedFile],
+    root: str,
+    fileobj: BinaryIO,
+    archive_format: ArchiveFormat,
+    compresslevel: int = 6,
+) -> None:
+    """Stream project files into an archive.
+
+    The output is written sequentially, so ``fileobj`` may be a socket or
+    pipe as well as a file.
+
+    Parameters
+    ----------
+    files : dict[str, RenderedFile]
+        Project files by relative path
+    root : str
+        Directory name every member is stored under
+    fileobj : BinaryIO
+        Writable binary stream to write the archive to
+    archive_format : ArchiveFormat
+        Format of the archive
+    compresslevel : int, optional
+        Compression level, from 1 (fastest) to 9 (smallest)
+    """
+    mtime = int(time.time())
+    if archive_format == ArchiveFormat.ZIP:
+        date_time = time.localtime(mtime)[:6]
+        with zipfile.ZipFile(
+            fileobj, "w", zipfile.ZIP_DEFLATED, compresslevel=compresslevel
+        ) as zf:
+            for relative, rendered_file in files.items():
+                info = zipfile.ZipInfo(f"{root}/{relative}", date_time)
+                info.compress_type = zipfile.ZIP_DEFLATED
+                info.external_attr = (0o100000 | file_mode(rendered_file)) << 16
+                zf.writestr(info, rendered_file.content)
+        return
+
+    with (
+        gzip.GzipFile(fileobj=fileobj, mode="wb", compresslevel=compresslevel, mtime=mtime) as gz,
+        tarfile.open(fileobj=gz, mode="w|") as tar,
+    ):
+        for relative, rendered_file in files.items():
+            info = tarfile.TarInfo(f"{root}/{relative}")
+            info.size = len(rendered_file.content)
+            info.mode = file_mode(rendered_file)
+            info.mtime = mtime
+            tar.addfile(info, io.BytesIO(rendered_file.content))
+
+
+def archive_project(
+    template_dir: str | Path,
+    output_dir: str | Path,
+    archive_format: ArchiveFormat,
+    extra_context: dict[str, Any] | None = None,
+    *,
+    no_input: bool = True,
+    config_file: str | None = None,
+    overwrite_if_exists: bool = False,
+    source: str | None = None,
+    commit: str | None = None,
+) -> Path:
+    """Render a project from a local template directly into an archive.
+
+    Parameters
+    ----------
+    template_dir : str | Path
+        Local template checkout
+    output_dir : str | Path
+        Directory to write the archive into
+    archive_format : ArchiveFormat
+        Format of the archive
+    extra_context : dict[str, Any] | None, optional
+        Values overriding the defaults in cookiecutter.json
+    no_input : bool, optional
+        Use the defaults instead of prompting for each variable
+    config_file : str | None, optional
+        User configuration file
+    overwrite_if_exists : bool, optional
+        Replace the archive if it already exists
+    source : str | None, optional
+        Template path, URL or abbreviation to record in the project's answers
+        file (nothing is recorded if None)
+    commit : str | None, optional
+        Template commit to record alongside ``source``
+
+    Returns
+    -------
+    Path
+        Path to the archive, named after the project directory
+
+    Raises
+    ------
+    FileExistsError
+        If the archive exists and ``overwrite_if_exists`` is False
+    """
+    project_name, files = render_project_in_memory(
+        template_dir, extra_context, config_file, no_input
+    )
+    record_source(files, source, commit)
+
+    output_dir = Path(output_dir)
+    archive_path = output_dir / f"{project_name}.{archive_format.value}"
+    if archive_path.exists() and not overwrite_if_exists:
+        raise FileExistsError(f'"{archive_path}" already exists')
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    # Write beside the target and rename, so an interrupted write leaves no partial archive
+    partial = output_dir / f".{archive_path.name}.{os.getpid()}.part"
+    try:
+        with open(partial, "wb") as f:
+            write_archive(files, project_name, f, archive_format)
+        os.replace(partial, archive_path)
+    except BaseException:
+        partial.unlink(missing_ok=True)
+        raise
+    return archive_path
@@ -0,0 +1,257 @@
+"""Generate many projects from one template in a single process.
+
+A batch manifest is a YAML (or JSON) file listing project contexts::
+
+    template: gh:nhsengland/nhse-rap-cookiecutter   # optional
+    checkout: v1.0.0                                 # optional
+    defaults:                                        # optional, shared by every project
+      organization_name: NHS England
+    projects:
+      - project_name: Team A Analysis
+      - project_name: Team B Analysis
+        environment_manager: conda
+
+A plain list of project contexts is also accepted. Projects may only set the
+variables in the template's cookiecutter.json. The template is resolved
+once and every project is rendered with the warm in-process renderer, so the
+template fetch, cookiecutter import and Jinja setup are paid once per batch
+rather than once per project.
+"""
+
+from collections.abc import Callable, Collection, Iterator
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import yaml
+
+from nhse_rap_cookiecutter.rendering import render_project
+
+
+class ManifestError(ValueError):
+    """Raised when a batch manifest is malformed."""
+
+
+@dataclass
+class BatchManifest:
+    """Projects to generate, read from a batch manifest.
+
+    Attributes
+    ----------
+    projects : list[dict[str, Any]]
+        Extra context for each project, with the manifest defaults applied
+    template : str | None
+        Template path, URL or abbreviation, if the manifest sets one
+    checkout : str | None
+        Branch, tag or commit of the template, if the manifest sets one
+    """
+
+    projects: list[dict[str, Any]]
+    template: str | None = None
+    checkout: str | None = None
+
+
+@dataclass
+class BatchResult:
+    """Outcome of generating one project in a batch.
+
+    Attributes
+    ----------
+    name : str
+        Project name, or its position in the manifest if it has none
+    project_dir : Path | None
+        Generated project directory, if generation succeeded
+    error : str | None
+        Error message, if generation failed
+    """
+
+    name: str
+    project_dir: Path | None = None
+    error: str | None = None
+
+
+def check_variables(projects: list[dict[str, Any]], variables: Collection[str]) -> None:
+    """Check every project only sets variables the template asks for.
+
+    Parameters
+    ----------
+    projects : list[dict[str, Any]]
+        Extra context for each project, in manifest order
+    variables : Collection[str]
+        Public variables of the template, from cookiecutter.json
+
+    Raises
+    ------
+    ManifestError
+        Naming the first project, by its position in the manifest, that sets
+        an unknown variable
+    """
+    for index, project in enumerate(projects, start=1):
+        for key in project:
+            if key not in variables:
+                raise ManifestError(f"Project {index}: unknown template variable {key!r}")
+
+
+def load_manifest(
+    manifest_path: str | Path, variables: Collection[str] | None = None
+) -> BatchManifest:
+    """Load and validate a batch manifest.
+
+    Parameters
+    ----------
+    manifest_path : str | Path
+        YAML or JSON manifest file
+    variables : Collection[str] | None, optional
+        Public variables of the template. If given, projects setting any
+        other variable are rejected; otherwise call :func:`check_variables`
+        once the template is known.
+
+    Returns
+    -------
+    BatchManifest
+        Projects with defaults applied, and the template to use
+
+    Raises
+    ------
+    ManifestError
+        If the manifest is not a list of mappings or a mapping with a
+        ``projects`` list, or a project sets a variable not in ``variables``
+    """
+    with open(manifest_path, encoding="utf-8") as f:
+        data = yaml.safe_load(f)
+
+    if isinstance(data, list):
+        data = {"projects": data}
+    if not isinstance(data, dict) or not isinstance(data.get("projects"), list):
+        raise ManifestError(f"{manifest_path} must contain a 'projects' list")
+
+    unknown = set(data) - {"template", "checkout", "defaults", "projects"}
+    if unknown:
+        raise ManifestError(f"Unknown manifest key(s): {', '.join(sorted(unknown))}")
+
+    defaults = data.get("defaults") or {}
+    if not isinstance(defaults, dict):
+        raise ManifestError("'defaults' must be a mapping")
+
+    projects = []
+    for index, project in enumerate(data["projects"], start=1):
+        if not isinstance(project, dict):
+            raise ManifestError(f"Project {index} must be a mapping of template variables")
+        projects.append({**defaults, **project})
+    if variables is not None:
+        check_variables(projects, variables)
+    return BatchManifest(projects, data.get("template"), data.get("checkout"))
+
+
+def project_label(extra_context: dict[str, Any], index: int) -> str:
+    """Return the name a project is reported under."""
+    return str(extra_context.get("project_name") or f"project {index}")
+
+
+def generate_one(
+    template: str,
+    extra_context: dict[str, Any],
+    output_dir: str | Path,
+    name: str,
+    overwrite_if_exists: bool = False,
+    config_file: str | None = None,
+) -> BatchResult:
+    """Generate one project of a batch, capturing any error.
+
+    Parameters
+    ----------
+    template : str
+        Local template directory
+    extra_context : dict[str, Any]
+        Values overriding the defaults in cookiecutter.json
+    output_dir : str | Path
+        Directory to write the project into
+    name : str
+        Name to report the project under
+    overwrite_if_exists : bool, optional
+        Overwrite the project directory if it already exists
+    config_file : str | None, optional
+        User configuration file
+
+    Returns
+    -------
+    BatchResult
+        Generated directory or error message
+    """
+    try:
+        project_dir = render_project(
+            template,
+            output_dir,
+            extra_context,
+            overwrite_if_exists=overwrite_if_exists,
+            config_file=config_file,
+        )
+    except Exception as e:
+        return BatchResult(name, error=str(e) or type(e).__name__)
+    return BatchResult(name, project_dir)
+
+
+def generate_batch(
+    template: str,
+    projects: list[dict[str, Any]],
+    output_dir: str | Path,
+    jobs: int = 1,
+    overwrite_if_exists: bool = False,
+    config_file: str | None = None,
+    on_result: Callable[[BatchResult], None] | None = None,
+) -> list[BatchResult]:
+    """Generate every project of a batch from an already resolved template.
+
+    Parameters
+    ----------
+    template : str
+        Local template directory
+    projects : list[dict[str, Any]]
+        Extra context for each project
+    output_dir : str | Path
+        Directory to write the projects into
+    jobs : int, optional
+        Number of worker processes; 1 renders everything in this process
+    overwrite_if_exists : bool, optional
+        Overwrite project directories that already exist
+    config_file : str | None, optional
+        User configuration file
+    on_result : Callable[[BatchResult], None] | None, optional
+        Called with each result as soon as its project finishes
+
+    Returns
+    -------
+    list[BatchResult]
+        One result per project, in manifest order
+    """
+    tasks = [
+        (
+            template,
+            context,
+            output_dir,
+            project_label(context, index),
+            overwrite_if_exists,
+            config_file,
+        )
+        for index, context in enumerate(projects, start=1)
+    ]
+
+    def run() -> Iterator[tuple[int, BatchResult]]:
+        if jobs <= 1 or len(tasks) <= 1:
+            for index, task in enumerate(tasks):
+                yield index, generate_one(*task)
+            return
+        with ProcessPoolExecutor(max_workers=min(jobs, len(tasks))) as executor:
+            futures = {
+                executor.submit(generate_one, *task): index for index, task in enumerate(tasks)
+            }
+            for future in as_completed(futures):
+                yield futures[future], future.result()
+
+    results: list[BatchResult | None] = [None] * len(tasks)
+    for index, result in run():
+        results[index] = result
+        if on_result is not None:
+            on_result(result)
+    return results
@@ -1,15 +1,67 @@
-"""Command-line interface for NHS RAP Cookiecutter Template."""
+"""Command-line interface for NHS RAP Cookiecutter Template.
+
+Only click is imported at module level. Cookiecutter, Jinja2 and the
+template cache are imported inside the commands that use them, so ``--help``
+and argument errors return without loading them. A test in
+tests/test_cli_startup.py enforces this.
+"""
 
 import sys
 
 import click
-from cookiecutter.main import cookiecutter
 
 # GitHub repository URL for the template
 TEMPLATE_REPO = "gh:nhsengland/nhse-rap-cookiecutter"
 
 
-@click.command()
+class DefaultCommandGroup(click.Group):
+    """Command group that runs a default command when no subcommand is named.
+
+    This keeps ``nhs-rap-template [TEMPLATE] [OPTIONS]`` working alongside
+    subcommands such as ``nhs-rap-template batch``.
+    """
+
+    def __init__(self, *args, default_command: str, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.default_command = default_command
+
+    def parse_args(self, ctx, args):
+        """Prepend the default command unless the first argument names a subcommand."""
+        if not args or args[0] not in self.commands:
+            args = [self.default_command, *args]
+        return super().parse_args(ctx, args)
+
+
+class DefaultCommand(click.Command):
+    """Default command of a :class:`DefaultCommandGroup`.
+
+    ``nhs-rap-template --help`` is handled by the default command, so its help
+    also lists the group's subcommands.
+    """
+
+    def format_help(self, ctx, formatter):
+        """Write the command's help, followed by the group's subcommands."""
+        super().format_help(ctx, formatter)
+        if ctx.parent is not None and isinstance(ctx.parent.command, click.Group):
+            ctx.parent.command.format_commands(ctx.parent, formatter)
+
+
+def fail(error: Exception, debug: bool) -> None:
+    """Report an error, with its traceback if debugging, and exit with status 1."""
+    import traceback
+
+    click.echo(f"Error: {error}", err=True)
+    if debug:
+        traceback.print_exc()
+    sys.exit(1)
+
+
+@click.group(cls=DefaultCommandGroup, default_command="create")
+def main():
+    """Generate NHS RAP projects from the cookiecutter template."""
+
+
+@main.command(cls=DefaultCommand)
 @click.argument("template", default=TEMPLATE_REPO)
 @click.option(
     "-c",
@@ -34,36 +86,440 @@ TEMPLATE_REPO = "gh:nhsengland/nhse-rap-cookiecutter"
     type=click.Path(),
     help="Where to output the generated project dir",
 )
+@click.option(
+    "--offline",
+    is_flag=True,
+    help="Use the cached template checkout without contacting the remote",
+)
+@click.option(
+    "--no-cache",
+    is_flag=True,
+    help="Clone the template afresh instead of using the local template cache",
+)
+@click.option(
+    "--archive",
+    "archive_format",
+    type=click.Choice(["tar.gz", "zip"]),
+    default=None,
+    help="Write the project straight into an archive instead of a directory",
+)
 @click.option(
     "--debug",
     is_flag=True,
     help="Show full traceback on error",
 )
-def main(template, checkout, no_input, config_file, output_dir, debug):
+def create(
+    template, checkout, no_input, config_file, output_dir, offline, no_cache, archive_format, debug
+):
     """Generate a new NHS RAP project from the cookiecutter template.
 
     TEMPLATE is the path or URL to the template. Defaults to the NHS RAP
-    cookiecutter template from GitHub.
+    cookiecutter template from GitHub. Git templates are cached locally and
+    only fetched again when the requested ref moves.
+
+    With --archive, the project is written straight into <repo_name>.tar.gz
+    (or .zip) in the output directory, without creating the project directory.
+
+    To generate many projects at once, see ``nhs-rap-template batch --help``.
     """
+    if offline and no_cache:
+        raise click.UsageError("--offline and --no-cache cannot be used together")
+    if archive_format is not None:
+        create_archive(
+            template,
+            checkout,
+            no_input,
+            config_file,
+            output_dir,
+            offline,
+            no_cache,
+            archive_format,
+            debug,
+        )
+        return
     try:
-        cookiecutter(
+        from cookiecutter.config import get_user_config
+
+        from nhse_rap_cookiecutter.rendering import render_project
+        from nhse_rap_cookiecutter.template_cache import cached_template, template_commit
+        from nhse_rap_cookiecutter.update import record_template_source
+
+        source = template
+        if not no_cache:
+            abbreviations = get_user_config(config_file=config_file)["abbreviations"]
+            template, checkout = cached_template(template, checkout, offline, abbreviations)
+        # Renders with the persistent Jinja bytecode cache
+        project_dir = render_project(
             template,
+            output_dir,
             checkout=checkout,
             no_input=no_input,
-            extra_context=None,
-            replay=False,
-            overwrite_if_exists=False,
-            output_dir=output_dir,
             config_file=config_file,
         )
+        record_template_source(project_dir, source, template_commit(template))
     except Exception as e:
-        import traceback
+        fail(e, debug)
+
+
+def create_archive(
+    template, checkout, no_input, config_file, output_dir, offline, no_cache, archive_format, debug
+):
+    """Render a project into an archive for ``create --archive``."""
+    import tempfile
+    from pathlib import Path
+
+    try:
+        from cookiecutter.config import get_user_config
+
+        from nhse_rap_cookiecutter.archive import ArchiveFormat, archive_project
+        from nhse_rap_cookiecutter.template_cache import cached_template, template_commit
+
+        abbreviations = get_user_config(config_file=config_file)["abbreviations"]
+        with tempfile.TemporaryDirectory() as scratch_cache:
+            # Rendering in memory needs a local checkout, so without the cache
+            # clone into a throwaway one
+            root = Path(scratch_cache) if no_cache else None
+            local, _ = cached_template(template, checkout, offline, abbreviations, root)
+            archive_path = archive_project(
+                local,
+                output_dir,
+                ArchiveFormat(archive_format),
+                no_input=no_input,
+                config_file=config_file,
+                source=template,
+                commit=template_commit(local),
+            )
+    except Exception as e:
+        fail(e, debug)
+    click.echo(archive_path)
+
+
+@main.command()
+@click.argument("manifest", type=click.Path(exists=True, dir_okay=False))
+@click.option(
+    "-t",
+    "--template",
+    default=None,
+    help="Path or URL to the template [default: manifest 'template', else the NHS RAP template]",
+)
+@click.option(
+    "-c",
+    "--checkout",
+    default=None,
+    help="Branch, tag, or commit to checkout [default: manifest 'checkout']",
+)
+@click.option(
+    "-j",
+    "--jobs",
+    default=1,
+    type=click.IntRange(min=1),
+    help="Number of projects to generate in parallel",
+)
+@click.option(
+    "--config-file",
+    type=click.Path(exists=True),
+    help="User configuration file",
+)
+@click.option(
+    "-o",
+    "--output-dir",
+    default=".",
+    type=click.Path(),
+    help="Where to output the generated project dirs",
+)
+@click.option(
+    "-f",
+    "--overwrite-if-exists",
+    is_flag=True,
+    help="Overwrite project directories that already exist",
+)
+@click.option(
+    "--offline",
+    is_flag=True,
+    help="Use the cached template checkout without contacting the remote",
+)
+@click.option(
+    "--no-cache",
+    is_flag=True,
+    help="Clone the template afresh instead of using the local template cache",
+)
+@click.option(
+    "--debug",
+    is_flag=True,
+    help="Show full traceback on error",
+)
+def batch(
+    manifest,
+    template,
+    checkout,
+    jobs,
+    config_file,
+    output_dir,
+    overwrite_if_exists,
+    offline,
+    no_cache,
+    debug,
+):
+    """Generate every project listed in a MANIFEST file, without prompting.
+
+    MANIFEST is a YAML file with a 'projects' list of template variables for
+    each project, and optional 'defaults', 'template' and 'checkout' keys.
+    The template is fetched once and all projects are rendered in one
+    process (or --jobs worker processes).
+    """
+    import tempfile
+    from pathlib import Path
+
+    if offline and no_cache:
+        raise click.UsageError("--offline and --no-cache cannot be used together")
+    try:
+        from cookiecutter.config import get_user_config
+
+        from nhse_rap_cookiecutter.batch import check_variables, generate_batch, load_manifest
+        from nhse_rap_cookiecutter.rendering import template_variables
+        from nhse_rap_cookiecutter.template_cache import cached_template, template_commit
+        from nhse_rap_cookiecutter.update import record_template_source
+
+        loaded = load_manifest(manifest)
+        source = template or loaded.template or TEMPLATE_REPO
+        checkout = checkout or loaded.checkout
+        abbreviations = get_user_config(config_file=config_file)["abbreviations"]
+
+        with tempfile.TemporaryDirectory() as scratch_cache:
+            # Without the cache, clone once into a throwaway cache for this batch
+            root = Path(scratch_cache) if no_cache else None
+            template, _ = cached_template(source, checkout, offline, abbreviations, root)
+            commit = template_commit(template)
+            check_variables(loaded.projects, template_variables(template))
+
+            def report(result) -> None:
+                if result.error is None:
+                    record_template_source(result.project_dir, source, commit)
+                    click.echo(f"  ok      {result.name} -> {result.project_dir}")
+                else:
+                    click.echo(f"  FAILED  {result.name}: {result.error}", err=True)
 
-        click.echo(f"Error: {e}", err=True)
-        if debug:
-            traceback.print_exc()
+            click.echo(f"Generating {len(loaded.projects)} project(s) from {template}")
+            results = generate_batch(
+                template,
+                loaded.projects,
+                output_dir,
+                jobs=jobs,
+                overwrite_if_exists=overwrite_if_exists,
+                config_file=config_file,
+                on_result=report,
+            )
+    except Exception as e:
+        fail(e, debug)
+
+    failed = [result for result in results if result.error is not None]
+    click.echo(f"{len(results) - len(failed)} succeeded, {len(failed)} failed")
+    if failed:
         sys.exit(1)
 
 
+@main.command()
+@click.argument("project", default=".", type=click.Path(exists=True, file_okay=False))
+@click.option(
+    "-t",
+    "--template",
+    default=None,
+    help="Path or URL to the template [default: the one recorded in the project]",
+)
+@click.option(
+    "-c",
+    "--checkout",
+    default=None,
+    help="Branch, tag, or commit to update to [default: the default branch]",
+)
+@click.option(
+    "--from",
+    "from_ref",
+    default=None,
+    help="Template commit the project was generated from [default: the recorded one]",
+)
+@click.option(
+    "--dry-run",
+    is_flag=True,
+    help="List the files that would change without changing them",
+)
+@click.option(
+    "--config-file",
+    type=click.Path(exists=True),
+    help="User configuration file",
+)
+@click.option(
+    "--offline",
+    is_flag=True,
+    help="Use cached template checkouts without contacting the remote",
+)
+@click.option(
+    "--debug",
+    is_flag=True,
+    help="Show full traceback on error",
+)
+def update(project, template, checkout, from_ref, dry_run, config_file, offline, debug):
+    """Update PROJECT to a newer version of the template.
+
+    The project is rendered from its recorded answers at the template commit
+    it was generated from and at the new ref. Only files that differ between
+    the two renders are changed: untouched files are replaced, edited files
+    are three-way merged, and overlapping edits are left with conflict
+    markers. Exits with status 1 if any file needs resolving by hand.
+    """
+    from pathlib import Path
+
+    try:
+        from cookiecutter.config import get_user_config
+
+        from nhse_rap_cookiecutter.template_cache import cached_template, template_commit
+        from nhse_rap_cookiecutter.update import (
+            load_answers,
+            record_template_source,
+            update_project,
+        )
+
+        answers = load_answers(project)
+        source = template or answers.get("_template") or TEMPLATE_REPO
+        from_ref = from_ref or answers.get("_commit")
+        if not from_ref:
+            raise click.UsageError(
+                "The project does not record the template commit it was generated "
+                "from; pass it with --from"
+            )
+
+        # A local clone is read through git, so that any commit can be checked out
+        url = Path(source).resolve().as_uri() if Path(source).is_dir() else source
+        abbreviations = get_user_config(config_file=config_file)["abbreviations"]
+        old_template, _ = cached_template(url, from_ref, offline, abbreviations)
+        new_template, _ = cached_template(url, checkout, offline, abbreviations)
+        new_commit = template_commit(new_template)
+        target = new_commit or checkout or "latest"
+        click.echo(f"Updating {project} from {from_ref[:12]} to {target[:12]}")
+
+        report = update_project(project, old_template, new_template, dry_run)
+        if not dry_run:
+            record_template_source(project, source, new_commit)
+    except click.UsageError:
+        raise
+    except Exception as e:
+        fail(e, debug)
+
+    for label, paths in (
+        ("updated", report.updated),
+        ("added", report.added),
+        ("removed", report.removed),
+        ("CONFLICT", report.conflicts),
+    ):
+        for path in paths:
+            click.echo(f"  {label:<9}{path}")
+    if not report:
+        click.echo("Already up to date")
+    if report.conflicts:
+        click.echo(
+            f"{len(report.conflicts)} file(s) need resolving by hand: look for conflict "
+            "markers, or files kept locally that the template removed",
+            err=True,
+        )
+        sys.exit(1)
+
+
+@main.command()
+@click.option(
+    "-t",
+    "--template",
+    default=TEMPLATE_REPO,
+    show_default=True,
+    help="Path or URL to the template to serve",
+)
+@click.option(
+    "-c",
+    "--checkout",
+    default=None,
+    help="Branch, tag, or commit of the template to serve",
+)
+@click.option("--host", default="127.0.0.1", show_default=True, help="Address to listen on")
+@click.option("--port", default=8000, show_default=True, type=int, help="TCP port to listen on")
+@click.option(
+    "--allow-remote",
+    is_flag=True,
+    help="Allow --host to be a non-loopback address (the service has no authentication)",
+)
+@click.option(
+    "--unix-socket",
+    default=None,
+    type=click.Path(dir_okay=False),
+    help="Listen on this Unix socket instead of a TCP port",
+)
+@click.option(
+    "--config-file",
+    type=click.Path(exists=True),
+    help="User configuration file",
+)
+@click.option(
+    "--offline",
+    is_flag=True,
+    help="Use the cached template checkout without contacting the remote",
+)
+@click.option("-v", "--verbose", is_flag=True, help="Log every request")
+@click.option(
+    "--debug",
+    is_flag=True,
+    help="Show full traceback on error",
+)
+def serve(
+    template,
+    checkout,
+    host,
+    port,
+    allow_remote,
+    unix_socket,
+    config_file,
+    offline,
+    verbose,
+    debug,
+):
+    """Serve project generation over local HTTP, keeping the template warm.
+
+    POST a JSON object of template variables to /generate to receive the
+    generated project as a .tar.gz; GET /health reports the template served.
+    """
+    try:
+        from cookiecutter.config import get_user_config
+
+        from nhse_rap_cookiecutter.server import is_loopback, make_server
+        from nhse_rap_cookiecutter.template_cache import cached_template, template_commit
+
+        abbreviations = get_user_config(config_file=config_file)["abbreviations"]
+        template_dir, _ = cached_template(template, checkout, offline, abbreviations)
+        server = make_server(
+            template_dir,
+            template,
+            template_commit(template_dir),
+            host=host,
+            port=port,
+            unix_socket=unix_socket,
+            verbose=verbose,
+            allow_remote=allow_remote,
+        )
+    except Exception as e:
+        fail(e, debug)
+
+    if unix_socket is None and not is_loopback(host):
+        click.echo(
+            f"Warning: listening on {host} without authentication; anyone who can reach "
+            "it can generate projects",
+            err=True,
+        )
+    where = unix_socket or f"http://{host}:{server.server_address[1]}"
+    click.echo(f"Serving {template} on {where} (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,134 @@
+"""Copy files with the cheapest mechanism the filesystem supports.
+
+Binary and ``_copy_without_render`` assets (images, HTML, CSS and JavaScript)
+are copied into every generated project unchanged. :func:`copy_file` tries, in
+order:
+
+1. a reflink (``FICLONE``), which shares the source's blocks copy-on-write on
+   filesystems such as Btrfs and XFS and writes no data at all
+2. ``os.copy_file_range``, which copies inside the kernel and lets the
+   filesystem offload or share the copy
+3. ``os.sendfile``, which copies inside the kernel
+4. a plain read/write loop
+
+A mechanism that fails for a pair of devices is not tried again for that
+pair. One that stops before the whole file is copied (for example because the
+source shrank) falls back for that file only.
+"""
+
+import errno
+import os
+import shutil
+import sys
+
+# ioctl request number for FICLONE on Linux (_IOW(0x94, 9, int))
+FICLONE = 0x40049409
+
+# Errors meaning "this mechanism is not available here", rather than a failed copy
+_UNSUPPORTED_ERRNOS = {
+    errno.EBADF,
+    errno.EINVAL,
+    errno.ENOSYS,
+    errno.ENOTSUP,
+    errno.EOPNOTSUPP,
+    errno.ENOTTY,
+    errno.EXDEV,
+    errno.EPERM,
+}
+
+_CHUNK_SIZE = 1 << 30
+
+# (mechanism, source device, destination device) combinations that failed
+_unsupported: set[tuple[str, int, int]] = set()
+
+
+class _ShortCopy(Exception):
+    """Raised when a mechanism stops before the end of the file.
+
+    Like shutil's ``_GiveupOnFastCopy``: :func:`copy_file` discards the
+    partial copy and falls back to the next mechanism for this file, without
+    marking the mechanism unsupported.
+    """
+
+
+def _reflink(src_fd: int, dst_fd: int, size: int) -> None:
+    """Share the source's blocks with the destination."""
+    import fcntl
+
+    fcntl.ioctl(dst_fd, FICLONE, src_fd)
+
+
+def _copy_file_range(src_fd: int, dst_fd: int, size: int) -> None:
+    """Copy with ``os.copy_file_range`` until the whole file is copied."""
+    copied = 0
+    while copied < size:
+        sent = os.copy_file_range(src_fd, dst_fd, min(size - copied, _CHUNK_SIZE))
+        if sent == 0:
+            raise _ShortCopy(f"copy_file_range copied only {copied} of {size} bytes")
+        copied += sent
+
+
+def _sendfile(src_fd: int, dst_fd: int, size: int) -> None:
+    """Copy with ``os.sendfile`` until the whole file is copied."""
+    offset = 0
+    while offset < size:
+        sent = os.sendfile(dst_fd, src_fd, offset, min(size - offset, _CHUNK_SIZE))
+        if sent == 0:
+            raise _ShortCopy(f"sendfile copied only {offset} of {size} bytes")
+        offset += sent
+
+
+def _mechanisms() -> list[tuple[str, object]]:
+    """Return the copy mechanisms available on this platform, cheapest first."""
+    mechanisms = []
+    if sys.platform.startswith("linux"):
+        mechanisms.append(("reflink", _reflink))
+    if hasattr(os, "copy_file_range"):
+        mechanisms.append(("copy_file_range", _copy_file_range))
+    if hasattr(os, "sendfile") and sys.platform.startswith("linux"):
+        mechanisms.append(("sendfile", _sendfile))
+    return mechanisms
+
+
+MECHANISMS = _mechanisms()
+
+
+def copy_file(src: str | os.PathLike, dst: str | os.PathLike) -> str:
+    """Copy a file's content (not its permissions) to a new or truncated file.
+
+    Parameters
+    ----------
+    src : str | os.PathLike
+        File to copy
+    dst : str | os.PathLike
+        Destination file, created or truncated
+
+    Returns
+    -------
+    str
+        Mechanism that copied the file: ``reflink``, ``copy_file_range``,
+        ``sendfile`` or ``copy``
+    """
+    with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+        src_stat = os.fstat(fsrc.fileno())
+        dst_dev = os.fstat(fdst.fileno()).st_dev
+        for name, mechanism in MECHANISMS:
+            key = (name, src_stat.st_dev, dst_dev)
+            if key in _unsupported:
+                continue
+            try:
+                mechanism(fsrc.fileno(), fdst.fileno(), src_stat.st_size)
+            except _ShortCopy:
+                pass
+            except OSError as e:
+                if e.errno not in _UNSUPPORTED_ERRNOS:
+                    raise
+                _unsupported.add(key)
+            else:
+                return name
+            # Discard anything a partial attempt wrote before falling back
+            os.ftruncate(fdst.fileno(), 0)
+            os.lseek(fdst.fileno(), 0, os.SEEK_SET)
+            os.lseek(fsrc.fileno(), 0, os.SEEK_SET)
+        shutil.copyfileobj(fsrc, fdst)
+    return "copy"
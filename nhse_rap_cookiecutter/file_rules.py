@@ -0,0 +1,104 @@
+"""Declarative rules for which template files a project gets, and under what name.
+
+The ``_file_rules`` entry of cookiecutter.json keeps these rules in one place::
+
+    "_file_rules": {
+        "include": {
+            "setup.cfg": {"linting_and_formatting": ["flake8+black+isort"]},
+            "docs/content": {"docs": ["mkdocs"]}
+        },
+        "rename": {"_.env": ".env"}
+    }
+
+A path under ``include`` (a file, or a directory and everything below it) is
+only part of a project if every variable it names has one of the listed
+values. A path under ``rename`` is written under its new name. Paths are
+relative to the project template directory and are not templated.
+
+The renderers in this package check the rules before touching a file, so an
+excluded file is never read, rendered or written. The post-generation hook
+applies the same rules to the generated project, for plain ``cookiecutter``
+runs.
+"""
+
+from typing import Any
+
+FILE_RULES_KEY = "_file_rules"
+
+
+def file_rules(context: dict[str, Any]) -> dict[str, Any]:
+    """Return the file rules of a rendered context, or no rules if it has none."""
+    return context["cookiecutter"].get(FILE_RULES_KEY) or {}
+
+
+def _matches(relative: str, pattern: str) -> bool:
+    """Return whether a path is the pattern or lies below it."""
+    return relative == pattern or relative.startswith(pattern + "/")
+
+
+def is_included(relative: str, context: dict[str, Any]) -> bool:
+    """Return whether a template path is part of the project for a context.
+
+    Parameters
+    ----------
+    relative : str
+        Path relative to the project template directory (posix)
+    context : dict[str, Any]
+        Rendered context with a ``cookiecutter`` key
+
+    Returns
+    -------
+    bool
+        False if an inclusion rule covering the path is not met
+    """
+    values = context["cookiecutter"]
+    for pattern, conditions in file_rules(context).get("include", {}).items():
+        if _matches(relative, pattern) and any(
+            values.get(name) not in allowed for name, allowed in conditions.items()
+        ):
+            return False
+    return True
+
+
+def renamed(relative: str, context: dict[str, Any]) -> str:
+    """Return the path a file is written to after the rename rules.
+
+    Parameters
+    ----------
+    relative : str
+        Output path relative to the project directory (posix)
+    context : dict[str, Any]
+        Rendered context with a ``cookiecutter`` key
+
+    Returns
+    -------
+    str
+        The path with a renamed leading file or directory replaced
+    """
+    for source, target in file_rules(context).get("rename", {}).items():
+        if _matches(relative, source):
+            return target + relative[len(source) :]
+    return relative
+
+
+def rule_variables(rules: dict[str, Any], relative: str | None = None) -> set[str]:
+    """Return the variables the inclusion rules test.
+
+    Parameters
+    ----------
+    rules : dict[str, Any]
+        The ``_file_rules`` entry of cookiecutter.json
+    relative : str | None, optional
+        Only return the variables deciding whether this template path is included
+
+    Returns
+    -------
+    set[str]
+        Names of cookiecutter variables
+    """
+    return {
+        name
+        for pattern, conditions in rules.get("include", {}).items()
+        if relative is None or _matches(relative, pattern)
+        for name in conditions
+    }
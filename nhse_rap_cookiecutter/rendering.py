@@ -0,0 +1,818 @@
+"""In-process project rendering for the NHS RAP Cookiecutter Template.
+
+Calling cookiecutter as a library avoids paying for a new interpreter, the
+cookiecutter import and a fresh Jinja environment for every project. This
+module wraps ``cookiecutter.main.cookiecutter`` so that every render in the
+same process shares one warm Jinja environment and its compiled templates.
+
+It can also render individual template files, or a whole project, without
+writing anything, which lets callers re-render a single file after an edit or
+validate a project entirely in memory.
+"""
+
+import json
+import os
+import shutil
+import tempfile
+from collections.abc import Iterator
+from contextlib import contextmanager, suppress
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import cookiecutter.generate
+import cookiecutter.hooks
+import cookiecutter.main
+import cookiecutter.prompt
+from binaryornot.check import is_binary
+from cookiecutter.config import get_user_config
+from cookiecutter.environment import StrictEnvironment
+from cookiecutter.exceptions import FailedHookException, NonTemplatedInputDirException
+from cookiecutter.generate import generate_context, is_copy_only_path
+from cookiecutter.main import cookiecutter as run_cookiecutter
+from cookiecutter.utils import work_in
+from jinja2 import BytecodeCache, Environment, FileSystemLoader
+from jinja2.bccache import Bucket
+
+from nhse_rap_cookiecutter.fastcopy import copy_file
+from nhse_rap_cookiecutter.file_rules import is_included, renamed
+
+# Modules that build their own environment via ``create_env_with_context``
+_ENV_FACTORY_MODULES = (cookiecutter.generate, cookiecutter.hooks, cookiecutter.prompt)
+
+# Set to 0 to keep compiled templates in memory only
+BYTECODE_CACHE_ENV_VAR = "NHS_RAP_BYTECODE_CACHE"
+
+# Set to 1 to run Python hooks in the generating process instead of a subprocess
+IN_PROCESS_HOOKS_ENV_VAR = "NHS_RAP_IN_PROCESS_HOOKS"
+
+
+class MemoryBytecodeCache(BytecodeCache):
+    """Jinja bytecode cache held in process memory.
+
+    Cookiecutter gives every render a fresh template loader, which defeats
+    Jinja's per-environment template cache. A bytecode cache is keyed on the
+    template name and validated against a checksum of its source, so compiled
+    templates survive across renders and are recompiled only when they change.
+    """
+
+    def __init__(self) -> None:
+        self._store: dict[str, bytes] = {}
+
+    def load_bytecode(self, bucket: Bucket) -> None:
+        """Load compiled bytecode for a template into the bucket, if cached."""
+        data = self._store.get(bucket.key)
+        if data is not None:
+            bucket.bytecode_from_string(data)
+
+    def dump_bytecode(self, bucket: Bucket) -> None:
+        """Store the compiled bytecode held in the bucket."""
+        self._store[bucket.key] = bucket.bytecode_to_string()
+
+    def clear(self) -> None:
+        """Remove all cached bytecode."""
+        self._store.clear()
+
+
+@dataclass(frozen=True)
+class RenderedFile:
+    """A template file rendered for one project, held in memory.
+
+    Attributes
+    ----------
+    path : str
+        Output path relative to the generated project directory
+    content : bytes
+        Rendered (or copied) file content, with the template's line endings
+    source : Path
+        Template file the content was rendered from
+    verbatim : bool
+        Whether the content is an unrendered copy of ``source`` (binary and
+        ``_copy_without_render`` files), which can be copied rather than written
+    """
+
+    path: str
+    content: bytes
+    source: Path
+    verbatim: bool = False
+
+
+class PersistentBytecodeCache(MemoryBytecodeCache):
+    """Jinja bytecode cache held in memory and persisted to disk.
+
+    Compiled templates are written to a cache directory so that new processes
+    (each CLI run, ``generate_projects.py`` worker or subprocess) skip parsing
+    and compiling templates they have compiled before. Entries are keyed on
+    the template name, a hash of its source and the environment's syntax
+    settings rather than on its file path, so one entry serves every checkout
+    of the same template version, and a changed template never reuses stale
+    bytecode. Jinja also rejects entries written by another Jinja or Python
+    version.
+
+    The directory defaults to ``jinja-bytecode`` in the template cache
+    directory. Setting ``NHS_RAP_BYTECODE_CACHE=0`` keeps the cache in memory
+    only. Failing to read or write the directory is never an error.
+    """
+
+    def __init__(self, directory: Path | None = None) -> None:
+        super().__init__()
+        self._directory = directory
+
+    @property
+    def directory(self) -> Path | None:
+        """Directory compiled templates are persisted to, or None if disabled."""
+        if os.environ.get(BYTECODE_CACHE_ENV_VAR) == "0":
+            return None
+        if self._directory is not None:
+            return self._directory
+        from nhse_rap_cookiecutter.template_cache import cache_root
+
+        return cache_root() / "jinja-bytecode"
+
+    def get_bucket(
+        self, environment: Environment, name: str, filename: str | None, source: str
+    ) -> Bucket:
+        """Return the bucket for a template, keyed on its content rather than its path."""
+        checksum = self.get_source_checksum(source)
+        syntax = (
+            sorted(environment.extensions),
+            environment.block_start_string,
+            environment.variable_start_string,
+            environment.comment_start_string,
+            environment.line_statement_prefix,
+            environment.trim_blocks,
+            environment.lstrip_blocks,
+            environment.newline_sequence,
+            environment.keep_trailing_newline,
+            environment.autoescape if isinstance(environment.autoescape, bool) else None,
+        )
+        bucket = Bucket(environment, self.get_cache_key(f"{name}\0{checksum}\0{syntax}"), checksum)
+        self.load_bytecode(bucket)
+        return bucket
+
+    def load_bytecode(self, bucket: Bucket) -> None:
+        """Load bytecode from memory, falling back to the cache directory."""
+        super().load_bytecode(bucket)
+        directory = self.directory
+        if bucket.code is not None or directory is None:
+            return
+        try:
+            data = (directory / f"{bucket.key}.cache").read_bytes()
+        except OSError:
+            return
+        bucket.bytecode_from_string(data)
+        if bucket.code is not None:
+            self._store[bucket.key] = data
+
+    def dump_bytecode(self, bucket: Bucket) -> None:
+        """Store bytecode in memory and write it atomically to the cache directory."""
+        super().dump_bytecode(bucket)
+        directory = self.directory
+        if directory is None:
+            return
+        target = directory / f"{bucket.key}.cache"
+        staging = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+        try:
+            directory.mkdir(parents=True, exist_ok=True)
+            staging.write_bytes(self._store[bucket.key])
+            os.replace(staging, target)
+        except OSError:
+            with suppress(OSError):
+                staging.unlink(missing_ok=True)
+
+
+class _FastShutil:
+    """Stand-in for the ``shutil`` module inside ``cookiecutter.generate``.
+
+    Cookiecutter copies binary and ``_copy_without_render`` files with
+    ``shutil.copyfile``; this copies them with :func:`copy_file` instead and
+    passes every other attribute through to ``shutil``.
+    """
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(shutil, name)
+
+    @staticmethod
+    def copyfile(src: str, dst: str, *, follow_symlinks: bool = True) -> str:
+        """Copy a file's content like ``shutil.copyfile``, with the fastest mechanism."""
+        if (not follow_symlinks and os.path.islink(src)) or (
+            os.path.exists(dst) and os.path.samefile(src, dst)
+        ):
+            return shutil.copyfile(src, dst, follow_symlinks=follow_symlinks)
+        copy_file(src, dst)
+        return dst
+
+
+_FAST_SHUTIL = _FastShutil()
+
+
+class _RuleFilteredOs:
+    """Stand-in for the ``os`` module inside ``cookiecutter.generate``.
+
+    ``generate_files`` walks the project template with ``os.walk``. This walk
+    leaves out the paths the template's file rules exclude for the project
+    being generated, so cookiecutter never reads, renders or writes them or
+    creates their directories. Every other attribute passes through to ``os``.
+
+    Attributes
+    ----------
+    context : dict[str, Any] | None
+        Context of the project being generated, set by
+        :func:`_generate_files_with_rules`
+    """
+
+    context: dict[str, Any] | None = None
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(os, name)
+
+    def walk(self, top: str, *args: Any, **kwargs: Any) -> Iterator[tuple[str, list, list]]:
+        """Walk a directory tree like ``os.walk``, without excluded paths."""
+        for root, dirs, files in os.walk(top, *args, **kwargs):
+            if self.context is not None:
+                base = Path(os.path.relpath(root, top)).as_posix()
+                prefix = "" if base == "." else base + "/"
+                dirs[:] = [d for d in dirs if is_included(prefix + d, self.context)]
+                files[:] = [f for f in files if is_included(prefix + f, self.context)]
+            yield root, dirs, files
+
+
+_RULE_FILTERED_OS = _RuleFilteredOs()
+_RUN_SCRIPT_WITH_CONTEXT = cookiecutter.hooks.run_script_with_context
+_GENERATE_FILES = cookiecutter.main.generate_files
+
+
+def _generate_files_with_rules(repo_dir: Any, context: Any = None, *args: Any, **kwargs: Any):
+    """Call cookiecutter's ``generate_files`` with the file rules applied to its walk."""
+    _RULE_FILTERED_OS.context = context
+    try:
+        return _GENERATE_FILES(repo_dir, context, *args, **kwargs)
+    finally:
+        _RULE_FILTERED_OS.context = None
+
+
+_BINARY_FILES: dict[str, tuple[int, int, bool]] = {}
+
+
+def is_binary_file(path: str | Path) -> bool:
+    """Return whether a file is binary, remembering the answer until the file changes.
+
+    ``binaryornot`` reads and analyses the start of the file on every call.
+    Template files are checked once per process and then looked up by path,
+    size and modification time.
+    """
+    path = str(path)
+    file_stat = os.stat(path)
+    cached = _BINARY_FILES.get(path)
+    if cached is not None and cached[:2] == (file_stat.st_size, file_stat.st_mtime_ns):
+        return cached[2]
+    binary = is_binary(path)
+    _BINARY_FILES[path] = (file_stat.st_size, file_stat.st_mtime_ns, binary)
+    return binary
+
+
+_BYTECODE_CACHE = PersistentBytecodeCache()
+_ENVIRONMENTS: dict[str, StrictEnvironment] = {}
+_TEMPLATE_ENVIRONMENTS: dict[tuple[int, Path], Environment] = {}
+
+
+def get_environment(context: dict[str, Any]) -> StrictEnvironment:
+    """Return the shared Jinja environment for a cookiecutter context.
+
+    Environments are keyed on the settings that change how an environment is
+    built (``_extensions`` and ``_jinja2_env_vars``), so every project rendered
+    from the same template reuses one environment.
+
+    Parameters
+    ----------
+    context : dict[str, Any]
+        Cookiecutter context, as passed to ``create_env_with_context``
+
+    Returns
+    -------
+    StrictEnvironment
+        Warm environment backed by the process-wide bytecode cache
+    """
+    cookiecutter_context = context.get("cookiecutter", {})
+    extensions = cookiecutter_context.get("_extensions", [])
+    envvars = cookiecutter_context.get("_jinja2_env_vars", {})
+    key = json.dumps([extensions, envvars], sort_keys=True, default=str)
+
+    env = _ENVIRONMENTS.get(key)
+    if env is None:
+        env = StrictEnvironment(
+            context=context,
+            keep_trailing_newline=True,
+            bytecode_cache=_BYTECODE_CACHE,
+            **envvars,
+        )
+        _ENVIRONMENTS[key] = env
+    return env
+
+
+def template_environment(context: dict[str, Any], project_template: Path) -> Environment:
+    """Return the shared environment with a loader rooted at a project template.
+
+    Cookiecutter loads templates relative to the working directory. This
+    overlay uses an absolute loader instead, so files can be rendered without
+    changing directory.
+
+    Parameters
+    ----------
+    context : dict[str, Any]
+        Cookiecutter context
+    project_template : Path
+        The ``{{ cookiecutter.repo_name }}`` directory of the template
+
+    Returns
+    -------
+    Environment
+        Overlay of the shared environment (sharing its bytecode cache)
+    """
+    base = get_environment(context)
+    key = (id(base), project_template)
+    env = _TEMPLATE_ENVIRONMENTS.get(key)
+    if env is None:
+        loader = FileSystemLoader(
+            [str(project_template), str(project_template.parent / "templates")]
+        )
+        env = base.overlay(loader=loader)
+        _TEMPLATE_ENVIRONMENTS[key] = env
+    return env
+
+
+def find_project_template(template_dir: str | Path) -> Path:
+    """Return the templated project directory inside a template repository.
+
+    Parameters
+    ----------
+    template_dir : str | Path
+        Template repository root containing cookiecutter.json
+
+    Returns
+    -------
+    Path
+        Path to the ``{{ cookiecutter.<name> }}`` directory
+
+    Raises
+    ------
+    NonTemplatedInputDirException
+        If the repository has no templated project directory
+    """
+    for path in Path(template_dir).iterdir():
+        if path.is_dir() and "cookiecutter" in path.name and "{{" in path.name:
+            return path
+    raise NonTemplatedInputDirException
+
+
+def template_variables(template_dir: str | Path) -> list[str]:
+    """Return the variables a template asks for, in cookiecutter.json order.
+
+    Keys starting with ``_`` are template settings rather than variables and
+    are left out.
+
+    Parameters
+    ----------
+    template_dir : str | Path
+        Template repository root containing cookiecutter.json
+
+    Returns
+    -------
+    list[str]
+        Names of the public template variables
+    """
+    with open(Path(template_dir) / "cookiecutter.json", encoding="utf-8") as f:
+        return [key for key in json.load(f) if not key.startswith("_")]
+
+
+def load_context(
+    template_dir: str | Path,
+    extra_context: dict[str, Any] | None = None,
+    config_file: str | None = None,
+    no_input: bool = True,
+) -> dict[str, Any]:
+    """Build the rendered cookiecutter context for a project.
+
+    Mirrors what cookiecutter does before rendering files: user config
+    defaults and ``extra_context`` are applied to cookiecutter.json and
+    templated defaults such as ``repo_name`` are rendered.
+
+    Parameters
+    ----------
+    template_dir : str | Path
+        Template repository root containing cookiecutter.json
+    extra_context : dict[str, Any] | None, optional
+        Values overriding the defaults in cookiecutter.json
+    config_file : str | None, optional
+        User configuration file
+    no_input : bool, optional
+        Use the defaults instead of prompting for each variable
+
+    Returns
+    -------
+    dict[str, Any]
+        Context with a ``cookiecutter`` key, ready to render templates with
+    """
+    config_dict = get_user_config(config_file=config_file)
+    context = generate_context(
+        context_file=str(Path(template_dir) / "cookiecutter.json"),
+        default_context=config_dict["default_context"],
+        extra_context=extra_context,
+    )
+    with warm_environment():
+        context["cookiecutter"].update(cookiecutter.prompt.prompt_for_config(context, no_input))
+    context["cookiecutter"]["_template"] = str(template_dir)
+    context["cookiecutter"]["_repo_dir"] = str(template_dir)
+    context["_cookiecutter"] = {
+        k: v for k, v in context["cookiecutter"].items() if not k.startswith("_")
+    }
+    return context
+
+
+def _detect_newline(path: Path) -> str:
+    """Return the newline used by the first line of a file, as cookiecutter does."""
+    with open(path, encoding="utf-8") as f:
+        f.readline()
+    newlines = f.newlines[0] if isinstance(f.newlines, tuple) else f.newlines
+    return newlines or os.linesep
+
+
+def render_path(template_dir: str | Path, relative: str, context: dict[str, Any]) -> str | None:
+    """Render the output path of a template file without reading the file.
+
+    Parameters
+    ----------
+    template_dir : str | Path
+        Template repository root containing cookiecutter.json
+    relative : str
+        Path of the file relative to the project template directory (posix)
+    context : dict[str, Any]
+        Context from :func:`load_context`
+
+    Returns
+    -------
+    str | None
+        Output path relative to the project directory, after the template's
+        rename rules, or None if the file rules exclude the file or its name
+        renders empty (cookiecutter skips such files)
+    """
+    if not is_included(relative, context):
+        return None
+    env = template_environment(context, find_project_template(template_dir))
+    output_path = env.from_string(relative).render(**context)
+    if not output_path or output_path.endswith("/"):
+        return None
+    return renamed(output_path, context)
+
+
+def run_script_in_process(
+    script_path: str | Path, cwd: str | Path, context: dict[str, Any]
+) -> None:
+    """Render a hook script and run it in this process, from a working directory.
+
+    A drop-in for ``cookiecutter.hooks.run_script_with_context``: the script
+    is rendered with the shared environment exactly as cookiecutter renders
+    it, but a Python script is executed with ``exec`` as ``__main__`` instead
+    of in a new interpreter. Other scripts (e.g. shell hooks) still run in a
+    subprocess.
+
+    Parameters
+    ----------
+    script_path : str | Path
+        Hook script in the template's hooks/ directory
+    cwd : str | Path
+        Directory to run the script from
+    context : dict[str, Any]
+        Context the script is rendered with
+
+    Raises
+    ------
+    cookiecutter.exceptions.FailedHookException
+        If the script raises an exception or exits with a non-zero status
+    """
+    if not str(script_path).endswith(".py"):
+        _RUN_SCRIPT_WITH_CONTEXT(script_path, cwd, context)
+        return
+
+    source = (
+        get_environment(context)
+        .from_string(Path(script_path).read_text(encoding="utf-8"))
+        .render(**context)
+    )
+    namespace = {"__name__": "__main__", "__file__": str(script_path)}
+    with work_in(cwd):
+        try:
+            exec(compile(source, str(script_path), "exec"), namespace)
+        except SystemExit as e:
+            if e.code not in (None, 0):
+                raise FailedHookException(f"Hook script failed (exit status: {e.code})") from e
+        except Exception as e:
+            raise FailedHookException(f"Hook script failed (error: {e})") from e
+
+
+@contextmanager
+def hooks_in_process(enabled: bool | None = None) -> Iterator[None]:
+    """Run cookiecutter's Python hooks in this process for the duration of the block.
+
+    Parameters
+    ----------
+    enabled : bool | None, optional
+        Whether to run hooks in process; if None, only when
+        ``$NHS_RAP_IN_PROCESS_HOOKS`` is set to something other than 0
+    """
+    if enabled is None:
+        enabled = os.environ.get(IN_PROCESS_HOOKS_ENV_VAR, "0") not in ("", "0")
+    if not enabled:
+        yield
+        return
+    original = cookiecutter.hooks.run_script_with_context
+    cookiecutter.hooks.run_script_with_context = run_script_in_process
+    try:
+        yield
+    finally:
+        cookiecutter.hooks.run_script_with_context = original
+
+
+def run_post_gen_hook(
+    template_dir: str | Path,
+    project_dir: str | Path,
+    context: dict[str, Any],
+    in_process_hooks: bool | None = None,
+) -> None:
+    """Run the template's post-generation hook in a project directory.
+
+    Parameters
+    ----------
+    template_dir : str | Path
+        Template repository root containing the hooks/ directory
+    project_dir : str | Path
+        Directory the hook runs in
+    context : dict[str, Any]
+        Context from :func:`load_context`
+    in_process_hooks : bool | None, optional
+        Run the hook in this process instead of a subprocess (see
+        :func:`hooks_in_process`)
+
+    Raises
+    ------
+    cookiecutter.exceptions.FailedHookException
+        If the hook exits with an error
+    """
+    with warm_environment(), hooks_in_process(in_process_hooks):
+        cookiecutter.hooks.run_hook_from_repo_dir(
+            str(template_dir), "post_gen_project", str(project_dir), context, False
+        )
+
+
+def post_gen_paths(
+    template_dir: str | Path,
+    output_paths: list[str],
+    context: dict[str, Any],
+    in_process_hooks: bool | None = None,
+) -> dict[str, str | None]:
+    """Return where the post-generation hook leaves each rendered file.
+
+    The hook renames and deletes files by name, so its effect is found by
+    running it in a scratch directory holding a small placeholder for every
+    path. Each placeholder contains its own original path, which identifies
+    it after any renames.
+
+    Parameters
+    ----------
+    template_dir : str | Path
+        Template repository root containing the hooks/ directory
+    output_paths : list[str]
+        Rendered paths relative to the project directory
+    context : dict[str, Any]
+        Context from :func:`load_context`
+    in_process_hooks : bool | None, optional
+        Run the hook in this process instead of a subprocess (see
+        :func:`hooks_in_process`)
+
+    Returns
+    -------
+    dict[str, str | None]
+        Rendered path to its final path, or None if the hook deletes the file
+    """
+    final_paths: dict[str, str | None] = dict.fromkeys(output_paths)
+    with tempfile.TemporaryDirectory() as scratch:
+        scratch_path = Path(scratch)
+        for output_path in output_paths:
+            placeholder = scratch_path / output_path
+            placeholder.parent.mkdir(parents=True, exist_ok=True)
+            placeholder.write_text(output_path)
+        run_post_gen_hook(template_dir, scratch_path, context, in_process_hooks)
+        for path in scratch_path.rglob("*"):
+            if path.is_file():
+                final_paths[path.read_text()] = path.relative_to(scratch_path).as_posix()
+    return final_paths
+
+
+def render_file(
+    template_dir: str | Path, relative: str, context: dict[str, Any]
+) -> RenderedFile | None:
+    """Render one template file in memory, exactly as cookiecutter would write it.
+
+    Binary and ``_copy_without_render`` files are copied verbatim; other files
+    are rendered with the shared environment. The output path is rendered too.
+
+    Parameters
+    ----------
+    template_dir : str | Path
+        Template repository root containing cookiecutter.json
+    relative : str
+        Path of the file relative to the project template directory (posix)
+    context : dict[str, Any]
+        Context from :func:`load_context`
+
+    Returns
+    -------
+    RenderedFile | None
+        Rendered file, or None if its path renders to an empty file name
+    """
+    output_path = render_path(template_dir, relative, context)
+    if output_path is None:
+        return None
+
+    project_template = find_project_template(template_dir)
+    env = template_environment(context, project_template)
+    source = project_template / relative
+    if is_copy_only_path(relative, context) or is_binary_file(source):
+        return RenderedFile(output_path, source.read_bytes(), source, verbatim=True)
+
+    text = env.get_template(relative).render(**context)
+    newline = context["cookiecutter"].get("_new_lines") or _detect_newline(source)
+    if newline != "\n":
+        text = text.replace("\n", newline)
+    return RenderedFile(output_path, text.encode("utf-8"), source)
+
+
+def render_project_files(
+    template_dir: str | Path, context: dict[str, Any]
+) -> dict[str, RenderedFile]:
+    """Render every file of a project in memory, before the post-generation hook.
+
+    Files excluded by the template's file rules are skipped without being
+    read, and renamed files are keyed by their new path.
+
+    Parameters
+    ----------
+    template_dir : str | Path
+        Template repository root containing cookiecutter.json
+    context : dict[str, Any]
+        Context from :func:`load_context`
+
+    Returns
+    -------
+    dict[str, RenderedFile]
+        Output path relative to the project directory to its rendered file
+    """
+    project_template = find_project_template(template_dir)
+    files = {}
+    for path in sorted(project_template.rglob("*")):
+        if path.is_file():
+            rendered = render_file(
+                template_dir, path.relative_to(project_template).as_posix(), context
+            )
+            if rendered is not None:
+                files[rendered.path] = rendered
+    return files
+
+
+def render_project_in_memory(
+    template_dir: str | Path,
+    extra_context: dict[str, Any] | None = None,
+    config_file: str | None = None,
+    no_input: bool = True,
+    in_process_hooks: bool | None = None,
+) -> tuple[str, dict[str, RenderedFile]]:
+    """Render a whole project in memory, applying the post-generation hook.
+
+    Parameters
+    ----------
+    template_dir : str | Path
+        Template repository root containing cookiecutter.json
+    extra_context : dict[str, Any] | None, optional
+        Values overriding the defaults in cookiecutter.json
+    config_file : str | None, optional
+        User configuration file
+    no_input : bool, optional
+        Use the defaults instead of prompting for each variable
+    in_process_hooks : bool | None, optional
+        Run the post-generation hook in this process instead of a subprocess
+        (see :func:`hooks_in_process`)
+
+    Returns
+    -------
+    tuple[str, dict[str, RenderedFile]]
+        Project directory name and the project's files by final relative
+        path, in path order
+    """
+    context = load_context(template_dir, extra_context, config_file, no_input)
+    project_template = find_project_template(template_dir)
+    project_name = (
+        template_environment(context, project_template)
+        .from_string(project_template.name)
+        .render(**context)
+    )
+    rendered = render_project_files(template_dir, context)
+    final_paths = post_gen_paths(template_dir, list(rendered), context, in_process_hooks)
+    files = {
+        final_paths[output_path]: rendered_file
+        for output_path, rendered_file in rendered.items()
+        if final_paths[output_path] is not None
+    }
+    return project_name, dict(sorted(files.items()))
+
+
+@contextmanager
+def warm_environment() -> Iterator[None]:
+    """Make cookiecutter use the shared environment for the duration of the block.
+
+    Cookiecutter creates a new ``StrictEnvironment`` each time it prompts,
+    renders files or renders hooks. Inside this context manager those calls
+    return the environment from :func:`get_environment` instead. Binary
+    detection is memoised with :func:`is_binary_file`, verbatim files are
+    copied with :func:`~nhse_rap_cookiecutter.fastcopy.copy_file`, and files
+    excluded by the template's file rules are never generated.
+    """
+    originals = [module.create_env_with_context for module in _ENV_FACTORY_MODULES]
+    generate_originals = (
+        cookiecutter.generate.is_binary,
+        cookiecutter.generate.shutil,
+        cookiecutter.generate.os,
+        cookiecutter.main.generate_files,
+    )
+    for module in _ENV_FACTORY_MODULES:
+        module.create_env_with_context = get_environment
+    cookiecutter.generate.is_binary = is_binary_file
+    cookiecutter.generate.shutil = _FAST_SHUTIL
+    cookiecutter.generate.os = _RULE_FILTERED_OS
+    cookiecutter.main.generate_files = _generate_files_with_rules
+    try:
+        yield
+    finally:
+        for module, original in zip(_ENV_FACTORY_MODULES, originals, strict=True):
+            module.create_env_with_context = original
+        (
+            cookiecutter.generate.is_binary,
+            cookiecutter.generate.shutil,
+            cookiecutter.generate.os,
+            cookiecutter.main.generate_files,
+        ) = generate_originals
+
+
+def render_project(
+    template: str | Path,
+    output_dir: str | Path,
+    extra_context: dict[str, Any] | None = None,
+    *,
+    checkout: str | None = None,
+    no_input: bool = True,
+    overwrite_if_exists: bool = False,
+    config_file: str | None = None,
+    in_process_hooks: bool | None = None,
+) -> Path:
+    """Render a project from a template in the current process.
+
+    Parameters
+    ----------
+    template : str | Path
+        Path or URL to the cookiecutter template
+    output_dir : str | Path
+        Directory to write the generated project into
+    extra_context : dict[str, Any] | None, optional
+        Values overriding the defaults in cookiecutter.json
+    checkout : str | None, optional
+        Branch, tag or commit to checkout after cloning a template repository
+    no_input : bool, optional
+        Do not prompt for parameters
+    overwrite_if_exists : bool, optional
+        Overwrite the contents of the project directory if it already exists
+    config_file : str | None, optional
+        User configuration file
+    in_process_hooks : bool | None, optional
+        Run the template's Python hooks in this process instead of a
+        subprocess; if None, only when ``$NHS_RAP_IN_PROCESS_HOOKS`` is set
+
+    Returns
+    -------
+    Path
+        Path to the generated project directory
+
+    Raises
+    ------
+    cookiecutter.exceptions.CookiecutterException
+        If cookiecutter fails to render the project
+    """
+    with warm_environment(), hooks_in_process(in_process_hooks):
+        project_dir = run_cookiecutter(
+            str(template),
+            checkout=checkout,
+            no_input=no_input,
+            extra_context=extra_context,
+            overwrite_if_exists=overwrite_if_exists,
+            output_dir=str(output_dir),
+            config_file=config_file,
+        )
+    return Path(project_dir)
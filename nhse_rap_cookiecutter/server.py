@@ -0,0 +1,297 @@
+"""Local HTTP service that generates projects from a warm template.
+
+``nhs-rap-template serve`` resolves the template once, compiles every
+template file into the shared Jinja environment, and then answers requests
+without paying for process start, template fetch or compilation. Each project
+is rendered in memory, with the post-generation hook run in process, and
+streamed straight into the response without being written to disk:
+
+``GET /health``
+    JSON with the template being served and its commit.
+
+``POST /generate``
+    Body: a JSON object of template variables (as in a batch manifest
+    project), sent as ``Content-Type: application/json``. Response: the
+    generated project as a gzipped tarball, streamed as it is written, with
+    the project directory name in ``X-Project-Name``. Invalid requests get a
+    400 (415 for any other content type) and failed renders a 500, all with a
+    JSON ``{"error": ...}`` body.
+
+Values are rendered by Jinja, so requests may only set the template's public
+variables, to plain strings without Jinja syntax, and the project name must
+give a single directory name. Requiring JSON means browsers cannot send a
+request from another site without a CORS preflight, which is never granted.
+
+The service listens on a TCP address (loopback by default) or a Unix socket.
+It has no authentication: listening on any other address must be asked for
+explicitly. Requests are handled one at a time, because rendering changes
+process-wide state such as the working directory while hooks run.
+"""
+
+import ipaddress
+import json
+import os
+import re
+import socketserver
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from pathlib import Path
+from typing import Any
+
+from nhse_rap_cookiecutter.archive import ArchiveFormat, record_source, write_archive
+from nhse_rap_cookiecutter.rendering import (
+    load_context,
+    render_project_files,
+    render_project_in_memory,
+    template_variables,
+)
+
+# Largest request body accepted, in bytes
+MAX_CONTEXT_BYTES = 1 << 20
+
+# Jinja delimiters: values containing them would be rendered as templates
+_JINJA_MARKERS = ("{{", "{%", "{#")
+
+# Variables naming a directory, directly or through the derived repo_name
+_PATH_VARIABLES = ("project_name", "repo_name", "module_name")
+_PLAIN_NAME = re.compile(r"[A-Za-z0-9][A-Za-z0-9 _.-]*")
+
+
+def validate_context(extra_context: dict[str, Any], variables: list[str]) -> None:
+    """Check a requested context is safe to render.
+
+    Parameters
+    ----------
+    extra_context : dict[str, Any]
+        Template variables from the request
+    variables : list[str]
+        Public variables of the template being served
+
+    Raises
+    ------
+    ValueError
+        If a key is not a public variable, a value is not a string or contains
+        Jinja syntax, or a name would not give a single plain directory name
+    """
+    for key, value in extra_context.items():
+        if key not in variables:
+            raise ValueError(f"Unknown template variable {key!r}")
+        if not isinstance(value, str):
+            raise ValueError(f"{key} must be a string")
+        if any(marker in value for marker in _JINJA_MARKERS):
+            raise ValueError(f"{key} must not contain Jinja syntax")
+        if key in _PATH_VARIABLES and not _PLAIN_NAME.fullmatch(value):
+            raise ValueError(
+                f"{key} must start with a letter or digit and contain only letters, "
+                "digits, spaces, '_', '-' and '.'"
+            )
+
+
+def is_loopback(host: str) -> bool:
+    """Return whether a listening address only accepts connections from this machine."""
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+class GenerationHandler(BaseHTTPRequestHandler):
+    """Handle health checks and project generation requests."""
+
+    server: "GenerationServerMixin"
+
+    def address_string(self) -> str:
+        """Return the client address, which is empty for Unix socket clients."""
+        return self.client_address[0] if self.client_address else "unix"
+
+    def log_message(self, format: str, *args: Any) -> None:
+        """Log requests only if the server was started verbosely."""
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def send_json(self, status: int, body: dict[str, Any]) -> None:
+        """Send a complete JSON response."""
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self) -> None:
+        """Report that the service is up and which template it serves."""
+        if self.path != "/health":
+            self.send_json(404, {"error": f"Unknown path {self.path}"})
+            return
+        self.send_json(
+            200, {"status": "ok", "template": self.server.source, "commit": self.server.commit}
+        )
+
+    def do_POST(self) -> None:
+        """Generate a project from a JSON context and stream it back as a tarball."""
+        if self.path != "/generate":
+            self.send_json(404, {"error": f"Unknown path {self.path}"})
+            return
+
+        if self.headers.get_content_type() != "application/json":
+            self.send_json(415, {"error": "Content-Type must be application/json"})
+            return
+        length = int(self.headers.get("Content-Length") or 0)
+        if length > MAX_CONTEXT_BYTES:
+            self.send_json(413, {"error": "Request body too large"})
+            return
+        try:
+            extra_context = json.loads(self.rfile.read(length) or b"{}")
+        except json.JSONDecodeError as e:
+            self.send_json(400, {"error": f"Invalid JSON: {e}"})
+            return
+        if not isinstance(extra_context, dict):
+            self.send_json(400, {"error": "Request body must be a JSON object"})
+            return
+        try:
+            validate_context(extra_context, self.server.variables)
+        except ValueError as e:
+            self.send_json(400, {"error": str(e)})
+            return
+
+        try:
+            # The served template is trusted, so its hook can run in this process
+            project_name, files = render_project_in_memory(
+                self.server.template_dir, extra_context, in_process_hooks=True
+            )
+        except ValueError as e:
+            self.send_json(400, {"error": str(e)})
+            return
+        except Exception as e:
+            self.send_json(500, {"error": str(e) or type(e).__name__})
+            return
+        record_source(files, self.server.source, self.server.commit)
+
+        # HTTP/1.0 without Content-Length: the body ends when the connection closes
+        self.send_response(200)
+        self.send_header("Content-Type", "application/gzip")
+        self.send_header("X-Project-Name", project_name)
+        self.end_headers()
+        # Fast compression: the archive usually goes straight to local disk
+        write_archive(files, project_name, self.wfile, ArchiveFormat.TAR_GZ, compresslevel=1)
+
+
+class GenerationServerMixin:
+    """State shared by the TCP and Unix socket generation servers.
+
+    Attributes
+    ----------
+    template_dir : Path
+        Local template checkout to render from
+    source : str
+        Template path, URL or abbreviation, recorded in generated projects
+    commit : str | None
+        Commit of the template checkout, if known
+    variables : list[str]
+        Public variables of the template, the only keys requests may set
+    verbose : bool
+        Whether to log each request
+    """
+
+    template_dir: Path
+    source: str
+    commit: str | None
+    variables: list[str]
+    verbose: bool
+
+    def configure(
+        self, template_dir: Path, source: str, commit: str | None, verbose: bool
+    ) -> None:
+        """Set the template to serve and compile all of its files."""
+        self.template_dir = template_dir
+        self.source = source
+        self.commit = commit
+        self.variables = template_variables(template_dir)
+        self.verbose = verbose
+        warm_template(template_dir)
+
+
+class TCPGenerationServer(GenerationServerMixin, HTTPServer):
+    """Generation service listening on a TCP address."""
+
+
+class UnixGenerationServer(GenerationServerMixin, socketserver.UnixStreamServer):
+    """Generation service listening on a Unix socket."""
+
+    def server_bind(self) -> None:
+        """Replace a stale socket file left by a previous run, then bind."""
+        if os.path.exists(self.server_address):
+            os.unlink(self.server_address)
+        super().server_bind()
+
+    def server_close(self) -> None:
+        """Close the socket and remove its file."""
+        super().server_close()
+        if os.path.exists(self.server_address):
+            os.unlink(self.server_address)
+
+
+def warm_template(template_dir: str | Path) -> None:
+    """Compile every file of a template into the shared Jinja environment.
+
+    Parameters
+    ----------
+    template_dir : str | Path
+        Local template checkout
+    """
+    render_project_files(template_dir, load_context(template_dir))
+
+
+def make_server(
+    template_dir: str | Path,
+    source: str,
+    commit: str | None = None,
+    host: str = "127.0.0.1",
+    port: int = 8000,
+    unix_socket: str | Path | None = None,
+    verbose: bool = False,
+    allow_remote: bool = False,
+) -> TCPGenerationServer | UnixGenerationServer:
+    """Create a generation server with a warm template, ready to serve.
+
+    Parameters
+    ----------
+    template_dir : str | Path
+        Local template checkout to render from
+    source : str
+        Template path, URL or abbreviation, recorded in generated projects
+    commit : str | None, optional
+        Commit of the template checkout
+    host : str, optional
+        Address to listen on
+    port : int, optional
+        TCP port to listen on; 0 picks a free port
+    unix_socket : str | Path | None, optional
+        Listen on this Unix socket instead of a TCP address
+    verbose : bool, optional
+        Log each request to stderr
+    allow_remote : bool, optional
+        Allow ``host`` to be an address other machines can connect to
+
+    Returns
+    -------
+    TCPGenerationServer | UnixGenerationServer
+        Bound server; call ``serve_forever()`` to start handling requests
+
+    Raises
+    ------
+    ValueError
+        If ``host`` is not a loopback address and ``allow_remote`` is not set
+    """
+    if unix_socket is None and not allow_remote and not is_loopback(host):
+        raise ValueError(
+            f"Refusing to listen on non-loopback address {host!r}: the service has no "
+            "authentication. Pass allow_remote (--allow-remote) to listen anyway"
+        )
+    if unix_socket is not None:
+        server = UnixGenerationServer(str(unix_socket), GenerationHandler)
+    else:
+        server = TCPGenerationServer((host, port), GenerationHandler)
+    server.configure(Path(template_dir), source, commit, verbose)
+    return server
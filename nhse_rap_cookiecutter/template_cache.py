@@ -0,0 +1,278 @@
+"""Local cache of template checkouts for the NHS RAP Cookiecutter Template.
+
+Cookiecutter clones a template repository afresh on every run. This module
+keeps one checkout per repository URL and ``--checkout`` ref under a cache
+directory instead. A cached checkout is revalidated by comparing its commit
+with the one the remote ref points to (``git ls-remote``), so an unchanged
+template costs one small request rather than a clone. In offline mode the
+cached checkout is used without any git traffic.
+
+The cache lives in ``$NHS_RAP_TEMPLATE_CACHE`` if set, otherwise in
+``$XDG_CACHE_HOME/nhs-rap-template`` (``~/.cache/nhs-rap-template``).
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import shutil
+import subprocess
+import uuid
+from pathlib import Path
+
+from cookiecutter.config import BUILTIN_ABBREVIATIONS
+from cookiecutter.repository import expand_abbreviations, is_repo_url
+
+logger = logging.getLogger(__name__)
+
+CACHE_ENV_VAR = "NHS_RAP_TEMPLATE_CACHE"
+METADATA_FILE = "cache.json"
+TEMPLATE_SUBDIR = "template"
+
+# Refs that look like (possibly abbreviated) commit hashes never move
+_COMMIT_REGEX = re.compile(r"^[0-9a-f]{7,40}$")
+
+
+class TemplateCacheError(Exception):
+    """Raised when a template cannot be fetched into, or found in, the cache."""
+
+
+def cache_root() -> Path:
+    """Return the directory template checkouts are cached in."""
+    if os.environ.get(CACHE_ENV_VAR):
+        return Path(os.environ[CACHE_ENV_VAR])
+    xdg_cache = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(xdg_cache) / "nhs-rap-template"
+
+
+def cache_entry(url: str, checkout: str | None, root: Path | None = None) -> Path:
+    """Return the cache directory for a repository URL and ref.
+
+    Parameters
+    ----------
+    url : str
+        Git repository URL, with abbreviations expanded
+    checkout : str | None
+        Branch, tag or commit, or None for the default branch
+    root : Path | None, optional
+        Cache directory, defaulting to :func:`cache_root`
+
+    Returns
+    -------
+    Path
+        Directory holding the checkout and its metadata
+    """
+    key = hashlib.sha256(f"{url}\0{checkout or ''}".encode()).hexdigest()[:16]
+    name = url.rstrip("/").rsplit("/", 1)[-1].removesuffix(".git") or "template"
+    return (root or cache_root()) / f"{name}-{key}"
+
+
+def _git(*args: str) -> str:
+    """Run git without prompting and return its stripped standard output."""
+    result = subprocess.run(
+        ["git", *args],
+        capture_output=True,
+        text=True,
+        check=True,
+        env={**os.environ, "GIT_TERMINAL_PROMPT": "0"},
+    )
+    return result.stdout.strip()
+
+
+def remote_commit(url: str, checkout: str | None) -> str | None:
+    """Return the commit a remote ref points to, without cloning.
+
+    Parameters
+    ----------
+    url : str
+        Git repository URL
+    checkout : str | None
+        Branch or tag, or None for the remote's default branch
+
+    Returns
+    -------
+    str | None
+        Commit hash, or None if no branch or tag matches ``checkout`` (it may
+        be a commit hash)
+
+    Raises
+    ------
+    subprocess.CalledProcessError
+        If the remote cannot be reached
+    """
+    refs = {}
+    for line in _git("ls-remote", url, checkout or "HEAD").splitlines():
+        commit, ref = line.split("\t", 1)
+        refs[ref] = commit
+    for candidate in (
+        f"refs/tags/{checkout}^{{}}",
+        f"refs/tags/{checkout}",
+        f"refs/heads/{checkout}",
+    ):
+        if checkout and candidate in refs:
+            return refs[candidate]
+    return next(iter(refs.values()), None)
+
+
+def read_metadata(entry: Path) -> dict | None:
+    """Return the metadata of a cached checkout, or None if it is not cached."""
+    try:
+        metadata = json.loads((entry / METADATA_FILE).read_text())
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+    return metadata if (entry / TEMPLATE_SUBDIR).is_dir() else None
+
+
+def fetch_checkout(url: str, checkout: str | None, entry: Path) -> dict:
+    """Clone a ref into a cache entry, replacing any previous checkout.
+
+    The clone is made next to the entry and swapped in once complete, so an
+    interrupted fetch never leaves a half-written checkout in the cache.
+
+    Parameters
+    ----------
+    url : str
+        Git repository URL
+    checkout : str | None
+        Branch, tag or commit, or None for the default branch
+    entry : Path
+        Cache directory from :func:`cache_entry`
+
+    Returns
+    -------
+    dict
+        Metadata written for the new checkout
+
+    Raises
+    ------
+    TemplateCacheError
+        If the repository cannot be cloned or the ref does not exist
+    """
+    entry.parent.mkdir(parents=True, exist_ok=True)
+    staging = entry.with_name(f".{entry.name}.{uuid.uuid4().hex[:8]}.tmp")
+    template = staging / TEMPLATE_SUBDIR
+    try:
+        if checkout and _COMMIT_REGEX.match(checkout):
+            # Commits cannot be cloned by name, so clone fully and check out
+            _git("clone", "--quiet", url, str(template))
+            _git("-C", str(template), "checkout", "--quiet", checkout)
+        else:
+            branch = ["--branch", checkout] if checkout else []
+            _git("clone", "--quiet", "--depth", "1", *branch, url, str(template))
+        metadata = {
+            "url": url,
+            "checkout": checkout,
+            "commit": _git("-C", str(template), "rev-parse", "HEAD"),
+        }
+        (staging / METADATA_FILE).write_text(json.dumps(metadata, indent=2) + "\n")
+
+        if entry.exists():
+            old = entry.with_name(f".{entry.name}.{uuid.uuid4().hex[:8]}.old")
+            entry.rename(old)
+            shutil.rmtree(old, ignore_errors=True)
+        staging.rename(entry)
+    except subprocess.CalledProcessError as e:
+        raise TemplateCacheError(
+            f"Could not fetch {url} at {checkout or 'default branch'}: {e.stderr.strip()}"
+        ) from e
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+    return metadata
+
+
+def cached_template(
+    template: str,
+    checkout: str | None = None,
+    offline: bool = False,
+    abbreviations: dict[str, str] | None = None,
+    root: Path | None = None,
+) -> tuple[str, str | None]:
+    """Return a local checkout of a template, fetching it only if it changed.
+
+    Local paths and zip files are returned unchanged, as are Mercurial
+    repositories, which are left for cookiecutter to handle.
+
+    Parameters
+    ----------
+    template : str
+        Template path, URL or abbreviation (e.g. ``gh:owner/repo``)
+    checkout : str | None, optional
+        Branch, tag or commit to use
+    offline : bool, optional
+        Use the cached checkout without contacting the remote
+    abbreviations : dict[str, str] | None, optional
+        Template abbreviations, defaulting to cookiecutter's built-in ones
+    root : Path | None, optional
+        Cache directory, defaulting to :func:`cache_root`
+
+    Returns
+    -------
+    tuple[str, str | None]
+        Template to pass to cookiecutter, and the ref it should still check
+        out (None once the checkout is served from the cache)
+
+    Raises
+    ------
+    TemplateCacheError
+        If the template is not cached in offline mode, or cannot be fetched
+    """
+    url = expand_abbreviations(template, abbreviations or BUILTIN_ABBREVIATIONS)
+    if not is_repo_url(url) or url.startswith("hg+") or url.lower().endswith(".zip"):
+        return template, checkout
+    url = url.removeprefix("git+")
+
+    entry = cache_entry(url, checkout, root)
+    metadata = read_metadata(entry)
+    cached = str(entry / TEMPLATE_SUBDIR)
+
+    if offline:
+        if metadata is None:
+            raise TemplateCacheError(
+                f"{url} at {checkout or 'default branch'} is not cached; run once without --offline"
+            )
+        return cached, None
+
+    if metadata and checkout and _COMMIT_REGEX.match(checkout):
+        if metadata["commit"].startswith(checkout):
+            return cached, None
+
+    try:
+        commit = remote_commit(url, checkout)
+    except (OSError, subprocess.CalledProcessError) as e:
+        if metadata is None:
+            stderr = getattr(e, "stderr", None) or str(e)
+            raise TemplateCacheError(f"Could not reach {url}: {stderr.strip()}") from e
+        logger.warning("Could not reach %s; using cached commit %s", url, metadata["commit"][:12])
+        return cached, None
+
+    if metadata and commit == metadata["commit"]:
+        logger.debug("Template cache hit for %s at %s", url, commit[:12])
+        return cached, None
+
+    fetch_checkout(url, checkout, entry)
+    return cached, None
+
+
+def template_commit(template_dir: str | Path) -> str | None:
+    """Return the commit a local template directory was checked out at.
+
+    Parameters
+    ----------
+    template_dir : str | Path
+        Cached checkout from :func:`cached_template`, or a local git clone
+
+    Returns
+    -------
+    str | None
+        Commit hash, or None if the directory is not a git checkout
+    """
+    template_dir = Path(template_dir)
+    if template_dir.name == TEMPLATE_SUBDIR:
+        metadata = read_metadata(template_dir.parent)
+        if metadata is not None:
+            return metadata["commit"]
+    try:
+        return _git("-C", str(template_dir), "rev-parse", "HEAD")
+    except (OSError, subprocess.CalledProcessError):
+        return None
@@ -0,0 +1,329 @@
+"""Re-apply a newer version of the template to an existing project.
+
+Every generated project records its answers to the template's questions in
+``.nhs-rap-template.json``; projects created with ``nhs-rap-template`` also
+record the template source and commit there. An update renders the project
+twice from those answers, once at the recorded commit (the base) and once at
+the new ref, and applies only the files that differ between the two renders:
+
+- a file the user has not touched is replaced by the new render
+- a file the user has edited is three-way merged (``git merge-file``), and
+  overlapping edits are left with conflict markers to resolve by hand
+- a file the template added is created, and a file it removed is deleted
+  unless the user has edited it
+
+Files that render identically at both versions are never touched, so local
+changes to them are kept as they are.
+"""
+
+import json
+import stat
+import subprocess
+import tempfile
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from nhse_rap_cookiecutter.rendering import render_project
+
+ANSWERS_FILE = ".nhs-rap-template.json"
+
+
+class UpdateError(Exception):
+    """Raised when a project cannot be updated."""
+
+
+@dataclass
+class UpdateReport:
+    """Files changed, or left for the user, by a project update.
+
+    Attributes
+    ----------
+    updated : list[str]
+        Files replaced by the new render, or merged without conflicts
+    added : list[str]
+        Files created because the template added them
+    removed : list[str]
+        Files deleted because the template removed them
+    conflicts : list[str]
+        Files merged with conflict markers, or removed from the template
+        but edited locally (and so kept)
+    """
+
+    updated: list[str] = field(default_factory=list)
+    added: list[str] = field(default_factory=list)
+    removed: list[str] = field(default_factory=list)
+    conflicts: list[str] = field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        return bool(self.updated or self.added or self.removed or self.conflicts)
+
+
+def load_answers(project_dir: str | Path) -> dict[str, Any]:
+    """Read the answers a project was generated with.
+
+    Parameters
+    ----------
+    project_dir : str | Path
+        Generated project directory
+
+    Returns
+    -------
+    dict[str, Any]
+        Template variables, plus ``_template`` and ``_commit`` if recorded
+
+    Raises
+    ------
+    UpdateError
+        If the project has no answers file
+    """
+    answers_file = Path(project_dir) / ANSWERS_FILE
+    try:
+        return json.loads(answers_file.read_text(encoding="utf-8"))
+    except FileNotFoundError as e:
+        raise UpdateError(
+            f"{answers_file} not found; only projects generated from template "
+            "versions that record their answers can be updated"
+        ) from e
+
+
+def with_template_source(answers_json: str, template: str, commit: str | None) -> str:
+    """Return an answers file's content with the template and commit added.
+
+    Parameters
+    ----------
+    answers_json : str
+        Content of a rendered answers file
+    template : str
+        Template path, URL or abbreviation as given by the user (local paths
+        are recorded as absolute paths)
+    commit : str | None
+        Template commit, if known
+
+    Returns
+    -------
+    str
+        Answers file content with ``_template`` (and ``_commit``) set
+    """
+    answers = json.loads(answers_json)
+    answers["_template"] = str(Path(template).resolve()) if Path(template).is_dir() else template
+    if commit:
+        answers["_commit"] = commit
+    return json.dumps(answers, indent=4) + "\n"
+
+
+def record_template_source(project_dir: str | Path, template: str, commit: str | None) -> None:
+    """Record the template and commit a project was generated from in its answers file.
+
+    Parameters
+    ----------
+    project_dir : str | Path
+        Generated project directory
+    template : str
+        Template path, URL or abbreviation as given by the user
+    commit : str | None
+        Template commit, if known
+    """
+    answers_file = Path(project_dir) / ANSWERS_FILE
+    if not answers_file.exists():
+        return
+    answers_file.write_text(
+        with_template_source(answers_file.read_text(encoding="utf-8"), template, commit),
+        encoding="utf-8",
+    )
+
+
+def render_snapshot(template_dir: str | Path, answers: dict[str, Any], output_dir: Path) -> Path:
+    """Render a project from recorded answers, with its post-generation hook.
+
+    Parameters
+    ----------
+    template_dir : str | Path
+        Local template directory
+    answers : dict[str, Any]
+        Recorded answers; keys starting with an underscore are ignored
+    output_dir : Path
+        Scratch directory to render into
+
+    Returns
+    -------
+    Path
+        Rendered project directory
+    """
+    extra_context = {key: value for key, value in answers.items() if not key.startswith("_")}
+    return render_project(template_dir, output_dir, extra_context)
+
+
+def list_files(project_dir: Path) -> dict[str, bytes]:
+    """Return the content of every file in a rendered project, by posix relative path."""
+    return {
+        path.relative_to(project_dir).as_posix(): path.read_bytes()
+        for path in project_dir.rglob("*")
+        if path.is_file()
+    }
+
+
+def list_modes(project_dir: Path) -> dict[str, int]:
+    """Return the permission bits of every file in a rendered project, by posix relative path."""
+    return {
+        path.relative_to(project_dir).as_posix(): stat.S_IMODE(path.stat().st_mode)
+        for path in project_dir.rglob("*")
+        if path.is_file()
+    }
+
+
+def merge_file(ours: bytes, base: bytes, theirs: bytes) -> tuple[bytes, bool]:
+    """Three-way merge a file's content with ``git merge-file``.
+
+    Parameters
+    ----------
+    ours : bytes
+        The user's copy
+    base : bytes
+        The old template render
+    theirs : bytes
+        The new template render
+
+    Returns
+    -------
+    tuple[bytes, bool]
+        Merged content, and whether it contains conflict markers. Binary files
+        cannot be merged and are returned unchanged as a conflict.
+    """
+    if b"\0" in ours + base + theirs:
+        return ours, True
+    with tempfile.TemporaryDirectory() as scratch:
+        paths = []
+        for name, content in (("current", ours), ("base", base), ("template", theirs)):
+            path = Path(scratch) / name
+            path.write_bytes(content)
+            paths.append(str(path))
+        result = subprocess.run(
+            ["git", "merge-file", "-p", "-L", "yours", "-L", "old template", "-L", "new template"]
+            + paths,
+            capture_output=True,
+        )
+    # git merge-file exits with the number of conflicts, or a negative status on error
+    if result.returncode < 0 or result.returncode > 127:
+        raise UpdateError(f"git merge-file failed: {result.stderr.decode(errors='replace')}")
+    return result.stdout, result.returncode > 0
+
+
+def apply_update(
+    project_dir: Path,
+    base: dict[str, bytes],
+    new: dict[str, bytes],
+    dry_run: bool = False,
+    new_modes: dict[str, int] | None = None,
+) -> UpdateReport:
+    """Apply the differences between two template renders to a project.
+
+    Parameters
+    ----------
+    project_dir : Path
+        Project to update
+    base : dict[str, bytes]
+        Files rendered at the version the project was generated from
+    new : dict[str, bytes]
+        Files rendered at the version to update to
+    dry_run : bool, optional
+        Report what would change without writing anything
+    new_modes : dict[str, int] | None, optional
+        Permission bits of the files rendered at the new version, given to
+        files the new version adds
+
+    Returns
+    -------
+    UpdateReport
+        Files updated, added, removed or left with conflicts
+    """
+    new_modes = new_modes or {}
+    report = UpdateReport()
+    for relative in sorted(base.keys() | new.keys()):
+        old, latest = base.get(relative), new.get(relative)
+        if old == latest:
+            continue
+        target = project_dir / relative
+        current = target.read_bytes() if target.is_file() else None
+
+        if current == latest:
+            continue
+        if latest is None:
+            if current is None:
+                continue
+            if current == old:
+                report.removed.append(relative)
+                if not dry_run:
+                    target.unlink()
+            else:
+                report.conflicts.append(relative)
+            continue
+        if current is None:
+            if old is None:
+                report.added.append(relative)
+                if not dry_run:
+                    target.parent.mkdir(parents=True, exist_ok=True)
+                    target.write_bytes(latest)
+                    if relative in new_modes:
+                        target.chmod(new_modes[relative])
+            # Otherwise the user deleted a file the template still has; keep it deleted
+            continue
+
+        if current == old:
+            content, conflict = latest, False
+        else:
+            content, conflict = merge_file(current, old or b"", latest)
+        (report.conflicts if conflict else report.updated).append(relative)
+        if not dry_run:
+            target.write_bytes(content)
+    return report
+
+
+def update_project(
+    project_dir: str | Path,
+    old_template: str | Path,
+    new_template: str | Path,
+    dry_run: bool = False,
+) -> UpdateReport:
+    """Update a project from one template version to another.
+
+    Parameters
+    ----------
+    project_dir : str | Path
+        Generated project directory containing its answers file
+    old_template : str | Path
+        Local checkout of the template version the project was generated from
+    new_template : str | Path
+        Local checkout of the template version to update to
+    dry_run : bool, optional
+        Report what would change without writing anything
+
+    Returns
+    -------
+    UpdateReport
+        Files updated, added, removed or left with conflicts
+
+    Raises
+    ------
+    UpdateError
+        If the project has no answers file
+    """
+    project_dir = Path(project_dir)
+    answers = load_answers(project_dir)
+    with tempfile.TemporaryDirectory() as scratch:
+        base = list_files(render_snapshot(old_template, answers, Path(scratch) / "base"))
+        new_dir = render_snapshot(new_template, answers, Path(scratch) / "new")
+        new, new_modes = list_files(new_dir), list_modes(new_dir)
+    # The answers file is bookkeeping, not a template change to merge: it is
+    # replaced by the new render's answers, which include any new questions
+    base.pop(ANSWERS_FILE, None)
+    new_answers = new.pop(ANSWERS_FILE, None)
+
+    report = apply_update(project_dir, base, new, dry_run, new_modes)
+    if not dry_run and new_answers is not None:
+        refreshed = json.loads(new_answers)
+        refreshed.update({key: value for key, value in answers.items() if key.startswith("_")})
+        (project_dir / ANSWERS_FILE).write_text(
+            json.dumps(refreshed, indent=4) + "\n", encoding="utf-8"
+        )
+    return report
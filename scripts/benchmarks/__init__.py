@@ -0,0 +1 @@
+"""Benchmarks for generate_projects script."""
@@ -0,0 +1,110 @@
+# ruff: noqa: B008
+"""Compare per-config overhead of the subprocess and in-process render engines.
+
+Each configuration from configs.yaml is rendered with both engines into a
+throwaway directory and the wall-clock time per render is reported. Every
+subprocess render starts a new interpreter; the first in-process render builds
+the shared Jinja environment and later renders reuse it.
+
+Examples
+--------
+Benchmark every configuration once per engine:
+    $ uv run python -m scripts.benchmarks.engine_overhead
+
+Benchmark one configuration, three rounds per engine:
+    $ uv run python -m scripts.benchmarks.engine_overhead --config minimal --rounds 3
+"""
+
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+import typer
+from loguru import logger
+
+from scripts.generate_projects import (
+    ExistsStrategy,
+    RenderEngine,
+    generate_project,
+    load_test_configs,
+)
+
+app = typer.Typer(help="Benchmark render engines")
+
+
+def time_engine(
+    engine: RenderEngine,
+    test_configs: dict[str, dict],
+    rounds: int,
+) -> list[float]:
+    """Render every configuration ``rounds`` times and return each duration.
+
+    Parameters
+    ----------
+    engine : RenderEngine
+        Engine used to render each configuration
+    test_configs : dict[str, dict]
+        Dictionary of configuration name to configuration values
+    rounds : int
+        Number of times to render the full set of configurations
+
+    Returns
+    -------
+    list[float]
+        Wall-clock seconds for each individual render
+    """
+    durations = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for _ in range(rounds):
+            for config_name, config_values in test_configs.items():
+                start = time.perf_counter()
+                generate_project(
+                    config_name, config_values, Path(tmp), ExistsStrategy.CLEAN, engine
+                )
+                durations.append(time.perf_counter() - start)
+    return durations
+
+
+@app.command()
+def main(
+    config: str | None = typer.Option(
+        None,
+        "--config",
+        "-c",
+        help="Benchmark only a specific configuration by name",
+    ),
+    rounds: int = typer.Option(
+        1,
+        "--rounds",
+        "-r",
+        min=1,
+        help="Number of times to render each configuration per engine",
+    ),
+) -> None:
+    """Print mean, median and total render time per engine."""
+    logger.remove()
+    test_configs = load_test_configs()
+    if config:
+        test_configs = {config: test_configs[config]}
+
+    results = {engine: time_engine(engine, test_configs, rounds) for engine in RenderEngine}
+
+    print(f"\n{len(test_configs)} config(s) x {rounds} round(s)\n")
+    print(f"{'engine':<12}{'mean ms':>10}{'median ms':>12}{'first ms':>10}{'total s':>10}")
+    for engine, durations in results.items():
+        print(
+            f"{engine.value:<12}"
+            f"{statistics.mean(durations) * 1000:>10.1f}"
+            f"{statistics.median(durations) * 1000:>12.1f}"
+            f"{durations[0] * 1000:>10.1f}"
+            f"{sum(durations):>10.2f}"
+        )
+
+    baseline = statistics.mean(results[RenderEngine.SUBPROCESS])
+    in_process = statistics.mean(results[RenderEngine.IN_PROCESS])
+    print(f"\nPer-config overhead saved: {(baseline - in_process) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    app()
@@ -0,0 +1,362 @@
+# ruff: noqa: B008
+"""Benchmark template rendering and project generation, and catch regressions.
+
+Measures, in milliseconds:
+
+- ``cold/<config>``: generating each configs.yaml entry in a new interpreter
+  (``generate_projects.py generate --config <config>``), including startup
+- ``warm/<config>``: generating each entry in this process once the Jinja
+  environment is warm
+- ``template/<file>``: rendering the heavy conditional templates (Makefile,
+  _pyproject.toml, _environment.yml) for every configuration
+- ``cli/help``: running ``nhs-rap-template --help``
+- ``cli/import``: importing ``nhse_rap_cookiecutter.cli``, as reported by
+  ``python -X importtime``
+
+Each metric is the median of ``--rounds`` runs. Every run is appended to a
+history file and compared with a baseline file; a metric more than
+``--threshold`` slower than its baseline (and slower by at least
+``--min-delta-ms``) fails the run. Baselines are machine specific, so record
+one with ``--update-baseline`` on the machine that runs the comparison.
+
+Examples
+--------
+Run the suite and compare against scripts/benchmarks/baseline.json:
+    $ uv run python -m scripts.benchmarks.suite
+
+Record a new baseline:
+    $ uv run python -m scripts.benchmarks.suite --update-baseline
+
+Fail only on regressions above 50%:
+    $ uv run python -m scripts.benchmarks.suite --threshold 0.5
+"""
+
+import json
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+import typer
+from loguru import logger
+
+from nhse_rap_cookiecutter.rendering import load_context, render_file
+from scripts.generate_projects import (
+    ExistsStrategy,
+    generate_project,
+    load_test_configs,
+)
+
+app = typer.Typer(help="Benchmark template rendering and generation")
+
+BENCHMARK_DIR = Path(__file__).parent
+REPO_ROOT = BENCHMARK_DIR.parent.parent
+
+# Templates whose output branches on the most cookiecutter variables
+HEAVY_TEMPLATES = ("Makefile", "_pyproject.toml", "_environment.yml")
+
+
+def median_ms(func: Any, rounds: int) -> float:
+    """Call ``func`` ``rounds`` times and return the median duration in milliseconds."""
+    durations = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        func()
+        durations.append((time.perf_counter() - start) * 1000)
+    return statistics.median(durations)
+
+
+def bench_cold_generation(test_configs: dict[str, dict], rounds: int) -> dict[str, float]:
+    """Time generating each configuration in a new interpreter.
+
+    Parameters
+    ----------
+    test_configs : dict[str, dict]
+        Dictionary of configuration name to configuration values
+    rounds : int
+        Number of runs per configuration
+
+    Returns
+    -------
+    dict[str, float]
+        ``cold/<config>`` to median milliseconds
+    """
+    metrics = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for config_name in test_configs:
+            cmd = [
+                sys.executable,
+                str(REPO_ROOT / "scripts" / "generate_projects.py"),
+                "generate",
+                "--config",
+                config_name,
+                "--output-dir",
+                tmp,
+                "--no-golden",
+            ]
+            metrics[f"cold/{config_name}"] = median_ms(
+                lambda cmd=cmd: subprocess.run(cmd, check=True, capture_output=True), rounds
+            )
+    return metrics
+
+
+def bench_warm_generation(test_configs: dict[str, dict], rounds: int) -> dict[str, float]:
+    """Time generating each configuration in this process after a warm-up render.
+
+    Parameters
+    ----------
+    test_configs : dict[str, dict]
+        Dictionary of configuration name to configuration values
+    rounds : int
+        Number of runs per configuration
+
+    Returns
+    -------
+    dict[str, float]
+        ``warm/<config>`` to median milliseconds
+    """
+    metrics = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        output_dir = Path(tmp)
+        for config_name, config_values in test_configs.items():
+
+            def generate(config_name=config_name, config_values=config_values):
+                generate_project(config_name, config_values, output_dir, ExistsStrategy.CLEAN)
+
+            generate()
+            metrics[f"warm/{config_name}"] = median_ms(generate, rounds)
+    return metrics
+
+
+def bench_templates(test_configs: dict[str, dict], rounds: int) -> dict[str, float]:
+    """Time rendering the heavy conditional templates for every configuration.
+
+    Parameters
+    ----------
+    test_configs : dict[str, dict]
+        Dictionary of configuration name to configuration values
+    rounds : int
+        Number of runs per template
+
+    Returns
+    -------
+    dict[str, float]
+        ``template/<file>`` to median milliseconds for rendering the file once
+        per configuration
+    """
+    contexts = [
+        load_context(REPO_ROOT, {k: v for k, v in values.items() if k != "config_description"})
+        for values in test_configs.values()
+    ]
+    metrics = {}
+    for template in HEAVY_TEMPLATES:
+
+        def render(template=template):
+            for context in contexts:
+                render_file(REPO_ROOT, template, context)
+
+        render()
+        metrics[f"template/{template}"] = median_ms(render, rounds)
+    return metrics
+
+
+def bench_cli_startup(rounds: int) -> dict[str, float]:
+    """Time ``nhs-rap-template --help``.
+
+    Falls back to calling the CLI entry point with this interpreter if the
+    console script is not on PATH.
+
+    Parameters
+    ----------
+    rounds : int
+        Number of runs
+
+    Returns
+    -------
+    dict[str, float]
+        ``cli/help`` to median milliseconds
+    """
+    executable = shutil.which("nhs-rap-template")
+    if executable:
+        cmd = [executable, "--help"]
+    else:
+        cmd = [
+            sys.executable,
+            "-c",
+            "from nhse_rap_cookiecutter.cli import main; main()",
+            "--help",
+        ]
+    return {
+        "cli/help": median_ms(lambda: subprocess.run(cmd, check=True, capture_output=True), rounds)
+    }
+
+
+def bench_cli_import(rounds: int) -> dict[str, float]:
+    """Time importing the CLI module with ``python -X importtime``.
+
+    Parameters
+    ----------
+    rounds : int
+        Number of runs
+
+    Returns
+    -------
+    dict[str, float]
+        ``cli/import`` to the median cumulative import time in milliseconds
+    """
+    cmd = [sys.executable, "-X", "importtime", "-c", "import nhse_rap_cookiecutter.cli"]
+    durations = []
+    for _ in range(rounds):
+        stderr = subprocess.run(cmd, check=True, capture_output=True, text=True).stderr
+        # The module's own line is last, with its cumulative time in microseconds
+        cumulative_us = stderr.strip().splitlines()[-1].split("|")[1]
+        durations.append(int(cumulative_us) / 1000)
+    return {"cli/import": statistics.median(durations)}
+
+
+def compare_to_baseline(
+    metrics: dict[str, float],
+    baseline: dict[str, float],
+    threshold: float,
+    min_delta_ms: float,
+) -> list[str]:
+    """Return the metrics that regressed against the baseline.
+
+    Parameters
+    ----------
+    metrics : dict[str, float]
+        Metrics from this run, in milliseconds
+    baseline : dict[str, float]
+        Baseline metrics, in milliseconds
+    threshold : float
+        Allowed slowdown as a fraction of the baseline (0.2 = 20%)
+    min_delta_ms : float
+        Slowdowns smaller than this many milliseconds are treated as noise
+
+    Returns
+    -------
+    list[str]
+        Names of metrics slower than the baseline by more than both limits
+    """
+    regressions = []
+    for name, value in metrics.items():
+        reference = baseline.get(name)
+        if reference is None:
+            continue
+        if value > reference * (1 + threshold) and value - reference > min_delta_ms:
+            regressions.append(name)
+    return regressions
+
+
+def append_history(history_file: Path, run: dict[str, Any]) -> None:
+    """Append one run to the JSON history file, creating it if needed.
+
+    Parameters
+    ----------
+    history_file : Path
+        JSON file holding a list of previous runs
+    run : dict[str, Any]
+        Run to append (timestamp, environment and metrics)
+    """
+    history = json.loads(history_file.read_text()) if history_file.exists() else []
+    history.append(run)
+    history_file.write_text(json.dumps(history, indent=2) + "\n")
+
+
+@app.command()
+def main(
+    rounds: int = typer.Option(
+        3,
+        "--rounds",
+        "-r",
+        min=1,
+        help="Number of runs per metric (the median is reported)",
+    ),
+    baseline_file: Path = typer.Option(
+        BENCHMARK_DIR / "baseline.json",
+        "--baseline",
+        help="Baseline metrics to compare against",
+    ),
+    history_file: Path = typer.Option(
+        BENCHMARK_DIR / "history.json",
+        "--history",
+        help="JSON file every run is appended to",
+    ),
+    threshold: float = typer.Option(
+        0.2,
+        "--threshold",
+        min=0.0,
+        help="Allowed slowdown against the baseline, as a fraction",
+    ),
+    min_delta_ms: float = typer.Option(
+        5.0,
+        "--min-delta-ms",
+        min=0.0,
+        help="Ignore slowdowns smaller than this many milliseconds",
+    ),
+    update_baseline: bool = typer.Option(
+        False,
+        "--update-baseline",
+        help="Write this run's metrics as the new baseline",
+    ),
+    skip_cold: bool = typer.Option(
+        False,
+        "--skip-cold",
+        help="Skip the cold (new interpreter) generation benchmarks",
+    ),
+) -> None:
+    """Run the benchmark suite, record it and fail on regressions."""
+    logger.remove()
+    test_configs = load_test_configs()
+
+    metrics: dict[str, float] = {}
+    if not skip_cold:
+        metrics |= bench_cold_generation(test_configs, rounds)
+    metrics |= bench_warm_generation(test_configs, rounds)
+    metrics |= bench_templates(test_configs, rounds)
+    metrics |= bench_cli_startup(rounds)
+    metrics |= bench_cli_import(rounds)
+
+    baseline = json.loads(baseline_file.read_text()) if baseline_file.exists() else {}
+    print(f"\n{'metric':<40}{'ms':>10}{'baseline':>10}{'change':>9}")
+    for name, value in metrics.items():
+        reference = baseline.get(name)
+        change = f"{(value / reference - 1) * 100:+.0f}%" if reference else "-"
+        reference_text = f"{reference:.1f}" if reference else "-"
+        print(f"{name:<40}{value:>10.1f}{reference_text:>10}{change:>9}")
+
+    append_history(
+        history_file,
+        {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "rounds": rounds,
+            "metrics": metrics,
+        },
+    )
+
+    if update_baseline:
+        baseline_file.write_text(json.dumps(metrics, indent=2) + "\n")
+        print(f"\nBaseline written to {baseline_file}")
+        return
+
+    if not baseline:
+        print(f"\nNo baseline at {baseline_file}; run with --update-baseline to record one")
+        return
+
+    regressions = compare_to_baseline(metrics, baseline, threshold, min_delta_ms)
+    if regressions:
+        print(f"\nRegressed by more than {threshold:.0%}: {', '.join(regressions)}")
+        raise typer.Exit(code=1)
+    print(f"\nNo regressions above {threshold:.0%}")
+
+
+if __name__ == "__main__":
+    app()
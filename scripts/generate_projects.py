@@ -21,40 +21,516 @@ Generate specific configuration:
 Auto-cleanup after successful generation:
     $ uv run python scripts/generate_projects.py generate --auto-cleanup
 
+Generate configurations in parallel across 4 worker processes:
+    $ uv run python scripts/generate_projects.py generate --jobs 4
+
+Render and validate in memory, writing only failed projects to tmp/:
+    $ uv run python scripts/generate_projects.py generate --matrix pairwise --in-memory
+    $ uv run python scripts/generate_projects.py generate --in-memory --materialize
+
+Shell out to the cookiecutter CLI instead of rendering in-process:
+    $ uv run python scripts/generate_projects.py generate --engine subprocess
+
 Handle existing projects differently:
     $ uv run python scripts/generate_projects.py generate --exists skip
     $ uv run python scripts/generate_projects.py generate --exists fail
     $ uv run python scripts/generate_projects.py generate --exists clean
+    $ uv run python scripts/generate_projects.py generate --exists reuse
+
+Generate a matrix built from the choices in cookiecutter.json:
+    $ uv run python scripts/generate_projects.py generate --matrix pairwise
+    $ uv run python scripts/generate_projects.py generate --matrix n-wise --strength 3
+    $ uv run python scripts/generate_projects.py generate --matrix full
+
+Record golden manifests, or skip comparing against them:
+    $ uv run python scripts/generate_projects.py generate --update-golden
+    $ uv run python scripts/generate_projects.py generate --no-golden
+
+Hardlink files that are identical across generated projects:
+    $ uv run python scripts/generate_projects.py generate --matrix pairwise --dedup
+
+Write each project straight into a tar.gz (or zip) archive, without a project directory:
+    $ uv run python scripts/generate_projects.py generate --archive tar.gz
+
+Write a Chrome trace of per-phase timings (timings.jsonl is written to the output
+directory, except by in-memory runs that write nothing else there):
+    $ uv run python scripts/generate_projects.py generate --trace trace.json
+    $ uv run python scripts/generate_projects.py generate --in-memory --timings timings.jsonl
+
+Skip configurations whose every file variant is already covered:
+    $ uv run python scripts/generate_projects.py generate --matrix full --prune
+
+Show which cookiecutter variables each template file depends on:
+    $ uv run python scripts/generate_projects.py dependencies
+    $ uv run python scripts/generate_projects.py dependencies --matrix pairwise
+
+Re-render edited template files into already generated projects:
+    $ uv run python scripts/generate_projects.py watch
+    $ uv run python scripts/generate_projects.py watch --config minimal
 
 List available configurations:
     $ uv run python scripts/generate_projects.py list-configs
+    $ uv run python scripts/generate_projects.py list-configs --matrix pairwise
 
 Cleanup generated projects:
     $ uv run python scripts/generate_projects.py cleanup
     $ uv run python scripts/generate_projects.py cleanup --config minimal
 """
 
+import fnmatch
+import hashlib
+import itertools
 import json
+import math
+import os
 import shutil
+import stat
 import subprocess
 import sys
+import time
+import uuid
+from collections.abc import Callable, Iterator
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor, as_completed, wait
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
 from enum import Enum
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
+import cookiecutter.generate
 import typer
 import yaml
+from jinja2 import nodes
 from loguru import logger
 
+from nhse_rap_cookiecutter.archive import ArchiveFormat, write_archive
+from nhse_rap_cookiecutter.fastcopy import copy_file
+from nhse_rap_cookiecutter.file_rules import FILE_RULES_KEY, rule_variables
+from nhse_rap_cookiecutter.rendering import (
+    IN_PROCESS_HOOKS_ENV_VAR,
+    RenderedFile,
+    get_environment,
+    is_binary_file,
+    load_context,
+    render_file,
+    render_path,
+    render_project,
+    render_project_files,
+)
+from nhse_rap_cookiecutter.rendering import post_gen_paths as hook_paths
+
 app = typer.Typer(help="Generate cookiecutter projects")
 
 
+# Parts of the repository that determine what a configuration renders to
+TEMPLATE_PATHS = ("{{ cookiecutter.repo_name }}", "hooks", "cookiecutter.json")
+
+# File in each config output directory recording the render key of its project
+RENDER_KEY_FILE = ".render-key"
+
+# Index key for the post-generation hook, which decides which files survive
+HOOK_PATH = "hooks/post_gen_project.py"
+
+# Directory of golden manifests, one <config>.json per configuration
+GOLDEN_DIR = Path(__file__).parent / "golden"
+
+# File in each config output directory caching the manifest of its project
+MANIFEST_CACHE_FILE = ".manifest-cache.json"
+
+# Generated files rendered with {% now %}; golden manifests only check they exist
+GOLDEN_VOLATILE = ("LICENSE", "mkdocs.yml", "models/model_card_template.md")
+
+# Suffix of directories renamed out of the way and awaiting background deletion
+TRASH_SUFFIX = ".deleting"
+
+# Timed phases of generate_project, in the order they run
+PHASES = (
+    "validate_config",
+    "handle_existing_project",
+    "render",
+    "post_gen_hook",
+    "validate_generated_project",
+    "archive",
+    "dedup",
+)
+
+# Content-addressed store (inside the output directory) that --dedup hardlinks into
+STORE_DIR = ".store"
+
+
 class ExistsStrategy(str, Enum):
-    """Strategy for handling existing project directories."""
+    """Strategy for handling existing project directories.
+
+    REUSE keeps an existing project only if it was rendered from the same
+    template tree and configuration values, and regenerates it otherwise.
+    """
 
     CLEAN = "clean"
     SKIP = "skip"
     FAIL = "fail"
+    REUSE = "reuse"
+
+
+class RenderEngine(str, Enum):
+    """How cookiecutter is invoked to render a configuration.
+
+    IN_MEMORY renders and validates each project without writing it to disk,
+    unless it fails or is explicitly materialized.
+    """
+
+    IN_PROCESS = "in-process"
+    SUBPROCESS = "subprocess"
+    IN_MEMORY = "in-memory"
+
+
+class MatrixMode(str, Enum):
+    """Source of the configurations to generate.
+
+    CONFIGS uses the hand-picked combinations in configs.yaml. The other modes
+    build configurations from the choice lists in cookiecutter.json: FULL is
+    their cartesian product, PAIRWISE covers every pair of choices and NWISE
+    covers every combination of ``--strength`` choices.
+    """
+
+    CONFIGS = "configs"
+    FULL = "full"
+    PAIRWISE = "pairwise"
+    NWISE = "n-wise"
+
+
+@dataclass(frozen=True)
+class FileDependencies:
+    """Cookiecutter variables a template file's output depends on.
+
+    Attributes
+    ----------
+    branches : frozenset[str]
+        Variables that select which template branches render, or which files
+        exist. Configurations that agree on these produce structurally
+        identical output.
+    substitutions : frozenset[str]
+        Variables whose values are only substituted into the output text
+    """
+
+    branches: frozenset[str] = frozenset()
+    substitutions: frozenset[str] = frozenset()
+
+
+@dataclass(frozen=True)
+class PhaseTiming:
+    """Wall-clock time spent in one phase of generating a configuration.
+
+    Attributes
+    ----------
+    config_name : str
+        Name of the configuration
+    phase : str
+        Name of the phase (one of PHASES)
+    start_us : int
+        Start time in microseconds since the epoch
+    duration_us : int
+        Duration in microseconds, including nested phases
+    self_us : int
+        Duration in microseconds, excluding nested phases (render excludes the hook)
+    pid : int
+        Process the phase ran in
+    """
+
+    config_name: str
+    phase: str
+    start_us: int
+    duration_us: int
+    self_us: int
+    pid: int
+
+
+class PhaseTimer:
+    """Record the duration of each phase of generating one configuration.
+
+    Phases may nest; the time spent in a nested phase is subtracted from the
+    ``self_us`` of the enclosing one.
+    """
+
+    def __init__(self, config_name: str) -> None:
+        self.config_name = config_name
+        self.timings: list[PhaseTiming] = []
+        self._nested_us: list[int] = []
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Time the enclosed block as the named phase."""
+        start_us = time.time_ns() // 1000
+        started = time.perf_counter_ns()
+        self._nested_us.append(0)
+        try:
+            yield
+        finally:
+            duration_us = (time.perf_counter_ns() - started) // 1000
+            nested_us = self._nested_us.pop()
+            if self._nested_us:
+                self._nested_us[-1] += duration_us
+            self.timings.append(
+                PhaseTiming(
+                    config_name=self.config_name,
+                    phase=name,
+                    start_us=start_us,
+                    duration_us=duration_us,
+                    self_us=duration_us - nested_us,
+                    pid=os.getpid(),
+                )
+            )
+
+
+@dataclass
+class ManifestDiff:
+    """Differences between a generated project and its golden manifest.
+
+    Attributes
+    ----------
+    added : list[str]
+        Files generated but not in the golden manifest
+    removed : list[str]
+        Files in the golden manifest but not generated
+    changed : list[str]
+        Files whose size or content hash differs from the golden manifest
+    """
+
+    added: list[str] = field(default_factory=list)
+    removed: list[str] = field(default_factory=list)
+    changed: list[str] = field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        """Return True if there are any differences."""
+        return bool(self.added or self.removed or self.changed)
+
+
+class GoldenMismatchError(Exception):
+    """Raised when a generated project does not match its golden manifest."""
+
+    def __init__(self, config_name: str, diff: ManifestDiff) -> None:
+        self.diff = diff
+        super().__init__(
+            f"{config_name}: {len(diff.added)} added, {len(diff.removed)} removed, "
+            f"{len(diff.changed)} changed file(s) compared to golden manifest"
+        )
+
+
+class ContentStore:
+    """Content-addressed store of generated files, shared by hardlinks.
+
+    Each distinct (content hash, permission bits) pair is stored once under
+    ``root``. Identical files in generated projects are replaced by hardlinks
+    to the stored copy. On filesystems without hardlink support files are left
+    as they are.
+    """
+
+    def __init__(self, root: Path) -> None:
+        self.root = root
+
+    def entry(self, digest: str, mode: int) -> Path:
+        """Return the store path for content with the given hash and permission bits."""
+        return self.root / digest[:2] / f"{digest}-{mode:o}"
+
+    def link_file(self, path: Path, digest: str) -> bool:
+        """Replace a file with a hardlink to its stored copy, adding it if new.
+
+        Parameters
+        ----------
+        path : Path
+            Generated file
+        digest : str
+            Hex SHA-256 of the file's content
+
+        Returns
+        -------
+        bool
+            True if the file now shares storage with an earlier copy
+        """
+        entry = self.entry(digest, stat.S_IMODE(path.stat().st_mode))
+        try:
+            if not entry.exists():
+                entry.parent.mkdir(parents=True, exist_ok=True)
+                os.link(path, entry)
+                return False
+            if os.path.samefile(entry, path):
+                return False
+            staging = path.with_name(f".{path.name}.{uuid.uuid4().hex[:8]}.link")
+            os.link(entry, staging)
+            os.replace(staging, path)
+            return True
+        except FileExistsError:
+            # Another process stored the same content first
+            return self.link_file(path, digest)
+        except OSError as e:
+            logger.debug(f"Cannot hardlink {path}: {e}")
+            return False
+
+    def write(self, path: Path, content: bytes, mode: int) -> bool:
+        """Create a file, as a hardlink to an identical stored copy if there is one.
+
+        Parameters
+        ----------
+        path : Path
+            File to create
+        content : bytes
+            File content
+        mode : int
+            Permission bits of the file
+
+        Returns
+        -------
+        bool
+            True if the file was linked rather than written
+        """
+        digest = hashlib.sha256(content).hexdigest()
+        entry = self.entry(digest, mode)
+        # Never write through an existing path: it may be a link to a stored copy
+        path.unlink(missing_ok=True)
+        if entry.exists():
+            try:
+                os.link(entry, path)
+                return True
+            except OSError as e:
+                logger.debug(f"Cannot hardlink {path}: {e}")
+        path.write_bytes(content)
+        path.chmod(mode)
+        self.link_file(path, digest)
+        return False
+
+    def savings(self) -> tuple[int, int, int]:
+        """Measure the disk space saved by the store.
+
+        A stored file with n project links would otherwise take n copies, so it
+        saves ``(n - 1) * size``; its link count is n + 1, counting the store.
+
+        Returns
+        -------
+        tuple[int, int, int]
+            Bytes saved, number of deduplicated project files, and number of
+            stored files they share. Stored files linked from only one project
+            save nothing and are not counted.
+        """
+        saved = deduplicated = shared = 0
+        if not self.root.exists():
+            return saved, deduplicated, shared
+        for entry in self.root.glob("*/*"):
+            entry_stat = entry.stat()
+            if entry_stat.st_nlink > 2:
+                saved += (entry_stat.st_nlink - 2) * entry_stat.st_size
+                deduplicated += entry_stat.st_nlink - 1
+                shared += 1
+        return saved, deduplicated, shared
+
+    def prune(self) -> int:
+        """Remove stored files no longer linked from any project.
+
+        Returns
+        -------
+        int
+            Number of stored files removed
+        """
+        removed = 0
+        for entry in self.root.glob("*/*"):
+            if entry.stat().st_nlink == 1:
+                entry.unlink()
+                removed += 1
+        return removed
+
+
+def format_size(num_bytes: float) -> str:
+    """Format a byte count for humans, e.g. ``1.5 MB``."""
+    for unit in ("B", "KB", "MB"):
+        if num_bytes < 1024:
+            return f"{num_bytes:.1f} {unit}"
+        num_bytes /= 1024
+    return f"{num_bytes:.1f} GB"
+
+
+def dedupe_project(project_path: Path, store: ContentStore) -> int:
+    """Hardlink every file of a generated project into the content store.
+
+    Hashes come from the project's manifest cache when it is up to date, and
+    the cache is refreshed afterwards because linked files take the stored
+    copy's mtime.
+
+    Parameters
+    ----------
+    project_path : Path
+        Path to the generated project directory
+    store : ContentStore
+        Store to link into
+
+    Returns
+    -------
+    int
+        Number of files that now share storage with an earlier copy
+    """
+    cache_file = project_path.parent / MANIFEST_CACHE_FILE
+    try:
+        cache = json.loads(cache_file.read_text())
+    except (FileNotFoundError, json.JSONDecodeError):
+        cache = {}
+    manifest = build_manifest(project_path, cache)
+
+    linked = sum(
+        store.link_file(project_path / relative, entry["sha256"])
+        for relative, entry in manifest.items()
+    )
+    for relative, (size, mtime_ns) in scan_project(project_path).items():
+        if relative in manifest:
+            manifest[relative].update(size=size, mtime_ns=mtime_ns)
+    cache_file.write_text(json.dumps(manifest))
+    logger.debug(f"Hardlinked {linked} of {len(manifest)} file(s) in {project_path.name}")
+    return linked
+
+
+@dataclass
+class WatchedProject:
+    """A generated project kept up to date by the watch command.
+
+    Attributes
+    ----------
+    config_name : str
+        Name of the configuration the project was generated from
+    config_values : dict[str, Any]
+        Dictionary of cookiecutter values
+    project_path : Path
+        Path to the generated project directory
+    context : dict[str, Any]
+        Rendered cookiecutter context, reused for every re-render
+    """
+
+    config_name: str
+    config_values: dict[str, Any]
+    project_path: Path
+    context: dict[str, Any]
+
+
+@dataclass
+class ConfigResult:
+    """Outcome of generating a single configuration in a worker process.
+
+    Attributes
+    ----------
+    config_name : str
+        Name of the configuration that was generated
+    project_path : Path | None
+        Path to the generated project, or None if skipped or failed
+    error : str | None
+        Error message if generation failed, otherwise None
+    logs : list[str]
+        Formatted log lines captured while generating this configuration
+    timings : list[PhaseTiming]
+        Phase timings recorded while generating this configuration
+    """
+
+    config_name: str
+    project_path: Path | None = None
+    error: str | None = None
+    logs: list[str] = field(default_factory=list)
+    timings: list[PhaseTiming] = field(default_factory=list)
 
 
 def load_cookiecutter_config() -> dict[str, Any]:
@@ -87,6 +563,433 @@ def load_test_configs() -> dict[str, dict[str, Any]]:
     return configs
 
 
+def get_choice_parameters(cookiecutter_config: dict[str, Any]) -> dict[str, list[Any]]:
+    """Extract the multiple-choice variables from a cookiecutter configuration.
+
+    Parameters
+    ----------
+    cookiecutter_config : dict[str, Any]
+        Parsed cookiecutter.json
+
+    Returns
+    -------
+    dict[str, list[Any]]
+        Variable name to its list of choices, excluding private ``_`` keys
+    """
+    return {
+        key: value
+        for key, value in cookiecutter_config.items()
+        if isinstance(value, list) and not key.startswith("_")
+    }
+
+
+def covering_array(parameters: dict[str, list[Any]], strength: int) -> list[dict[str, Any]]:
+    """Build a covering array in which every ``strength``-way combination appears.
+
+    Uses the IPOG (In-Parameter-Order-General) strategy. The array starts as
+    the full product of the first ``strength`` parameters and then grows one
+    parameter at a time:
+
+    - Horizontal growth gives each existing row the value of the new parameter
+      that covers the most still-uncovered combinations.
+    - Vertical growth places each remaining combination in a compatible row,
+      adding rows only when none fits.
+
+    Parameters are processed largest domain first, which keeps the array close
+    to the lower bound (the product of the ``strength`` largest domains).
+
+    Parameters
+    ----------
+    parameters : dict[str, list[Any]]
+        Variable name to its list of choices
+    strength : int
+        Interaction strength to cover (2 for pairwise)
+
+    Returns
+    -------
+    list[dict[str, Any]]
+        Rows of the covering array as variable name to chosen value
+    """
+    names = sorted(parameters, key=lambda name: -len(parameters[name]))
+    domains = [parameters[name] for name in names]
+    strength = min(strength, len(names))
+
+    rows: list[list[Any]] = [list(values) for values in itertools.product(*domains[:strength])]
+
+    for col in range(strength, len(names)):
+        earlier = list(itertools.combinations(range(col), strength - 1))
+        uncovered = {
+            (cols, values + (value,))
+            for cols in earlier
+            for values in itertools.product(*(domains[c] for c in cols))
+            for value in domains[col]
+        }
+
+        # Horizontal growth
+        for row in rows:
+            best_value, best_cover = domains[col][0], set()
+            for value in domains[col]:
+                cover = {
+                    (cols, values + (value,))
+                    for cols in earlier
+                    if None not in (values := tuple(row[c] for c in cols))
+                    and (cols, values + (value,)) in uncovered
+                }
+                if len(cover) > len(best_cover):
+                    best_value, best_cover = value, cover
+            row.append(best_value)
+            uncovered -= best_cover
+
+        # Vertical growth
+        for cols, values in sorted(uncovered, key=repr):
+            assignment = dict(zip(cols + (col,), values, strict=True))
+            for row in rows:
+                if all(row[c] is None or row[c] == v for c, v in assignment.items()):
+                    break
+            else:
+                row = [None] * (col + 1)
+                rows.append(row)
+            for c, v in assignment.items():
+                row[c] = v
+
+    for row in rows:
+        for c, value in enumerate(row):
+            if value is None:
+                row[c] = domains[c][0]
+
+    return [dict(zip(names, row, strict=True)) for row in rows]
+
+
+def build_matrix_configs(mode: MatrixMode, strength: int = 3) -> dict[str, dict[str, Any]]:
+    """Build test configurations from the choice lists in cookiecutter.json.
+
+    Free-text variables keep their cookiecutter.json defaults, apart from
+    ``project_name`` which is made unique for each configuration.
+
+    Parameters
+    ----------
+    mode : MatrixMode
+        FULL, PAIRWISE or NWISE
+    strength : int, optional
+        Interaction strength for NWISE (PAIRWISE always uses 2)
+
+    Returns
+    -------
+    dict[str, dict[str, Any]]
+        Dictionary of configuration name to configuration values, in the same
+        shape as load_test_configs()
+
+    Raises
+    ------
+    ValueError
+        If mode is CONFIGS, which is loaded from configs.yaml instead
+    """
+    parameters = get_choice_parameters(load_cookiecutter_config())
+
+    if mode == MatrixMode.FULL:
+        rows = [
+            dict(zip(parameters, values, strict=True))
+            for values in itertools.product(*parameters.values())
+        ]
+    elif mode == MatrixMode.PAIRWISE:
+        rows = covering_array(parameters, 2)
+    elif mode == MatrixMode.NWISE:
+        rows = covering_array(parameters, strength)
+    else:
+        raise ValueError(f"Matrix mode '{mode.value}' is not built from cookiecutter.json")
+
+    prefix = mode.value.replace("-", "")
+    if mode == MatrixMode.NWISE:
+        prefix = f"{strength}wise"
+
+    configs = {}
+    for idx, row in enumerate(rows, 1):
+        name = f"{prefix}_{idx:04d}"
+        configs[name] = {
+            "config_description": f"{mode.value} matrix row {idx} of {len(rows)}",
+            "project_name": f"{name}_project",
+            **{key: row[key] for key in parameters},
+        }
+
+    logger.info(f"Built {len(configs)} {mode.value} configurations from cookiecutter.json")
+    return configs
+
+
+def load_configs(matrix: MatrixMode = MatrixMode.CONFIGS, strength: int = 3) -> dict[str, dict]:
+    """Load configurations from configs.yaml or build them from cookiecutter.json.
+
+    Parameters
+    ----------
+    matrix : MatrixMode, optional
+        Source of the configurations
+    strength : int, optional
+        Interaction strength for MatrixMode.NWISE
+
+    Returns
+    -------
+    dict[str, dict]
+        Dictionary of configuration name to configuration values
+    """
+    if matrix == MatrixMode.CONFIGS:
+        return load_test_configs()
+    return build_matrix_configs(matrix, strength)
+
+
+def _collect_references(
+    node: nodes.Node, in_branch: bool, branches: set[str], substitutions: set[str]
+) -> None:
+    """Walk a Jinja AST recording ``cookiecutter.<var>`` references.
+
+    References inside ``if`` and conditional-expression tests, ``for`` loops
+    and ``set`` assignments are recorded as branch dependencies; all others as
+    substitutions. A bare ``cookiecutter`` reference depends on every variable
+    and is recorded as ``*``.
+    """
+    if isinstance(node, nodes.Getattr | nodes.Getitem) and isinstance(node.node, nodes.Name):
+        if node.node.name == "cookiecutter":
+            key = node.attr if isinstance(node, nodes.Getattr) else getattr(node.arg, "value", "*")
+            (branches if in_branch else substitutions).add(str(key))
+            return
+    if isinstance(node, nodes.Name) and node.name == "cookiecutter":
+        (branches if in_branch else substitutions).add("*")
+        return
+
+    if isinstance(node, nodes.If | nodes.CondExpr):
+        _collect_references(node.test, True, branches, substitutions)
+        children = [c for c in node.iter_child_nodes() if c is not node.test]
+    elif isinstance(node, nodes.For):
+        _collect_references(node.iter, True, branches, substitutions)
+        if node.test is not None:
+            _collect_references(node.test, True, branches, substitutions)
+        children = node.body + node.else_
+    elif isinstance(node, nodes.Assign | nodes.AssignBlock):
+        in_branch = True
+        children = list(node.iter_child_nodes())
+    else:
+        children = list(node.iter_child_nodes())
+
+    for child in children:
+        _collect_references(child, in_branch, branches, substitutions)
+
+
+def template_references(source: str, env: Any) -> tuple[set[str], set[str]]:
+    """Parse a Jinja source string and return its branch and substitution variables.
+
+    Parameters
+    ----------
+    source : str
+        Jinja template source
+    env : jinja2.Environment
+        Environment with the cookiecutter extensions loaded
+
+    Returns
+    -------
+    tuple[set[str], set[str]]
+        Branch variables and substitution variables
+    """
+    branches: set[str] = set()
+    substitutions: set[str] = set()
+    _collect_references(env.parse(source), False, branches, substitutions)
+    return branches, substitutions
+
+
+def _expand_derived(
+    variables: set[str], derived: dict[str, set[str]], all_variables: set[str]
+) -> frozenset[str]:
+    """Replace derived variables (e.g. repo_name) with the variables they come from."""
+    if "*" in variables:
+        return frozenset(all_variables)
+    expanded: set[str] = set()
+    pending = list(variables)
+    while pending:
+        name = pending.pop()
+        if name in expanded:
+            continue
+        expanded.add(name)
+        pending.extend(derived.get(name, ()))
+    return frozenset(expanded)
+
+
+@lru_cache
+def build_dependency_index(template_dir: Path | None = None) -> dict[str, FileDependencies]:
+    """Index which cookiecutter variables every template file depends on.
+
+    Every file under ``{{ cookiecutter.repo_name }}/`` is parsed, including its
+    path (a templated file name is a dependency too). Binary and
+    ``_copy_without_render`` files only depend on their path. Variables tested
+    by a file's ``_file_rules`` inclusion rule are branch variables of that
+    file. The post-generation hook is indexed under HOOK_PATH; every variable
+    it uses decides which files exist, so all of them count as branch variables.
+    Derived variables such as ``module_name`` are expanded to the variables
+    they are rendered from. The result is cached for the lifetime of the process.
+
+    Parameters
+    ----------
+    template_dir : Path | None, optional
+        Repository root containing the template (defaults to this repository)
+
+    Returns
+    -------
+    dict[str, FileDependencies]
+        Template-relative path (without the project directory prefix) to the
+        variables its output depends on
+    """
+    if template_dir is None:
+        template_dir = Path(__file__).parent.parent
+
+    with open(template_dir / "cookiecutter.json") as f:
+        cookiecutter_config = json.load(f)
+    env = get_environment({"cookiecutter": cookiecutter_config})
+    all_variables = {key for key in cookiecutter_config if not key.startswith("_")}
+    copy_only = cookiecutter_config.get("_copy_without_render", [])
+    file_rules = cookiecutter_config.get(FILE_RULES_KEY, {})
+
+    derived: dict[str, set[str]] = {}
+    for key, value in cookiecutter_config.items():
+        if isinstance(value, str) and "{" in value:
+            branch_vars, substitution_vars = template_references(value, env)
+            derived[key] = branch_vars | substitution_vars
+
+    project_root = template_dir / TEMPLATE_PATHS[0]
+    index: dict[str, FileDependencies] = {}
+    for path in sorted(project_root.rglob("*")):
+        if not path.is_file() or "__pycache__" in path.parts:
+            continue
+        relative = path.relative_to(project_root).as_posix()
+        branches, substitutions = template_references(relative, env)
+
+        copy_without_render = any(fnmatch.fnmatch(relative, pattern) for pattern in copy_only)
+        if not copy_without_render and not is_binary_file(path):
+            content_branches, content_substitutions = template_references(
+                path.read_text(encoding="utf-8"), env
+            )
+            branches |= content_branches
+            substitutions |= content_substitutions
+
+        # Whether the file exists at all depends on its inclusion rule
+        branches |= rule_variables(file_rules, relative)
+        index[relative] = FileDependencies(
+            branches=_expand_derived(branches, derived, all_variables),
+            substitutions=_expand_derived(substitutions, derived, all_variables),
+        )
+
+    hook = template_dir / HOOK_PATH
+    if hook.exists():
+        branches, substitutions = template_references(hook.read_text(encoding="utf-8"), env)
+        hook_variables = branches | substitutions
+        if file_rules and "*" in hook_variables:
+            # The hook reads the whole context to apply the file rules, and
+            # those only depend on the variables the rules test
+            hook_variables = (hook_variables - {"*"}) | rule_variables(file_rules)
+        index[HOOK_PATH] = FileDependencies(
+            branches=_expand_derived(hook_variables, derived, all_variables)
+        )
+
+    return index
+
+
+def file_variant(
+    dependencies: FileDependencies, config_values: dict[str, Any], defaults: dict[str, Any]
+) -> tuple[tuple[str, Any], ...]:
+    """Return the values of a file's branch variables for one configuration.
+
+    Two configurations with the same variant render the file through the same
+    template branches. Variables missing from the configuration take their
+    cookiecutter.json default (the first choice for list variables).
+
+    Parameters
+    ----------
+    dependencies : FileDependencies
+        Dependencies of the file
+    config_values : dict[str, Any]
+        Dictionary of cookiecutter values
+    defaults : dict[str, Any]
+        Parsed cookiecutter.json
+
+    Returns
+    -------
+    tuple[tuple[str, Any], ...]
+        Sorted (variable, value) pairs identifying the variant
+    """
+    variant = []
+    for name in sorted(dependencies.branches):
+        default = defaults.get(name)
+        if isinstance(default, list):
+            default = default[0]
+        variant.append((name, config_values.get(name, default)))
+    return tuple(variant)
+
+
+def group_file_variants(
+    test_configs: dict[str, dict[str, Any]],
+    index: dict[str, FileDependencies],
+) -> dict[str, dict[tuple, list[str]]]:
+    """Group configurations into equivalence classes for every template file.
+
+    Parameters
+    ----------
+    test_configs : dict[str, dict[str, Any]]
+        Dictionary of configuration name to configuration values
+    index : dict[str, FileDependencies]
+        Dependency index from build_dependency_index()
+
+    Returns
+    -------
+    dict[str, dict[tuple, list[str]]]
+        File path to a mapping of variant to the configurations producing it
+    """
+    defaults = load_cookiecutter_config()
+    groups: dict[str, dict[tuple, list[str]]] = {}
+    for path, dependencies in index.items():
+        classes: dict[tuple, list[str]] = {}
+        for config_name, config_values in test_configs.items():
+            variant = file_variant(dependencies, config_values, defaults)
+            classes.setdefault(variant, []).append(config_name)
+        groups[path] = classes
+    return groups
+
+
+def prune_redundant_configs(
+    test_configs: dict[str, dict[str, Any]],
+    index: dict[str, FileDependencies],
+) -> tuple[dict[str, dict[str, Any]], list[str]]:
+    """Drop configurations that render no file variant not already rendered.
+
+    Configurations are considered in order. One is kept if at least one of its
+    file variants (including the hook's) has not been produced by an earlier
+    kept configuration, so the kept set still renders every distinct variant.
+
+    Parameters
+    ----------
+    test_configs : dict[str, dict[str, Any]]
+        Dictionary of configuration name to configuration values
+    index : dict[str, FileDependencies]
+        Dependency index from build_dependency_index()
+
+    Returns
+    -------
+    tuple[dict[str, dict[str, Any]], list[str]]
+        Configurations to render and the names of those pruned
+    """
+    defaults = load_cookiecutter_config()
+    seen: set[tuple[str, tuple]] = set()
+    kept: dict[str, dict[str, Any]] = {}
+    pruned: list[str] = []
+
+    for config_name, config_values in test_configs.items():
+        variants = {
+            (path, file_variant(dependencies, config_values, defaults))
+            for path, dependencies in index.items()
+        }
+        if variants <= seen:
+            pruned.append(config_name)
+            continue
+        seen |= variants
+        kept[config_name] = config_values
+
+    return kept, pruned
+
+
 def validate_config(config_name: str, config_values: dict[str, Any]) -> None:
     """Validate that config values match options in cookiecutter.json.
 
@@ -127,71 +1030,243 @@ def validate_config(config_name: str, config_values: dict[str, Any]) -> None:
     logger.success(f"Configuration '{config_name}' validated")
 
 
-def cleanup_project(project_path: Path) -> None:
-    """Remove a generated project directory.
+@lru_cache
+def hash_template_tree(template_dir: Path | None = None) -> str:
+    """Hash the template files that determine generated project content.
+
+    Covers every file under TEMPLATE_PATHS, including its relative path, so
+    renaming, adding or removing a template file also changes the hash. The
+    result is cached for the lifetime of the process.
 
     Parameters
     ----------
-    project_path : Path
-        Path to the project directory to remove
-    """
-    if project_path.exists():
-        logger.info(f"Cleaning up {project_path}")
-        shutil.rmtree(project_path)
-        logger.success(f"Removed {project_path}")
-    else:
-        logger.debug(f"Project path does not exist: {project_path}")
+    template_dir : Path | None, optional
+        Repository root containing the template (defaults to this repository)
 
-
-def handle_existing_project(project_path: Path, strategy: ExistsStrategy) -> bool:
-    """Handle an existing project directory based on the chosen strategy.
+    Returns
+    -------
+    str
+        Hex SHA-256 digest of the template tree
+    """
+    if template_dir is None:
+        template_dir = Path(__file__).parent.parent
+
+    digest = hashlib.sha256()
+    for name in TEMPLATE_PATHS:
+        root = template_dir / name
+        paths = sorted(root.rglob("*")) if root.is_dir() else [root]
+        for path in paths:
+            if not path.is_file() or "__pycache__" in path.parts:
+                continue
+            digest.update(path.relative_to(template_dir).as_posix().encode())
+            digest.update(b"\0")
+            digest.update(path.read_bytes())
+            digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def compute_render_key(config_values: dict[str, Any], template_dir: Path | None = None) -> str:
+    """Compute the content address of a configuration's rendered output.
+
+    The key combines the template tree hash with the configuration values. It
+    also includes the current year and month, because the template renders
+    them with ``{% now %}`` (the year in LICENSE, the month in the model card).
 
     Parameters
     ----------
-    project_path : Path
-        Path to the project directory
-    strategy : ExistsStrategy
-        Strategy for handling existing directories
+    config_values : dict[str, Any]
+        Dictionary of cookiecutter values
+    template_dir : Path | None, optional
+        Repository root containing the template (defaults to this repository)
 
     Returns
     -------
-    bool
-        True if generation should proceed, False if it should be skipped
-
-    Raises
-    ------
-    FileExistsError
-        If strategy is FAIL and the directory exists
+    str
+        Hex SHA-256 digest identifying the rendered output
     """
-    if not project_path.exists():
-        return True
+    payload = {
+        "template": hash_template_tree(template_dir),
+        "config": {k: v for k, v in config_values.items() if k != "config_description"},
+        "date": datetime.now(timezone.utc).strftime("%Y-%m"),
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
 
-    logger.warning(f"Project directory already exists: {project_path}")
 
-    if strategy == ExistsStrategy.CLEAN:
-        cleanup_project(project_path)
-        return True
-    elif strategy == ExistsStrategy.SKIP:
-        logger.info(f"Skipping existing project: {project_path}")
-        return False
-    elif strategy == ExistsStrategy.FAIL:
-        raise FileExistsError(
-            f"Project directory already exists: {project_path}. "
-            "Use --exists clean to remove it first."
-        )
+_DELETION_POOL: ThreadPoolExecutor | None = None
+_PENDING_DELETIONS: list[Future] = []
 
-    return True
 
+def move_to_trash(path: Path) -> Path:
+    """Atomically rename a path out of the way so it can be deleted later.
 
-def validate_generated_project(project_path: Path, config_values: dict[str, Any]) -> None:
+    The path is renamed to a hidden sibling (same directory, so the rename
+    never crosses filesystems) ending in TRASH_SUFFIX.
+
+    Parameters
+    ----------
+    path : Path
+        File or directory to move
+
+    Returns
+    -------
+    Path
+        New location of the path
+    """
+    trash_path = path.with_name(f".{path.name}.{uuid.uuid4().hex[:8]}{TRASH_SUFFIX}")
+    path.rename(trash_path)
+    return trash_path
+
+
+def delete_in_background(path: Path) -> Future:
+    """Delete a path on the shared background deletion pool.
+
+    The pool's threads are joined when the interpreter exits, so pending
+    deletions finish before the process ends; call wait_for_deletions() to
+    block on them earlier.
+
+    Parameters
+    ----------
+    path : Path
+        File or directory to delete
+
+    Returns
+    -------
+    Future
+        Completes when the path has been deleted
+    """
+    global _DELETION_POOL
+    if _DELETION_POOL is None:
+        _DELETION_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix="cleanup")
+    if path.is_dir() and not path.is_symlink():
+        future = _DELETION_POOL.submit(shutil.rmtree, path, ignore_errors=True)
+    else:
+        future = _DELETION_POOL.submit(path.unlink, missing_ok=True)
+    _PENDING_DELETIONS.append(future)
+    return future
+
+
+def wait_for_deletions() -> None:
+    """Block until every background deletion has finished."""
+    wait(_PENDING_DELETIONS)
+    _PENDING_DELETIONS.clear()
+
+
+def trash_path(path: Path) -> Path | None:
+    """Move a path to the trash and schedule its deletion.
+
+    Falls back to deleting synchronously if the path cannot be renamed (for
+    example when another process holds it open on Windows).
+
+    Parameters
+    ----------
+    path : Path
+        File or directory to remove
+
+    Returns
+    -------
+    Path | None
+        Trash location being deleted in the background, or None if the path
+        was deleted synchronously
+    """
+    try:
+        trashed = move_to_trash(path)
+    except OSError as e:
+        logger.debug(f"Could not rename {path} ({e}), deleting in place")
+        if path.is_dir():
+            shutil.rmtree(path)
+        else:
+            path.unlink()
+        return None
+    delete_in_background(trashed)
+    return trashed
+
+
+def cleanup_project(project_path: Path) -> None:
+    """Remove a generated project directory.
+
+    The directory is renamed out of the way and deleted on a background
+    thread, so this returns as soon as the rename is done and the path can be
+    reused immediately.
+
+    Parameters
+    ----------
+    project_path : Path
+        Path to the project directory to remove
+    """
+    if project_path.exists():
+        logger.info(f"Cleaning up {project_path}")
+        trash_path(project_path)
+        logger.success(f"Removed {project_path}")
+    else:
+        logger.debug(f"Project path does not exist: {project_path}")
+
+
+def handle_existing_project(
+    project_path: Path, strategy: ExistsStrategy, render_key: str | None = None
+) -> bool:
+    """Handle an existing project directory based on the chosen strategy.
+
+    Parameters
+    ----------
+    project_path : Path
+        Path to the project directory
+    strategy : ExistsStrategy
+        Strategy for handling existing directories
+    render_key : str | None, optional
+        Render key of the configuration about to be generated (used by REUSE)
+
+    Returns
+    -------
+    bool
+        True if generation should proceed, False if it should be skipped
+
+    Raises
+    ------
+    FileExistsError
+        If strategy is FAIL and the directory exists
+    """
+    if not project_path.exists():
+        return True
+
+    logger.warning(f"Project directory already exists: {project_path}")
+
+    if strategy == ExistsStrategy.CLEAN:
+        cleanup_project(project_path)
+        return True
+    elif strategy == ExistsStrategy.SKIP:
+        logger.info(f"Skipping existing project: {project_path}")
+        return False
+    elif strategy == ExistsStrategy.FAIL:
+        raise FileExistsError(
+            f"Project directory already exists: {project_path}. "
+            "Use --exists clean to remove it first."
+        )
+    elif strategy == ExistsStrategy.REUSE:
+        key_file = project_path.parent / RENDER_KEY_FILE
+        if render_key and key_file.exists() and key_file.read_text().strip() == render_key:
+            logger.info(f"Reusing up-to-date project: {project_path}")
+            return False
+        logger.info(f"Render key changed, regenerating: {project_path}")
+        cleanup_project(project_path)
+        return True
+
+    return True
+
+
+def validate_generated_project(
+    project_path: Path,
+    config_values: dict[str, Any],
+    golden: Path | None = None,
+    update_golden: bool = False,
+) -> None:
     """Validate that generated project has basic required structure.
 
     Validation steps performed:
     1. Check critical files exist (README.md, .gitignore) - fails if missing
     2. Check expected directories exist (data, notebooks, tests, module) - warns if missing
     3. Check optional files exist (Makefile, .pre-commit-config.yaml) - logs if present
-    4. List all generated files for debugging
-    5. Raise error only if critical files are missing, warn for missing directories
+    4. Raise error only if critical files are missing, warn for missing directories
+    5. Compare every file against the golden manifest, if one is given
 
     Parameters
     ----------
@@ -199,14 +1274,91 @@ def validate_generated_project(project_path: Path, config_values: dict[str, Any]
         Path to the generated project directory
     config_values : dict[str, Any]
         Configuration values used to generate the project
+    golden : Path | None, optional
+        Golden manifest file to compare the project against
+    update_golden : bool, optional
+        Record the project as the golden manifest instead of comparing
 
     Raises
     ------
     FileNotFoundError
         If critical files are missing
+    GoldenMismatchError
+        If the project does not match the golden manifest
     """
     logger.debug(f"Validating generated project structure: {project_path}")
+    check_project_structure(lambda relative: (project_path / relative).exists(), config_values)
+
+    if golden is not None:
+        check_golden_manifest(project_path, golden, update_golden)
+
+    logger.success("Project structure validated: critical files present")
+
+
+def validate_rendered_files(
+    config_name: str,
+    files: dict[str, bytes],
+    config_values: dict[str, Any],
+    golden: Path | None = None,
+    update_golden: bool = False,
+) -> None:
+    """Validate a project rendered in memory, as validate_generated_project() does on disk.
+
+    Parameters
+    ----------
+    config_name : str
+        Name of the configuration
+    files : dict[str, bytes]
+        Relative path to content of every file in the project
+    config_values : dict[str, Any]
+        Configuration values used to generate the project
+    golden : Path | None, optional
+        Golden manifest file to compare the project against
+    update_golden : bool, optional
+        Record the project as the golden manifest instead of comparing
+
+    Raises
+    ------
+    FileNotFoundError
+        If critical files are missing
+    GoldenMismatchError
+        If the project does not match the golden manifest
+    """
+    logger.debug(f"Validating in-memory project structure: {config_name}")
+    directories = {
+        "/".join(parts[:depth])
+        for parts in (relative.split("/") for relative in files)
+        for depth in range(1, len(parts))
+    }
+    check_project_structure(
+        lambda relative: relative in files or relative in directories, config_values
+    )
 
+    if golden is not None:
+        manifest = {
+            relative: {"size": len(content), "sha256": hashlib.sha256(content).hexdigest()}
+            for relative, content in sorted(files.items())
+        }
+        compare_with_golden(config_name, manifest, golden, update_golden)
+
+    logger.success("Project structure validated: critical files present")
+
+
+def check_project_structure(exists: Callable[[str], bool], config_values: dict[str, Any]) -> None:
+    """Check a project has its critical files and expected directories.
+
+    Parameters
+    ----------
+    exists : Callable[[str], bool]
+        Returns whether a path relative to the project exists
+    config_values : dict[str, Any]
+        Configuration values used to generate the project
+
+    Raises
+    ------
+    FileNotFoundError
+        If critical files are missing
+    """
     critical_files = [
         "README.md",
         ".gitignore",
@@ -228,8 +1380,7 @@ def validate_generated_project(project_path: Path, config_values: dict[str, Any]
     logger.debug(f"Checking critical files: {critical_files}")
     missing_critical = []
     for file in critical_files:
-        file_path = project_path / file
-        if not file_path.exists():
+        if not exists(file):
             missing_critical.append(file)
             logger.error(f"Missing critical file: {file}")
         else:
@@ -238,142 +1389,1239 @@ def validate_generated_project(project_path: Path, config_values: dict[str, Any]
     logger.debug(f"Checking expected directories: {expected_dirs}")
     missing_dirs = []
     for dir_name in expected_dirs:
-        dir_path = project_path / dir_name
-        if not dir_path.exists():
+        if not exists(dir_name):
             missing_dirs.append(dir_name)
             logger.warning(f"Missing expected directory: {dir_name}")
         else:
             logger.debug(f"Found expected directory: {dir_name}")
 
-    logger.debug("Checking optional files")
-    optional_files = ["Makefile", ".pre-commit-config.yaml"]
-    for file in optional_files:
-        file_path = project_path / file
-        if not file_path.exists():
-            logger.debug(f"Optional file not found: {file}")
-        else:
-            logger.debug(f"Found optional file: {file}")
+    logger.debug("Checking optional files")
+    optional_files = ["Makefile", ".pre-commit-config.yaml"]
+    for file in optional_files:
+        if not exists(file):
+            logger.debug(f"Optional file not found: {file}")
+        else:
+            logger.debug(f"Found optional file: {file}")
+
+    if missing_critical:
+        logger.error("Validation failed: critical files missing")
+        raise FileNotFoundError(f"Generated project missing critical files: {missing_critical}")
+
+    if missing_dirs:
+        logger.warning(f"Some expected directories missing: {missing_dirs}")
+
+
+def scan_project(project_path: Path) -> dict[str, tuple[int, int]]:
+    """List every file in a project in a single ``os.scandir`` walk.
+
+    Parameters
+    ----------
+    project_path : Path
+        Path to the generated project directory
+
+    Returns
+    -------
+    dict[str, tuple[int, int]]
+        Path relative to the project (posix) to its (size, mtime_ns)
+    """
+    files = {}
+    pending = [(str(project_path), "")]
+    while pending:
+        directory, prefix = pending.pop()
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                relative = prefix + entry.name
+                if entry.is_dir(follow_symlinks=False):
+                    pending.append((entry.path, relative + "/"))
+                elif entry.is_file():
+                    stat = entry.stat()
+                    files[relative] = (stat.st_size, stat.st_mtime_ns)
+    return files
+
+
+def hash_file(path: Path) -> str:
+    """Return the hex SHA-256 digest of a file's content."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def build_manifest(
+    project_path: Path, cache: dict[str, dict[str, Any]] | None = None
+) -> dict[str, dict[str, Any]]:
+    """Build the manifest of a generated project.
+
+    Files are hashed on a thread pool. A file whose size and mtime match its
+    entry in ``cache`` reuses the cached hash instead of being read again.
+
+    Parameters
+    ----------
+    project_path : Path
+        Path to the generated project directory
+    cache : dict[str, dict[str, Any]] | None, optional
+        Previous result of build_manifest() for this project
+
+    Returns
+    -------
+    dict[str, dict[str, Any]]
+        Relative path to its ``size``, ``mtime_ns`` and ``sha256``, sorted by path
+    """
+    cache = cache or {}
+    manifest: dict[str, dict[str, Any]] = {}
+    to_hash = []
+    for relative, (size, mtime_ns) in scan_project(project_path).items():
+        cached = cache.get(relative)
+        if cached and cached["size"] == size and cached["mtime_ns"] == mtime_ns:
+            manifest[relative] = cached
+        else:
+            manifest[relative] = {"size": size, "mtime_ns": mtime_ns}
+            to_hash.append(relative)
+
+    logger.debug(f"Hashing {len(to_hash)} of {len(manifest)} file(s) in {project_path.name}")
+    with ThreadPoolExecutor() as executor:
+        digests = executor.map(hash_file, (project_path / relative for relative in to_hash))
+        for relative, digest in zip(to_hash, digests, strict=True):
+            manifest[relative]["sha256"] = digest
+
+    return dict(sorted(manifest.items()))
+
+
+def compare_manifests(
+    expected: dict[str, dict[str, Any]], actual: dict[str, dict[str, Any]]
+) -> ManifestDiff:
+    """Compare a project manifest with its golden manifest.
+
+    Files listed in GOLDEN_VOLATILE are only checked for presence.
+
+    Parameters
+    ----------
+    expected : dict[str, dict[str, Any]]
+        Golden manifest (relative path to ``size`` and ``sha256``)
+    actual : dict[str, dict[str, Any]]
+        Manifest of the generated project
+
+    Returns
+    -------
+    ManifestDiff
+        Added, removed and changed files, each sorted
+    """
+    diff = ManifestDiff(
+        added=sorted(actual.keys() - expected.keys()),
+        removed=sorted(expected.keys() - actual.keys()),
+    )
+    for relative in sorted(expected.keys() & actual.keys()):
+        if relative in GOLDEN_VOLATILE:
+            continue
+        want, got = expected[relative], actual[relative]
+        if want["size"] != got["size"] or want["sha256"] != got["sha256"]:
+            diff.changed.append(relative)
+    return diff
+
+
+def check_golden_manifest(project_path: Path, golden: Path, update: bool = False) -> ManifestDiff:
+    """Compare a generated project with its golden manifest, or record it.
+
+    The project's manifest is cached in MANIFEST_CACHE_FILE next to the
+    project, so hashes of unchanged files are reused on the next check. A
+    missing golden manifest is skipped.
+
+    Parameters
+    ----------
+    project_path : Path
+        Path to the generated project directory
+    golden : Path
+        Golden manifest file for this configuration
+    update : bool, optional
+        Write the project's manifest as the new golden manifest
+
+    Returns
+    -------
+    ManifestDiff
+        Differences found (empty when updating or skipped)
+
+    Raises
+    ------
+    GoldenMismatchError
+        If the project does not match the golden manifest
+    """
+    cache_file = project_path.parent / MANIFEST_CACHE_FILE
+    try:
+        cache = json.loads(cache_file.read_text())
+    except (FileNotFoundError, json.JSONDecodeError):
+        cache = {}
+    manifest = build_manifest(project_path, cache)
+    cache_file.write_text(json.dumps(manifest))
+    return compare_with_golden(project_path.parent.name, manifest, golden, update)
+
+
+def compare_with_golden(
+    config_name: str, manifest: dict[str, dict[str, Any]], golden: Path, update: bool = False
+) -> ManifestDiff:
+    """Compare a manifest with a golden manifest file, or record it as golden.
+
+    Parameters
+    ----------
+    config_name : str
+        Name of the configuration, used in the error message
+    manifest : dict[str, dict[str, Any]]
+        Manifest of the generated project (relative path to ``size`` and ``sha256``)
+    golden : Path
+        Golden manifest file for this configuration
+    update : bool, optional
+        Write the manifest as the new golden manifest
+
+    Returns
+    -------
+    ManifestDiff
+        Differences found (empty when updating or skipped)
+
+    Raises
+    ------
+    GoldenMismatchError
+        If the manifest does not match the golden manifest
+    """
+    if update:
+        golden.parent.mkdir(parents=True, exist_ok=True)
+        entries = {
+            relative: {"size": entry["size"], "sha256": entry["sha256"]}
+            for relative, entry in manifest.items()
+        }
+        golden.write_text(json.dumps(entries, indent=2) + "\n")
+        logger.success(f"Updated golden manifest {golden.name} ({len(entries)} files)")
+        return ManifestDiff()
+
+    if not golden.exists():
+        logger.debug(f"No golden manifest at {golden}, skipping comparison")
+        return ManifestDiff()
+
+    diff = compare_manifests(json.loads(golden.read_text()), manifest)
+    if diff:
+        for label, paths in (("Added", diff.added), ("Removed", diff.removed)):
+            for relative in paths:
+                logger.error(f"{label}: {relative}")
+        for relative in diff.changed:
+            logger.error(f"Changed: {relative}")
+        raise GoldenMismatchError(config_name, diff)
+
+    logger.success(f"Matches golden manifest ({len(manifest)} files)")
+    return diff
+
+
+@contextmanager
+def time_post_gen_hook(timer: PhaseTimer) -> Iterator[None]:
+    """Time the post-generation hook of in-process renders as its own phase.
+
+    Cookiecutter runs hooks from ``generate_files``; for the duration of the
+    block its hook runner is wrapped so the post_gen_project hook is recorded
+    as the ``post_gen_hook`` phase, nested inside ``render``.
+    """
+    original = cookiecutter.generate.run_hook_from_repo_dir
+
+    def run_hook_from_repo_dir(repo_dir, hook_name, *args, **kwargs):
+        if hook_name != "post_gen_project":
+            return original(repo_dir, hook_name, *args, **kwargs)
+        with timer.phase("post_gen_hook"):
+            return original(repo_dir, hook_name, *args, **kwargs)
+
+    cookiecutter.generate.run_hook_from_repo_dir = run_hook_from_repo_dir
+    try:
+        yield
+    finally:
+        cookiecutter.generate.run_hook_from_repo_dir = original
+
+
+def percentile(values: list[int], pct: float) -> int:
+    """Return the nearest-rank percentile of a non-empty list of values."""
+    ordered = sorted(values)
+    rank = max(math.ceil(pct / 100 * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+def summarize_timings(timings: list[PhaseTiming]) -> dict[str, dict[str, float]]:
+    """Summarise phase timings across configurations.
+
+    Uses each phase's self time, so ``render`` excludes the post-generation
+    hook nested inside it.
+
+    Parameters
+    ----------
+    timings : list[PhaseTiming]
+        Timings from any number of configurations
+
+    Returns
+    -------
+    dict[str, dict[str, float]]
+        Phase (in PHASES order) to its ``count``, and ``p50``, ``p95`` and
+        ``total`` in milliseconds
+    """
+    by_phase: dict[str, list[int]] = {}
+    for timing in timings:
+        by_phase.setdefault(timing.phase, []).append(timing.self_us)
+
+    summary = {}
+    for phase in sorted(by_phase, key=lambda p: PHASES.index(p) if p in PHASES else len(PHASES)):
+        values = by_phase[phase]
+        summary[phase] = {
+            "count": len(values),
+            "p50": percentile(values, 50) / 1000,
+            "p95": percentile(values, 95) / 1000,
+            "total": sum(values) / 1000,
+        }
+    return summary
+
+
+def write_timings(timings: list[PhaseTiming], path: Path) -> None:
+    """Write phase timings as JSON lines, one object per phase.
+
+    Parameters
+    ----------
+    timings : list[PhaseTiming]
+        Timings to write
+    path : Path
+        Output file (overwritten)
+    """
+    with open(path, "w") as f:
+        for timing in timings:
+            f.write(json.dumps(asdict(timing)) + "\n")
+
+
+def write_chrome_trace(timings: list[PhaseTiming], path: Path) -> None:
+    """Write phase timings as a Chrome trace-event file.
+
+    The file can be opened in chrome://tracing or https://ui.perfetto.dev.
+    Each worker process appears as its own track.
+
+    Parameters
+    ----------
+    timings : list[PhaseTiming]
+        Timings to write
+    path : Path
+        Output file (overwritten)
+    """
+    events = [
+        {
+            "name": timing.phase,
+            "cat": "generate",
+            "ph": "X",
+            "ts": timing.start_us,
+            "dur": timing.duration_us,
+            "pid": timing.pid,
+            "tid": timing.pid,
+            "args": {"config": timing.config_name},
+        }
+        for timing in timings
+    ]
+    path.write_text(json.dumps({"traceEvents": events, "displayTimeUnit": "ms"}))
+
+
+def run_cookiecutter(
+    cmd: list[str],
+    config_output: Path,
+    extra_context: dict[str, Any],
+    engine: RenderEngine,
+) -> str:
+    """Render one configuration with the chosen engine.
+
+    The in-process engine calls cookiecutter as a library, reusing the imports
+    and warm Jinja environment of this process. Any error it raises is mapped to
+    ``subprocess.CalledProcessError`` so callers handle both engines the same way.
+
+    Parameters
+    ----------
+    cmd : list[str]
+        Equivalent cookiecutter command line (run by the subprocess engine)
+    config_output : Path
+        Directory to output the project to
+    extra_context : dict[str, Any]
+        Cookiecutter values overriding the cookiecutter.json defaults
+    engine : RenderEngine
+        Engine used to render the project
+
+    Returns
+    -------
+    str
+        Captured cookiecutter standard output (empty for the in-process engine)
+
+    Raises
+    ------
+    subprocess.CalledProcessError
+        If cookiecutter fails to render the project
+    """
+    template_dir = Path(__file__).parent.parent
+
+    if engine == RenderEngine.SUBPROCESS:
+        result = subprocess.run(
+            cmd,
+            cwd=template_dir,
+            check=True,
+            capture_output=True,
+            text=True,
+        )
+        return result.stdout
+
+    try:
+        render_project(template_dir, config_output, extra_context)
+    except Exception as e:
+        raise subprocess.CalledProcessError(1, cmd, stderr=f"{type(e).__name__}: {e}") from e
+    return ""
+
+
+# Post-generation hook results shared by every in-memory render in this process
+_POST_GEN_CACHE: dict[tuple, str | None] = {}
+
+
+def render_in_memory(
+    config_values: dict[str, Any], timer: PhaseTimer
+) -> tuple[str, dict[str, RenderedFile]]:
+    """Render a configuration into memory, applying the post-generation hook.
+
+    Parameters
+    ----------
+    config_values : dict[str, Any]
+        Dictionary of cookiecutter values
+    timer : PhaseTimer
+        Records the hook as the ``post_gen_hook`` phase
+
+    Returns
+    -------
+    tuple[str, dict[str, RenderedFile]]
+        Project directory name and the project's files by final relative path
+    """
+    template_dir = Path(__file__).parent.parent
+    extra_context = {k: v for k, v in config_values.items() if k != "config_description"}
+    context = load_context(template_dir, extra_context)
+    rendered = render_project_files(template_dir, context)
+
+    with timer.phase("post_gen_hook"):
+        final_paths = post_gen_paths(list(rendered), context, _POST_GEN_CACHE, template_dir)
+    files = {
+        final_paths[output_path]: rendered_file
+        for output_path, rendered_file in rendered.items()
+        if final_paths[output_path] is not None
+    }
+    return context["cookiecutter"]["repo_name"], dict(sorted(files.items()))
+
+
+def materialize_files(
+    files: dict[str, RenderedFile], project_path: Path, store: ContentStore | None = None
+) -> None:
+    """Write an in-memory project to disk.
+
+    Parameters
+    ----------
+    files : dict[str, RenderedFile]
+        Project files by relative path, from render_in_memory()
+    project_path : Path
+        Directory to write the project into
+    store : ContentStore | None, optional
+        Hardlink files already in this store instead of writing new copies.
+        Otherwise binary and copy-only files are copied from the template
+        with the fastest mechanism the filesystem supports.
+    """
+    for relative, rendered_file in files.items():
+        target = project_path / relative
+        target.parent.mkdir(parents=True, exist_ok=True)
+        if store is not None:
+            store.write(
+                target, rendered_file.content, stat.S_IMODE(rendered_file.source.stat().st_mode)
+            )
+        else:
+            if rendered_file.verbatim:
+                copy_file(rendered_file.source, target)
+            else:
+                target.write_bytes(rendered_file.content)
+            shutil.copymode(rendered_file.source, target)
+
+
+def generate_project_in_memory(
+    config_name: str,
+    config_values: dict[str, Any],
+    output_dir: Path,
+    exists_strategy: ExistsStrategy,
+    golden: Path | None,
+    update_golden: bool,
+    materialize: bool,
+    timer: PhaseTimer,
+    dedup: bool = False,
+    archive: ArchiveFormat | None = None,
+) -> Path:
+    """Render and validate a configuration without writing it to disk.
+
+    The project is only written to ``output_dir`` if validation fails (so it
+    can be inspected) or ``materialize`` is set.
+
+    Parameters
+    ----------
+    config_name : str
+        Name of the configuration
+    config_values : dict[str, Any]
+        Dictionary of cookiecutter values
+    output_dir : Path
+        Directory failed or materialized projects are written to
+    exists_strategy : ExistsStrategy
+        Strategy for handling an existing project when materializing
+    golden : Path | None
+        Golden manifest file to compare the project against
+    update_golden : bool
+        Record the project as the golden manifest instead of comparing
+    materialize : bool
+        Write the project to disk even if it passes validation
+    timer : PhaseTimer
+        Records the duration of each phase
+    dedup : bool, optional
+        Hardlink materialized files that are identical to already stored ones
+    archive : ArchiveFormat | None, optional
+        Write the validated project straight into an archive in the
+        configuration's output directory instead of a project directory
+
+    Returns
+    -------
+    Path
+        Where the project (or its archive) is, or would be, written
+
+    Raises
+    ------
+    FileNotFoundError
+        If the rendered project is missing critical files
+    GoldenMismatchError
+        If the rendered project does not match its golden manifest
+    """
+    logger.info(f"Rendering {config_name} in memory")
+    with timer.phase("render"):
+        repo_name, files = render_in_memory(config_values, timer)
+    logger.debug(f"Rendered {len(files)} file(s) in memory")
+    project_path = output_dir / config_name / repo_name
+
+    try:
+        with timer.phase("validate_generated_project"):
+            validate_rendered_files(
+                config_name,
+                {k: f.content for k, f in files.items()},
+                config_values,
+                golden,
+                update_golden,
+            )
+    except (FileNotFoundError, GoldenMismatchError) as e:
+        logger.error(f"Validation failed for {config_name}: {e}")
+        cleanup_project(project_path)
+        materialize_files(files, project_path)
+        logger.info(f"Wrote failed project for inspection: {project_path}")
+        raise
+
+    render_key = compute_render_key(config_values)
+    if archive is not None:
+        archive_path = project_path.with_name(f"{repo_name}.{archive.value}")
+        with timer.phase("handle_existing_project"):
+            proceed = handle_existing_project(archive_path, exists_strategy, render_key)
+        if proceed:
+            archive_path.parent.mkdir(parents=True, exist_ok=True)
+            with timer.phase("archive"), open(archive_path, "wb") as f:
+                write_archive(files, repo_name, f, archive)
+            (project_path.parent / RENDER_KEY_FILE).write_text(render_key)
+            logger.debug(f"Archived {config_name} -> {archive_path}")
+        logger.success(f"Successfully rendered and validated {config_name} in memory")
+        return archive_path
+
+    if materialize:
+        with timer.phase("handle_existing_project"):
+            proceed = handle_existing_project(project_path, exists_strategy, render_key)
+        if proceed:
+            store = ContentStore(output_dir / STORE_DIR) if dedup else None
+            with timer.phase("dedup" if dedup else "render"):
+                materialize_files(files, project_path, store)
+            (project_path.parent / RENDER_KEY_FILE).write_text(render_key)
+            logger.debug(f"Materialized {config_name} -> {project_path}")
+
+    logger.success(f"Successfully rendered and validated {config_name} in memory")
+    return project_path
+
+
+def generate_project(
+    config_name: str,
+    config_values: dict[str, Any],
+    output_dir: Path,
+    exists_strategy: ExistsStrategy = ExistsStrategy.CLEAN,
+    engine: RenderEngine = RenderEngine.IN_PROCESS,
+    golden_dir: Path | None = None,
+    update_golden: bool = False,
+    timer: PhaseTimer | None = None,
+    materialize: bool = False,
+    dedup: bool = False,
+    archive: ArchiveFormat | None = None,
+) -> Path | None:
+    """Generate a single cookiecutter project with the given configuration.
+
+    Generation process:
+    1. Validate configuration against cookiecutter.json options
+    2. Create output directory for this configuration
+    3. Determine expected project path from repo_name
+    4. Handle existing project based on exists_strategy (REUSE returns early
+       if the stored render key matches, after checking the golden manifest)
+    5. Build and execute cookiecutter command with the chosen engine
+    6. Validate generated project structure against the golden manifest and
+       record its render key
+
+    Parameters
+    ----------
+    config_name : str
+        Name of the configuration (used for subfolder name)
+    config_values : dict[str, Any]
+        Dictionary of cookiecutter values
+    output_dir : Path
+        Directory to output the project to
+    exists_strategy : ExistsStrategy, optional
+        Strategy for handling existing project directories
+    engine : RenderEngine, optional
+        Whether to render in this process or by shelling out to the cookiecutter CLI
+    golden_dir : Path | None, optional
+        Directory of golden manifests to validate against (no comparison if None)
+    update_golden : bool, optional
+        Record the generated project as its golden manifest instead of comparing
+    timer : PhaseTimer | None, optional
+        Records the duration of each phase (see PHASES)
+    materialize : bool, optional
+        With the in-memory engine, write the project to disk even if it passes
+    dedup : bool, optional
+        Hardlink generated files identical to ones in the output directory's
+        content store instead of keeping separate copies
+    archive : ArchiveFormat | None, optional
+        With the in-memory engine, write the project straight into an archive
+
+    Returns
+    -------
+    Path | None
+        Path to the generated (or reused) project directory, or None if skipped
+
+    Raises
+    ------
+    subprocess.CalledProcessError
+        If cookiecutter command fails
+    ValueError
+        If configuration validation fails
+    FileExistsError
+        If exists_strategy is FAIL and directory exists
+    FileNotFoundError
+        If generated project is missing expected files
+    GoldenMismatchError
+        If generated project does not match its golden manifest
+    """
+    logger.info(f"Starting generation for config: {config_name}")
+    if timer is None:
+        timer = PhaseTimer(config_name)
+
+    with timer.phase("validate_config"):
+        validate_config(config_name, config_values)
+
+    golden = golden_dir / f"{config_name}.json" if golden_dir else None
+    if engine == RenderEngine.IN_MEMORY:
+        return generate_project_in_memory(
+            config_name,
+            config_values,
+            output_dir,
+            exists_strategy,
+            golden,
+            update_golden,
+            materialize,
+            timer,
+            dedup,
+            archive,
+        )
+
+    logger.debug("Creating output directory for configuration")
+    config_output = output_dir / config_name
+    config_output.mkdir(parents=True, exist_ok=True)
+    logger.debug(f"Created output directory: {config_output}")
+
+    logger.debug("Determining project path from repo_name")
+    project_name = config_values.get("project_name", "project_name")
+    repo_name = project_name.lower().replace(" ", "_")
+    project_path = config_output / repo_name
+    logger.debug(f"Expected project path: {project_path}")
+
+    render_key = compute_render_key(config_values)
+    key_file = config_output / RENDER_KEY_FILE
+    logger.debug(f"Render key: {render_key}")
+
+    with timer.phase("handle_existing_project"):
+        proceed = handle_existing_project(project_path, exists_strategy, render_key)
+    if not proceed:
+        if exists_strategy == ExistsStrategy.REUSE:
+            if golden is not None:
+                with timer.phase("validate_generated_project"):
+                    check_golden_manifest(project_path, golden, update_golden)
+            logger.success(f"Reused {config_name} -> {project_path} (render key unchanged)")
+            return project_path
+        logger.info(f"Skipped generation for {config_name} (already exists)")
+        return None
+
+    # Drop the key before rendering so a failed render is never reused
+    key_file.unlink(missing_ok=True)
+
+    logger.debug("Building cookiecutter command")
+    cmd = [
+        "cookiecutter",
+        ".",
+        "--no-input",
+        "--output-dir",
+        str(config_output),
+    ]
+
+    logger.debug("Adding configuration values to cookiecutter command")
+    extra_context = {
+        key: value for key, value in config_values.items() if key != "config_description"
+    }
+    for key, value in extra_context.items():
+        cmd.append(f"{key}={value}")
+
+    logger.info(f"Executing cookiecutter for {config_name} ({engine.value})")
+    logger.debug(f"Command: {' '.join(cmd)}")
+
+    try:
+        with timer.phase("render"), time_post_gen_hook(timer):
+            stdout = run_cookiecutter(cmd, config_output, extra_context, engine)
+        logger.success(f"Cookiecutter generation completed for {config_name}")
+        if stdout:
+            logger.debug(f"Cookiecutter stdout: {stdout}")
+
+        logger.info(f"Validating project structure for {config_name}")
+        with timer.phase("validate_generated_project"):
+            validate_generated_project(project_path, config_values, golden, update_golden)
+        if dedup:
+            with timer.phase("dedup"):
+                dedupe_project(project_path, ContentStore(output_dir / STORE_DIR))
+        key_file.write_text(render_key)
+
+        logger.success(f"Successfully generated and validated {config_name} -> {project_path}")
+        return project_path
+
+    except subprocess.CalledProcessError as e:
+        logger.error(f"Cookiecutter failed for {config_name}: {e}")
+        logger.error(f"Command: {' '.join(cmd)}")
+        logger.error(f"Error output: {e.stderr}")
+        raise
+    except (FileNotFoundError, GoldenMismatchError) as e:
+        logger.error(f"Validation failed for {config_name}: {e}")
+        raise
+
+
+def generate_config_worker(
+    config_name: str,
+    config_values: dict[str, Any],
+    output_dir: Path,
+    exists_strategy: ExistsStrategy,
+    verbose: bool = False,
+    engine: RenderEngine = RenderEngine.IN_PROCESS,
+    golden_dir: Path | None = None,
+    update_golden: bool = False,
+    materialize: bool = False,
+    dedup: bool = False,
+    archive: ArchiveFormat | None = None,
+) -> ConfigResult:
+    """Generate one configuration inside a worker process, capturing its logs.
+
+    Log records are buffered rather than written to stderr so that output from
+    concurrently running configurations does not interleave. The parent process
+    replays the buffer once the configuration has finished.
+
+    Parameters
+    ----------
+    config_name : str
+        Name of the configuration
+    config_values : dict[str, Any]
+        Dictionary of cookiecutter values
+    output_dir : Path
+        Directory to output the project to
+    exists_strategy : ExistsStrategy
+        Strategy for handling existing project directories
+    verbose : bool, optional
+        Capture debug-level messages as well as info and above
+    engine : RenderEngine, optional
+        Engine used to render the project
+    golden_dir : Path | None, optional
+        Directory of golden manifests to validate against
+    update_golden : bool, optional
+        Record golden manifests instead of comparing
+    materialize : bool, optional
+        Write in-memory projects to disk even if they pass validation
+    dedup : bool, optional
+        Hardlink identical generated files into a shared content store
+    archive : ArchiveFormat | None, optional
+        Write in-memory projects straight into archives of this format
+
+    Returns
+    -------
+    ConfigResult
+        Generated project path or error message, plus the captured log lines
+        and phase timings
+    """
+    result = ConfigResult(config_name=config_name)
+    timer = PhaseTimer(config_name)
+    logger.remove()
+    logger.add(
+        lambda message: result.logs.append(str(message)), level="DEBUG" if verbose else "INFO"
+    )
+
+    try:
+        result.project_path = generate_project(
+            config_name,
+            config_values,
+            output_dir,
+            exists_strategy,
+            engine,
+            golden_dir,
+            update_golden,
+            timer,
+            materialize,
+            dedup,
+            archive,
+        )
+    except Exception as e:
+        result.error = str(e)
+
+    result.timings = timer.timings
+    return result
+
+
+def generate_all(
+    test_configs: dict[str, dict[str, Any]],
+    output_dir: Path,
+    exists_strategy: ExistsStrategy,
+    jobs: int = 1,
+    verbose: bool = False,
+    engine: RenderEngine = RenderEngine.IN_PROCESS,
+    golden_dir: Path | None = None,
+    update_golden: bool = False,
+    timings: list[PhaseTiming] | None = None,
+    materialize: bool = False,
+    dedup: bool = False,
+    archive: ArchiveFormat | None = None,
+) -> tuple[list[Path], list[str]]:
+    """Generate every configuration, serially or across a process pool.
+
+    With ``jobs=1`` each configuration is generated in this process in order,
+    logging as it goes. With ``jobs>1`` configurations are dispatched to a
+    ``ProcessPoolExecutor``; each renders into its own ``output_dir/<config>``
+    directory and its logs are printed as one block when it finishes. Either
+    way the returned lists are in configuration order, so the summary is the
+    same regardless of completion order.
+
+    Parameters
+    ----------
+    test_configs : dict[str, dict[str, Any]]
+        Dictionary of configuration name to configuration values
+    output_dir : Path
+        Directory to output the projects to
+    exists_strategy : ExistsStrategy
+        Strategy for handling existing project directories
+    jobs : int, optional
+        Number of worker processes to use
+    verbose : bool, optional
+        Capture debug-level messages from worker processes
+    engine : RenderEngine, optional
+        Engine used to render each project
+    golden_dir : Path | None, optional
+        Directory of golden manifests to validate against
+    update_golden : bool, optional
+        Record golden manifests instead of comparing
+    timings : list[PhaseTiming] | None, optional
+        If given, extended with the phase timings of every configuration, in
+        configuration order
+    materialize : bool, optional
+        Write in-memory projects to disk even if they pass validation
+    dedup : bool, optional
+        Hardlink identical generated files into a shared content store
+    archive : ArchiveFormat | None, optional
+        Write in-memory projects straight into archives of this format
+
+    Returns
+    -------
+    tuple[list[Path], list[str]]
+        Generated project paths and names of configurations that failed
+    """
+    total = len(test_configs)
+    positions = {name: idx for idx, name in enumerate(test_configs, 1)}
+    results: dict[str, ConfigResult] = {}
+
+    if jobs <= 1:
+        for config_name, config_values in test_configs.items():
+            idx = positions[config_name]
+            logger.info(f"Processing config {idx}/{total}: {config_name}")
+            result = ConfigResult(config_name=config_name)
+            timer = PhaseTimer(config_name)
+            try:
+                result.project_path = generate_project(
+                    config_name,
+                    config_values,
+                    output_dir,
+                    exists_strategy,
+                    engine,
+                    golden_dir,
+                    update_golden,
+                    timer,
+                    materialize,
+                    dedup,
+                    archive,
+                )
+                if result.project_path:
+                    logger.info(f"Config {idx}/{total} completed: {config_name}")
+            except Exception as e:
+                logger.error(f"Config {idx}/{total} failed: {config_name} - {e}")
+                result.error = str(e)
+            result.timings = timer.timings
+            results[config_name] = result
+    else:
+        logger.info(f"Generating with {jobs} worker processes")
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            futures = {
+                executor.submit(
+                    generate_config_worker,
+                    config_name,
+                    config_values,
+                    output_dir,
+                    exists_strategy,
+                    verbose,
+                    engine,
+                    golden_dir,
+                    update_golden,
+                    materialize,
+                    dedup,
+                    archive,
+                ): config_name
+                for config_name, config_values in test_configs.items()
+            }
+            for future in as_completed(futures):
+                config_name = futures[future]
+                idx = positions[config_name]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    result = ConfigResult(config_name=config_name, error=str(e))
+
+                sys.stderr.write("".join(result.logs))
+                if result.error is not None:
+                    logger.error(f"Config {idx}/{total} failed: {config_name} - {result.error}")
+                elif result.project_path:
+                    logger.info(f"Config {idx}/{total} completed: {config_name}")
+                results[config_name] = result
+
+    generated_projects = [
+        results[name].project_path for name in test_configs if results[name].project_path
+    ]
+    failed_configs = [name for name in test_configs if results[name].error is not None]
+    if timings is not None:
+        for name in test_configs:
+            timings.extend(results[name].timings)
+    return generated_projects, failed_configs
+
+
+def snapshot_template(template_dir: Path | None = None) -> dict[str, tuple[int, int]]:
+    """Record the modification time and size of every template file.
+
+    Parameters
+    ----------
+    template_dir : Path | None, optional
+        Repository root containing the template (defaults to this repository)
+
+    Returns
+    -------
+    dict[str, tuple[int, int]]
+        Path relative to template_dir to its (mtime_ns, size)
+    """
+    if template_dir is None:
+        template_dir = Path(__file__).parent.parent
+
+    snapshot = {}
+    for name in TEMPLATE_PATHS:
+        root = template_dir / name
+        paths = root.rglob("*") if root.is_dir() else [root]
+        for path in paths:
+            if "__pycache__" in path.parts or not path.is_file():
+                continue
+            stat = path.stat()
+            snapshot[path.relative_to(template_dir).as_posix()] = (stat.st_mtime_ns, stat.st_size)
+    return snapshot
+
+
+def diff_snapshots(
+    before: dict[str, tuple[int, int]], after: dict[str, tuple[int, int]]
+) -> tuple[list[str], list[str]]:
+    """Compare two template snapshots.
+
+    Parameters
+    ----------
+    before : dict[str, tuple[int, int]]
+        Earlier snapshot from snapshot_template()
+    after : dict[str, tuple[int, int]]
+        Later snapshot from snapshot_template()
+
+    Returns
+    -------
+    tuple[list[str], list[str]]
+        Sorted paths that were added or modified, and paths that were removed
+    """
+    changed = sorted(path for path, stat in after.items() if before.get(path) != stat)
+    removed = sorted(path for path in before if path not in after)
+    return changed, removed
+
+
+def post_gen_paths(
+    output_paths: list[str],
+    context: dict[str, Any],
+    cache: dict[tuple, str | None],
+    template_dir: Path | None = None,
+) -> dict[str, str | None]:
+    """Return where the post-generation hook leaves each rendered file.
+
+    Wraps nhse_rap_cookiecutter.rendering.post_gen_paths(), which runs the
+    hook against placeholders for the uncached paths. Results are cached per
+    path and hook variant, so the hook only runs for new combinations.
+
+    Parameters
+    ----------
+    output_paths : list[str]
+        Rendered paths relative to the project directory
+    context : dict[str, Any]
+        Rendered cookiecutter context of the project
+    cache : dict[tuple, str | None]
+        Results of earlier calls, updated in place
+    template_dir : Path | None, optional
+        Repository root containing the template (defaults to this repository)
+
+    Returns
+    -------
+    dict[str, str | None]
+        Rendered path to its final path, or None if the hook deletes the file
+    """
+    if template_dir is None:
+        template_dir = Path(__file__).parent.parent
 
-    actual_files = [
-        f.name for f in project_path.iterdir() if f.is_file() and not f.name.startswith(".")
-    ]
-    logger.debug(f"Generated files: {', '.join(sorted(actual_files))}")
+    hook = build_dependency_index(template_dir).get(HOOK_PATH)
+    if hook is None:
+        return {output_path: output_path for output_path in output_paths}
 
-    if missing_critical:
-        logger.error("Validation failed: critical files missing")
-        raise FileNotFoundError(f"Generated project missing critical files: {missing_critical}")
+    variant = file_variant(hook, context["cookiecutter"], {})
+    missing = [path for path in output_paths if (path, variant) not in cache]
+    if missing:
+        for output_path, final_path in hook_paths(template_dir, missing, context).items():
+            cache[(output_path, variant)] = final_path
+    return {output_path: cache[(output_path, variant)] for output_path in output_paths}
 
-    if missing_dirs:
-        logger.warning(f"Some expected directories missing: {missing_dirs}")
 
-    logger.success("Project structure validated: critical files present")
+def post_gen_path(
+    output_path: str,
+    context: dict[str, Any],
+    cache: dict[tuple, str | None],
+    template_dir: Path | None = None,
+) -> str | None:
+    """Return where the post-generation hook leaves one rendered file.
 
+    See post_gen_paths(), which this calls for a single path.
 
-def generate_project(
-    config_name: str,
-    config_values: dict[str, Any],
-    output_dir: Path,
-    exists_strategy: ExistsStrategy = ExistsStrategy.CLEAN,
-) -> Path | None:
-    """Generate a single cookiecutter project with the given configuration.
+    Returns
+    -------
+    str | None
+        Final path relative to the project directory, or None if the hook
+        deletes the file
+    """
+    return post_gen_paths([output_path], context, cache, template_dir)[output_path]
 
-    Generation process:
-    1. Validate configuration against cookiecutter.json options
-    2. Create output directory for this configuration
-    3. Determine expected project path from repo_name
-    4. Handle existing project based on exists_strategy
-    5. Build and execute cookiecutter command
-    6. Validate generated project structure
+
+def rerender_template_file(
+    relative: str,
+    projects: list[WatchedProject],
+    hook_cache: dict[tuple, str | None],
+    template_dir: Path | None = None,
+) -> list[WatchedProject]:
+    """Re-render one edited template file into every watched project.
+
+    Projects that agree on every variable the file depends on (per the
+    dependency index, which must be current) render it identically, so the
+    file is rendered in memory once per such variant and the result shared by
+    its projects. It is only written, and a project only reported as
+    affected, if that project's output actually changed.
 
     Parameters
     ----------
-    config_name : str
-        Name of the configuration (used for subfolder name)
-    config_values : dict[str, Any]
-        Dictionary of cookiecutter values
-    output_dir : Path
-        Directory to output the project to
-    exists_strategy : ExistsStrategy, optional
-        Strategy for handling existing project directories
+    relative : str
+        Path of the file relative to the project template directory
+    projects : list[WatchedProject]
+        Projects to update
+    hook_cache : dict[tuple, str | None]
+        Cache for post_gen_path()
+    template_dir : Path | None, optional
+        Repository root containing the template (defaults to this repository)
 
     Returns
     -------
-    Path | None
-        Path to the generated project directory, or None if skipped
-
-    Raises
-    ------
-    subprocess.CalledProcessError
-        If cookiecutter command fails
-    ValueError
-        If configuration validation fails
-    FileExistsError
-        If exists_strategy is FAIL and directory exists
-    FileNotFoundError
-        If generated project is missing expected files
+    list[WatchedProject]
+        Projects whose output for this file changed
     """
-    logger.info(f"Starting generation for config: {config_name}")
+    if template_dir is None:
+        template_dir = Path(__file__).parent.parent
+
+    dependencies = build_dependency_index(template_dir).get(relative)
+    variants: dict[tuple, list[WatchedProject]] = {}
+    for project in projects:
+        if dependencies is None:
+            # Not indexed: render it for every project
+            variant: tuple = (("config", project.config_name),)
+        else:
+            used = FileDependencies(branches=dependencies.branches | dependencies.substitutions)
+            variant = file_variant(used, project.context["cookiecutter"], {})
+        variants.setdefault(variant, []).append(project)
+    logger.debug(f"Rendering {relative} for {len(variants)} variant(s)")
+
+    affected = []
+    for members in variants.values():
+        rendered = render_file(template_dir, relative, members[0].context)
+        if rendered is None:
+            continue
+        for project in members:
+            final_path = post_gen_path(rendered.path, project.context, hook_cache, template_dir)
+            if final_path is None:
+                continue
+
+            target = project.project_path / final_path
+            if target.is_file() and target.read_bytes() == rendered.content:
+                continue
+            logger.debug(f"Updating {project.config_name}: {final_path}")
+            target.parent.mkdir(parents=True, exist_ok=True)
+            # Replace rather than overwrite, so files hardlinked by --dedup stay intact
+            target.unlink(missing_ok=True)
+            target.write_bytes(rendered.content)
+            shutil.copymode(rendered.source, target)
+            affected.append(project)
+    return affected
+
+
+def remove_template_file(
+    relative: str,
+    projects: list[WatchedProject],
+    hook_cache: dict[tuple, str | None],
+    template_dir: Path | None = None,
+) -> list[WatchedProject]:
+    """Remove the output of a deleted template file from every watched project.
 
-    validate_config(config_name, config_values)
+    Parameters
+    ----------
+    relative : str
+        Path of the deleted file relative to the project template directory
+    projects : list[WatchedProject]
+        Projects to update
+    hook_cache : dict[tuple, str | None]
+        Cache for post_gen_path()
+    template_dir : Path | None, optional
+        Repository root containing the template (defaults to this repository)
 
-    logger.debug("Creating output directory for configuration")
-    config_output = output_dir / config_name
-    config_output.mkdir(parents=True, exist_ok=True)
-    logger.debug(f"Created output directory: {config_output}")
+    Returns
+    -------
+    list[WatchedProject]
+        Projects that contained the file's output
+    """
+    if template_dir is None:
+        template_dir = Path(__file__).parent.parent
 
-    logger.debug("Determining project path from repo_name")
-    project_name = config_values.get("project_name", "project_name")
-    repo_name = project_name.lower().replace(" ", "_")
-    project_path = config_output / repo_name
-    logger.debug(f"Expected project path: {project_path}")
+    affected = []
+    for project in projects:
+        output_path = render_path(template_dir, relative, project.context)
+        if output_path is None:
+            continue
+        final_path = post_gen_path(output_path, project.context, hook_cache, template_dir)
+        target = project.project_path / final_path if final_path else None
+        if target is not None and target.is_file():
+            logger.debug(f"Removing {project.config_name}: {final_path}")
+            target.unlink()
+            affected.append(project)
+    return affected
 
-    if not handle_existing_project(project_path, exists_strategy):
-        logger.info(f"Skipped generation for {config_name} (already exists)")
-        return None
 
-    logger.debug("Building cookiecutter command")
-    cmd = [
-        "cookiecutter",
-        ".",
-        "--no-input",
-        "--output-dir",
-        str(config_output),
-    ]
+def load_watched_projects(
+    test_configs: dict[str, dict[str, Any]], output_dir: Path
+) -> list[WatchedProject]:
+    """Build the watch state for every configuration with a generated project.
 
-    logger.debug("Adding configuration values to cookiecutter command")
-    for key, value in config_values.items():
-        if key != "config_description":
-            cmd.append(f"{key}={value}")
+    Parameters
+    ----------
+    test_configs : dict[str, dict[str, Any]]
+        Dictionary of configuration name to configuration values
+    output_dir : Path
+        Directory containing the generated projects
 
-    logger.info(f"Executing cookiecutter for {config_name}")
-    logger.debug(f"Command: {' '.join(cmd)}")
+    Returns
+    -------
+    list[WatchedProject]
+        Projects that exist on disk, with their rendered contexts
+    """
+    template_dir = Path(__file__).parent.parent
+    projects = []
+    for config_name, config_values in test_configs.items():
+        extra_context = {k: v for k, v in config_values.items() if k != "config_description"}
+        context = load_context(template_dir, extra_context)
+        project_path = output_dir / config_name / context["cookiecutter"]["repo_name"]
+        if project_path.is_dir():
+            projects.append(WatchedProject(config_name, config_values, project_path, context))
+    return projects
+
+
+def apply_template_changes(
+    changed: list[str],
+    removed: list[str],
+    projects: list[WatchedProject],
+    hook_cache: dict[tuple, str | None],
+    golden_dir: Path | None = None,
+) -> list[WatchedProject] | None:
+    """Bring watched projects up to date with edited template files.
+
+    Files under the project template are re-rendered individually and every
+    affected project is re-validated, with its render key refreshed so a later
+    ``generate --exists reuse`` keeps it. Edits to the hook or cookiecutter.json
+    can change any file, so they are not handled here.
 
-    try:
-        result = subprocess.run(
-            cmd,
-            cwd=Path(__file__).parent.parent,
-            check=True,
-            capture_output=True,
-            text=True,
-        )
-        logger.success(f"Cookiecutter generation completed for {config_name}")
-        if result.stdout:
-            logger.debug(f"Cookiecutter stdout: {result.stdout}")
+    Parameters
+    ----------
+    changed : list[str]
+        Added or modified paths relative to the repository root
+    removed : list[str]
+        Removed paths relative to the repository root
+    projects : list[WatchedProject]
+        Projects to update
+    hook_cache : dict[tuple, str | None]
+        Cache for post_gen_path()
+    golden_dir : Path | None, optional
+        Directory of golden manifests to validate against
 
-        logger.info(f"Validating project structure for {config_name}")
-        validate_generated_project(project_path, config_values)
+    Returns
+    -------
+    list[WatchedProject] | None
+        Projects that were updated, or None if a full regeneration is needed
+    """
+    prefix = f"{TEMPLATE_PATHS[0]}/"
+    if any(not path.startswith(prefix) for path in changed + removed):
+        return None
 
-        logger.success(f"Successfully generated and validated {config_name} -> {project_path}")
-        return project_path
+    hash_template_tree.cache_clear()
+    build_dependency_index.cache_clear()
 
-    except subprocess.CalledProcessError as e:
-        logger.error(f"Cookiecutter failed for {config_name}: {e}")
-        logger.error(f"Command: {' '.join(cmd)}")
-        logger.error(f"Error output: {e.stderr}")
-        raise
-    except FileNotFoundError as e:
-        logger.error(f"Validation failed for {config_name}: {e}")
-        raise
+    affected: dict[str, WatchedProject] = {}
+    for path in removed:
+        for project in remove_template_file(path.removeprefix(prefix), projects, hook_cache):
+            affected[project.config_name] = project
+    for path in changed:
+        for project in rerender_template_file(path.removeprefix(prefix), projects, hook_cache):
+            affected[project.config_name] = project
+
+    for project in affected.values():
+        golden = golden_dir / f"{project.config_name}.json" if golden_dir else None
+        try:
+            validate_generated_project(project.project_path, project.config_values, golden)
+        except (FileNotFoundError, GoldenMismatchError) as e:
+            logger.error(f"Validation failed for {project.config_name}: {e}")
+            continue
+        key_file = project.project_path.parent / RENDER_KEY_FILE
+        key_file.write_text(compute_render_key(project.config_values))
+    return list(affected.values())
 
 
 @app.command()
@@ -401,6 +2649,81 @@ def generate(  # noqa: B008
         "--auto-cleanup",
         help="Automatically cleanup generated projects after successful generation",
     ),
+    jobs: int = typer.Option(
+        1,
+        "--jobs",
+        "-j",
+        min=1,
+        help="Number of configurations to generate in parallel worker processes",
+    ),
+    engine: RenderEngine = typer.Option(
+        RenderEngine.IN_PROCESS,
+        "--engine",
+        help="Render in this process, in memory, or by shelling out to the cookiecutter CLI",
+    ),
+    in_memory: bool = typer.Option(
+        False,
+        "--in-memory",
+        help="Render and validate in memory, writing only failed projects (--engine in-memory)",
+    ),
+    materialize: bool = typer.Option(
+        False,
+        "--materialize",
+        help="With --in-memory, also write projects that pass validation",
+    ),
+    matrix: MatrixMode = typer.Option(
+        MatrixMode.CONFIGS,
+        "--matrix",
+        "-m",
+        help="Use configs.yaml or build a full, pairwise or n-wise matrix from cookiecutter.json",
+    ),
+    strength: int = typer.Option(
+        3,
+        "--strength",
+        min=2,
+        help="Interaction strength for --matrix n-wise",
+    ),
+    prune: bool = typer.Option(
+        False,
+        "--prune",
+        help="Skip configurations that render no file variant not already covered",
+    ),
+    golden: bool = typer.Option(
+        True,
+        "--golden/--no-golden",
+        help="Compare each project with its golden manifest in scripts/golden/",
+    ),
+    update_golden: bool = typer.Option(
+        False,
+        "--update-golden",
+        help="Record each generated project as its new golden manifest",
+    ),
+    timings_file: Path | None = typer.Option(
+        None,
+        "--timings",
+        help="Write phase timings as JSON lines to this file "
+        "(default: timings.jsonl in the output directory, unless only rendering in memory)",
+    ),
+    trace: Path | None = typer.Option(
+        None,
+        "--trace",
+        help="Also write phase timings as a Chrome trace-event file",
+    ),
+    dedup: bool = typer.Option(
+        False,
+        "--dedup",
+        help="Hardlink files identical across projects instead of keeping copies",
+    ),
+    archive: ArchiveFormat | None = typer.Option(
+        None,
+        "--archive",
+        help="Render in memory and write each project straight into an archive",
+    ),
+    in_process_hook: bool = typer.Option(
+        False,
+        "--in-process-hook",
+        help="Run the post-generation hook in the rendering process instead of a subprocess",
+    ),
     verbose: bool = typer.Option(
         False,
         "--verbose",
@@ -416,12 +2739,17 @@ def generate(  # noqa: B008
     Execution flow:
     1. Configure logger level based on verbose flag
     2. Set default output directory (tmp/) if not specified
-    3. Load test configurations from YAML file
-    4. Filter to specific config if requested
-    5. Generate each project with validation
-    6. Print summary of successes and failures
-    7. Auto-cleanup if requested
-    8. Exit with error code if any failures occurred
+    3. Load test configurations from YAML file, or build them from
+       cookiecutter.json if a matrix mode is chosen
+    4. Filter to specific config if requested, and prune redundant configs
+       using the template dependency index if requested
+    5. Generate each project with validation (in parallel if jobs > 1),
+       comparing it with its golden manifest
+    6. Write phase timings to timings.jsonl unless projects are only
+       rendered in memory (and a trace file if requested)
+    7. Print summary of successes, failures and p50/p95 time per phase
+    8. Auto-cleanup if requested
+    9. Exit with error code if any failures occurred
 
     Parameters
     ----------
@@ -433,6 +2761,35 @@ def generate(  # noqa: B008
         How to handle existing project directories
     auto_cleanup : bool
         Whether to automatically cleanup after successful generation
+    jobs : int
+        Number of worker processes to generate configurations with
+    engine : RenderEngine
+        How cookiecutter is invoked for each configuration
+    in_memory : bool
+        Shorthand for the in-memory engine
+    materialize : bool
+        Whether to write in-memory projects that pass validation to disk
+    matrix : MatrixMode
+        Source of the configurations to generate
+    strength : int
+        Interaction strength when matrix is n-wise
+    prune : bool
+        Whether to skip configurations whose file variants are already covered
+    golden : bool
+        Whether to compare projects with their golden manifests
+    update_golden : bool
+        Whether to record generated projects as golden manifests
+    timings_file : Path | None
+        JSON-lines file to write phase timings to; by default timings.jsonl in
+        the output directory, or none if projects are only rendered in memory
+    trace : Path | None
+        Chrome trace-event file to write phase timings to
+    dedup : bool
+        Whether to hardlink identical files into a shared content store
+    archive : ArchiveFormat | None
+        Archive format to write each project into instead of a directory
+    in_process_hook : bool
+        Whether to run the post-generation hook without a subprocess
     verbose : bool
         Enable verbose debug logging
     """
@@ -440,41 +2797,79 @@ def generate(  # noqa: B008
         logger.remove()
         logger.add(sys.stderr, level="INFO")
 
+    if in_process_hook:
+        if engine == RenderEngine.SUBPROCESS:
+            logger.error("--in-process-hook cannot be combined with --engine subprocess")
+            raise typer.Exit(code=1)
+        # Set in the environment so worker processes pick it up too
+        os.environ[IN_PROCESS_HOOKS_ENV_VAR] = "1"
+
+    if in_memory or archive is not None:
+        engine = RenderEngine.IN_MEMORY
+    if materialize and engine != RenderEngine.IN_MEMORY:
+        logger.error("--materialize only applies to --in-memory")
+        raise typer.Exit(code=1)
+    if archive is not None and (materialize or dedup):
+        logger.error("--archive cannot be combined with --materialize or --dedup")
+        raise typer.Exit(code=1)
+
     if output_dir is None:
         output_dir = Path(__file__).parent.parent / "tmp"
 
-    output_dir.mkdir(parents=True, exist_ok=True)
+    # In-memory runs only write projects that fail validation
+    writes_projects = engine != RenderEngine.IN_MEMORY or materialize or archive is not None
+    if timings_file is None and writes_projects:
+        timings_file = output_dir / "timings.jsonl"
+
+    if writes_projects:
+        output_dir.mkdir(parents=True, exist_ok=True)
     logger.info(f"Output directory: {output_dir}")
 
     try:
-        test_configs = load_test_configs()
+        test_configs = load_configs(matrix, strength)
     except Exception as e:
         logger.error(f"Failed to load test configurations: {e}")
         raise typer.Exit(code=1) from None
 
     if config:
         if config not in test_configs:
-            logger.error(f"Configuration '{config}' not found in configs.yaml")
+            logger.error(f"Configuration '{config}' not found in {matrix.value} configurations")
             logger.info(f"Available configurations: {', '.join(test_configs.keys())}")
             raise typer.Exit(code=1)
         test_configs = {config: test_configs[config]}
 
+    if prune:
+        test_configs, pruned = prune_redundant_configs(test_configs, build_dependency_index())
+        logger.info(
+            f"Pruned {len(pruned)} configuration(s) whose file variants are already covered"
+        )
+        if pruned:
+            logger.debug(f"Pruned configurations: {', '.join(pruned)}")
+
     logger.info(f"Starting generation of {len(test_configs)} configuration(s)")
 
-    generated_projects: list[Path] = []
-    failed_configs: list[str] = []
+    timings: list[PhaseTiming] = []
+    generated_projects, failed_configs = generate_all(
+        test_configs,
+        output_dir,
+        exists,
+        jobs=jobs,
+        verbose=verbose,
+        engine=engine,
+        golden_dir=GOLDEN_DIR if golden or update_golden else None,
+        update_golden=update_golden,
+        timings=timings,
+        materialize=materialize,
+        dedup=dedup,
+        archive=archive,
+    )
 
-    for idx, (config_name, config_values) in enumerate(test_configs.items(), 1):
-        logger.info(f"Processing config {idx}/{len(test_configs)}: {config_name}")
-        try:
-            project_path = generate_project(config_name, config_values, output_dir, exists)
-            if project_path:
-                generated_projects.append(project_path)
-                logger.info(f"Config {idx}/{len(test_configs)} completed: {config_name}")
-        except Exception as e:
-            logger.error(f"Config {idx}/{len(test_configs)} failed: {config_name} - {e}")
-            failed_configs.append(config_name)
-            continue
+    if timings_file is not None:
+        write_timings(timings, timings_file)
+        logger.debug(f"Wrote phase timings to {timings_file}")
+    if trace is not None:
+        write_chrome_trace(timings, trace)
+        logger.info(f"Wrote trace to {trace}")
 
     logger.info(
         f"Generation complete: {len(generated_projects)} successful, {len(failed_configs)} failed, output_dir={output_dir}"
@@ -483,11 +2878,28 @@ def generate(  # noqa: B008
     if failed_configs:
         logger.warning(f"Failed configurations: {', '.join(failed_configs)}")
 
-    if generated_projects:
-        for project in generated_projects:
+    if dedup:
+        store = ContentStore(output_dir / STORE_DIR)
+        store.prune()
+        saved, deduplicated, shared = store.savings()
+        logger.info(
+            f"Deduplication saved {format_size(saved)}: {deduplicated} file(s) share "
+            f"{shared} stored cop{'y' if shared == 1 else 'ies'}"
+        )
+
+    for phase, stats in summarize_timings(timings).items():
+        logger.info(
+            f"{phase}: p50={stats['p50']:.1f}ms p95={stats['p95']:.1f}ms "
+            f"total={stats['total']:.1f}ms (n={stats['count']})"
+        )
+
+    for project in generated_projects:
+        if writes_projects:
             logger.success(f"Generated project: {project.parent.name}/{project.name}")
+        else:
+            logger.success(f"Validated project in memory: {project.parent.name}/{project.name}")
 
-    if auto_cleanup and generated_projects:
+    if auto_cleanup and generated_projects and writes_projects:
         logger.info("Auto-cleanup enabled, removing generated projects...")
         config_dirs = {project.parent for project in generated_projects}
         for config_dir in config_dirs:
@@ -499,10 +2911,163 @@ def generate(  # noqa: B008
 
 
 @app.command()
-def list_configs() -> None:
-    """List all available test configurations."""
+def watch(  # noqa: B008
+    config: str | None = typer.Option(
+        None,
+        "--config",
+        "-c",
+        help="Watch only a specific configuration by name",
+    ),
+    output_dir: Path = typer.Option(
+        None,
+        "--output-dir",
+        "-o",
+        help="Output directory for generated projects (default: tmp/)",
+    ),
+    matrix: MatrixMode = typer.Option(
+        MatrixMode.CONFIGS,
+        "--matrix",
+        "-m",
+        help="Use configs.yaml or build a full, pairwise or n-wise matrix from cookiecutter.json",
+    ),
+    strength: int = typer.Option(
+        3,
+        "--strength",
+        min=2,
+        help="Interaction strength for --matrix n-wise",
+    ),
+    interval: float = typer.Option(
+        0.2,
+        "--interval",
+        min=0.05,
+        help="Seconds between checks of the template tree",
+    ),
+    golden: bool = typer.Option(
+        True,
+        "--golden/--no-golden",
+        help="Compare updated projects with their golden manifests in scripts/golden/",
+    ),
+    verbose: bool = typer.Option(
+        False,
+        "--verbose",
+        "-v",
+        help="Enable verbose debug logging",
+    ),
+) -> None:
+    """Keep generated projects up to date while the template is edited.
+
+    Execution flow:
+    1. Generate every configuration that is missing or stale (--exists reuse)
+    2. Poll the template tree for added, modified and removed files
+    3. Re-render only the edited files into each project, writing those whose
+       output changed, then re-validate the affected projects (reporting any
+       difference from their golden manifests)
+    4. Regenerate everything if the hook or cookiecutter.json changes
+
+    Parameters
+    ----------
+    config : str | None
+        Name of specific configuration to watch (watches all if None)
+    output_dir : Path | None
+        Custom output directory (uses tmp/ if None)
+    matrix : MatrixMode
+        Source of the configurations to watch
+    strength : int
+        Interaction strength when matrix is n-wise
+    interval : float
+        Polling interval in seconds
+    golden : bool
+        Whether to compare updated projects with their golden manifests
+    verbose : bool
+        Enable verbose debug logging
+    """
+    if not verbose:
+        logger.remove()
+        logger.add(sys.stderr, level="INFO")
+
+    if output_dir is None:
+        output_dir = Path(__file__).parent.parent / "tmp"
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    try:
+        test_configs = load_configs(matrix, strength)
+    except Exception as e:
+        logger.error(f"Failed to load test configurations: {e}")
+        raise typer.Exit(code=1) from None
+
+    if config:
+        if config not in test_configs:
+            logger.error(f"Configuration '{config}' not found in {matrix.value} configurations")
+            raise typer.Exit(code=1)
+        test_configs = {config: test_configs[config]}
+
+    golden_dir = GOLDEN_DIR if golden else None
+    generate_all(test_configs, output_dir, ExistsStrategy.REUSE, golden_dir=golden_dir)
+    projects = load_watched_projects(test_configs, output_dir)
+    hook_cache: dict[tuple, str | None] = {}
+    snapshot = snapshot_template()
+    logger.info(f"Watching template for {len(projects)} project(s), press Ctrl+C to stop")
+
+    try:
+        while True:
+            time.sleep(interval)
+            current = snapshot_template()
+            if current == snapshot:
+                continue
+            changed, removed = diff_snapshots(snapshot, current)
+            snapshot = current
+            logger.info(f"Template changed: {', '.join(changed + removed)}")
+            start = time.perf_counter()
+
+            try:
+                affected = apply_template_changes(
+                    changed, removed, projects, hook_cache, golden_dir
+                )
+            except Exception as e:
+                logger.error(f"Re-render failed: {type(e).__name__}: {e}")
+                continue
+
+            if affected is None:
+                logger.info("Hook or cookiecutter.json changed, regenerating all projects")
+                hash_template_tree.cache_clear()
+                build_dependency_index.cache_clear()
+                hook_cache.clear()
+                generate_all(test_configs, output_dir, ExistsStrategy.REUSE, golden_dir=golden_dir)
+                projects = load_watched_projects(test_configs, output_dir)
+                affected = projects
+
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            logger.success(f"Updated {len(affected)} project(s) in {elapsed_ms:.0f} ms")
+    except KeyboardInterrupt:
+        logger.info("Stopped watching")
+
+
+@app.command()
+def list_configs(  # noqa: B008
+    matrix: MatrixMode = typer.Option(
+        MatrixMode.CONFIGS,
+        "--matrix",
+        "-m",
+        help="List configs.yaml or a full, pairwise or n-wise matrix from cookiecutter.json",
+    ),
+    strength: int = typer.Option(
+        3,
+        "--strength",
+        min=2,
+        help="Interaction strength for --matrix n-wise",
+    ),
+) -> None:
+    """List all available test configurations.
+
+    Parameters
+    ----------
+    matrix : MatrixMode
+        Source of the configurations to list
+    strength : int
+        Interaction strength when matrix is n-wise
+    """
     try:
-        test_configs = load_test_configs()
+        test_configs = load_configs(matrix, strength)
     except Exception as e:
         logger.error(f"Failed to load test configurations: {e}")
         raise typer.Exit(code=1) from None
@@ -513,6 +3078,50 @@ def list_configs() -> None:
         print(f"{name} - {desc}")
 
 
+@app.command()
+def dependencies(  # noqa: B008
+    matrix: MatrixMode = typer.Option(
+        MatrixMode.CONFIGS,
+        "--matrix",
+        "-m",
+        help="Count distinct file variants across this set of configurations",
+    ),
+    strength: int = typer.Option(
+        3,
+        "--strength",
+        min=2,
+        help="Interaction strength for --matrix n-wise",
+    ),
+) -> None:
+    """Show which cookiecutter variables each template file depends on.
+
+    For every file, lists the variables that select template branches and the
+    number of distinct variants the chosen configurations render.
+
+    Parameters
+    ----------
+    matrix : MatrixMode
+        Source of the configurations to group
+    strength : int
+        Interaction strength when matrix is n-wise
+    """
+    try:
+        test_configs = load_configs(matrix, strength)
+    except Exception as e:
+        logger.error(f"Failed to load test configurations: {e}")
+        raise typer.Exit(code=1) from None
+
+    index = build_dependency_index()
+    groups = group_file_variants(test_configs, index)
+    kept, _ = prune_redundant_configs(test_configs, index)
+
+    print(f"\nTemplate dependencies ({len(index)} files, {len(test_configs)} configs):\n")
+    for path, file_dependencies in index.items():
+        branches = ", ".join(sorted(file_dependencies.branches)) or "-"
+        print(f"{path} [{len(groups[path])} variant(s)] - {branches}")
+    print(f"\n{len(kept)} of {len(test_configs)} configuration(s) render a distinct variant")
+
+
 @app.command()
 def cleanup(  # noqa: B008
     output_dir: Path = typer.Option(
@@ -527,15 +3136,27 @@ def cleanup(  # noqa: B008
         "-c",
         help="Cleanup only a specific configuration",
     ),
+    wait: bool = typer.Option(
+        False,
+        "--wait",
+        help="Wait for deletion to finish instead of leaving it to a background process",
+    ),
 ) -> None:
     """Cleanup generated test projects.
 
+    Targets are renamed out of the way first, which is atomic and fast, so the
+    output directory is immediately reusable. Deletion then runs in a detached
+    background process (or in this process with --wait). Leftovers from
+    interrupted deletions are removed too.
+
     Parameters
     ----------
     output_dir : Path | None
         Directory containing generated projects (uses tmp/ if None)
     config : str | None
         Name of specific configuration to cleanup (cleans all if None)
+    wait : bool
+        Whether to block until deletion has finished
     """
     if output_dir is None:
         output_dir = Path(__file__).parent.parent / "tmp"
@@ -544,21 +3165,59 @@ def cleanup(  # noqa: B008
         logger.info(f"Output directory does not exist: {output_dir}")
         return
 
+    trashed = []
     if config:
         logger.info(f"Cleaning up specific config: {config}")
         config_dir = output_dir / config
-        cleanup_project(config_dir)
+        if config_dir.exists():
+            trashed.append(move_to_trash(config_dir))
+            logger.success(f"Removed {config}")
+        else:
+            logger.debug(f"Project path does not exist: {config_dir}")
     else:
         logger.info(f"Cleaning up all projects in {output_dir}")
-        for item in output_dir.iterdir():
-            if item.name not in [".gitkeep"]:
-                if item.is_dir():
-                    shutil.rmtree(item)
-                    logger.success(f"Removed {item.name}")
-                else:
-                    item.unlink()
-                    logger.success(f"Removed {item.name}")
-        logger.success("Cleanup complete")
+        for item in sorted(output_dir.iterdir()):
+            if item.name in [".gitkeep"]:
+                continue
+            if item.name.endswith(TRASH_SUFFIX):
+                trashed.append(item)
+            else:
+                trashed.append(move_to_trash(item))
+                logger.success(f"Removed {item.name}")
+
+    if not trashed:
+        return
+
+    if wait:
+        purge(trashed)
+    else:
+        subprocess.Popen(
+            [sys.executable, str(Path(__file__).resolve()), "purge", *map(str, trashed)],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True,
+        )
+        logger.info(f"Deleting {len(trashed)} item(s) in the background")
+    logger.success("Cleanup complete")
+
+
+@app.command(hidden=True)
+def purge(
+    paths: list[Path] = typer.Argument(..., help="Trashed paths to delete"),
+) -> None:
+    """Delete trashed paths across the background deletion pool.
+
+    Run detached by ``cleanup``; not intended to be called directly.
+
+    Parameters
+    ----------
+    paths : list[Path]
+        Paths previously renamed by move_to_trash()
+    """
+    for path in paths:
+        delete_in_background(path)
+    wait_for_deletions()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,45 @@
+"""Tests for regression detection in the benchmark suite."""
+
+import json
+
+from scripts.benchmarks.suite import append_history, compare_to_baseline
+
+
+class TestCompareToBaseline:
+    """Tests for compare_to_baseline function."""
+
+    def test_flags_slowdown_above_threshold(self):
+        """A metric slower than baseline by more than the threshold regresses."""
+        regressions = compare_to_baseline(
+            {"warm/minimal": 130.0, "warm/conda_env": 110.0},
+            {"warm/minimal": 100.0, "warm/conda_env": 100.0},
+            threshold=0.2,
+            min_delta_ms=5.0,
+        )
+
+        assert regressions == ["warm/minimal"]
+
+    def test_ignores_small_absolute_changes(self):
+        """Large relative changes on tiny metrics are treated as noise."""
+        assert (
+            compare_to_baseline({"template/Makefile": 2.0}, {"template/Makefile": 1.0}, 0.2, 5.0)
+            == []
+        )
+
+    def test_ignores_metrics_missing_from_baseline(self):
+        """New metrics have nothing to regress against."""
+        assert compare_to_baseline({"cold/new_config": 900.0}, {}, 0.2, 5.0) == []
+
+
+class TestAppendHistory:
+    """Tests for append_history function."""
+
+    def test_appends_runs_in_order(self, tmp_path):
+        """Each run is appended to the JSON list, creating the file first."""
+        history_file = tmp_path / "history.json"
+
+        append_history(history_file, {"metrics": {"cli/help": 1.0}})
+        append_history(history_file, {"metrics": {"cli/help": 2.0}})
+
+        history = json.loads(history_file.read_text())
+        assert [run["metrics"]["cli/help"] for run in history] == [1.0, 2.0]
@@ -0,0 +1,64 @@
+"""Tests for rename-then-background-delete cleanup in generate_projects."""
+
+from scripts.generate_projects import (
+    TRASH_SUFFIX,
+    cleanup,
+    cleanup_project,
+    move_to_trash,
+    wait_for_deletions,
+)
+
+
+class TestMoveToTrash:
+    """Tests for move_to_trash function."""
+
+    def test_renames_to_hidden_sibling(self, tmp_path):
+        """The path is renamed within its parent directory, contents intact."""
+        target = tmp_path / "project"
+        target.mkdir()
+        (target / "file.txt").write_text("content")
+
+        trashed = move_to_trash(target)
+
+        assert not target.exists()
+        assert trashed.parent == tmp_path
+        assert trashed.name.startswith(".project.")
+        assert trashed.name.endswith(TRASH_SUFFIX)
+        assert (trashed / "file.txt").read_text() == "content"
+
+
+class TestBackgroundCleanup:
+    """Tests for background deletion in cleanup_project and cleanup."""
+
+    def test_path_is_free_before_deletion_finishes(self, tmp_path, mock_logger):
+        """The project path can be recreated straight away and the trash goes later."""
+        project = tmp_path / "project"
+        (project / "nested").mkdir(parents=True)
+        (project / "nested" / "file.txt").write_text("old")
+
+        cleanup_project(project)
+        project.mkdir()
+        wait_for_deletions()
+
+        assert list(tmp_path.iterdir()) == [project]
+        assert list(project.iterdir()) == []
+
+    def test_cleanup_command_removes_everything_but_gitkeep(self, tmp_path, mock_logger):
+        """All config directories, files and stale trash are deleted."""
+        (tmp_path / ".gitkeep").write_text("")
+        (tmp_path / "minimal" / "minimal_project").mkdir(parents=True)
+        (tmp_path / "timings.jsonl").write_text("{}")
+        (tmp_path / f".stale.0000{TRASH_SUFFIX}").mkdir()
+
+        cleanup(output_dir=tmp_path, config=None, wait=True)
+
+        assert [p.name for p in tmp_path.iterdir()] == [".gitkeep"]
+
+    def test_cleanup_command_single_config(self, tmp_path, mock_logger):
+        """Only the requested configuration is removed."""
+        (tmp_path / "minimal").mkdir()
+        (tmp_path / "conda_env").mkdir()
+
+        cleanup(output_dir=tmp_path, config="minimal", wait=True)
+
+        assert [p.name for p in tmp_path.iterdir()] == ["conda_env"]
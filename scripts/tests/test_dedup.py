@@ -0,0 +1,100 @@
+"""Tests for hardlink deduplication of generated projects in generate_projects."""
+
+from scripts.generate_projects import (
+    STORE_DIR,
+    ContentStore,
+    ExistsStrategy,
+    dedupe_project,
+    format_size,
+    generate_all,
+    load_test_configs,
+)
+
+
+class TestContentStore:
+    """Tests for ContentStore class."""
+
+    def test_identical_files_share_one_inode(self, tmp_path):
+        """The second copy of some content becomes a hardlink to the first."""
+        store = ContentStore(tmp_path / STORE_DIR)
+        first, second = tmp_path / "a.txt", tmp_path / "b.txt"
+        first.write_text("same")
+        second.write_text("same")
+        digest = "0" * 64
+
+        assert not store.link_file(first, digest)
+        assert store.link_file(second, digest)
+        assert first.stat().st_ino == second.stat().st_ino
+        assert second.read_text() == "same"
+
+    def test_different_modes_are_stored_separately(self, tmp_path):
+        """An executable file is never linked to a non-executable copy."""
+        store = ContentStore(tmp_path / STORE_DIR)
+        plain, script = tmp_path / "plain", tmp_path / "script"
+        plain.write_text("echo")
+        script.write_text("echo")
+        script.chmod(0o755)
+
+        store.link_file(plain, "0" * 64)
+
+        assert not store.link_file(script, "0" * 64)
+        assert plain.stat().st_ino != script.stat().st_ino
+
+    def test_write_links_stored_content(self, tmp_path):
+        """Writing content that is already stored creates a hardlink."""
+        store = ContentStore(tmp_path / STORE_DIR)
+
+        assert not store.write(tmp_path / "a.txt", b"data", 0o644)
+        assert store.write(tmp_path / "b.txt", b"data", 0o644)
+        assert (tmp_path / "b.txt").stat().st_nlink == 3
+
+    def test_savings_and_prune(self, tmp_path):
+        """Savings count every extra link and only shared entries; unlinked entries are pruned."""
+        store = ContentStore(tmp_path / STORE_DIR)
+        for name in ("a", "b", "c"):
+            store.write(tmp_path / name, b"12345", 0o644)
+        store.write(tmp_path / "unique", b"x", 0o644)
+
+        assert store.savings() == (10, 3, 1)
+
+        (tmp_path / "unique").unlink()
+        assert store.prune() == 1
+        assert store.savings() == (10, 3, 1)
+
+
+class TestFormatSize:
+    """Tests for format_size function."""
+
+    def test_uses_largest_unit_below_1024(self):
+        """Sizes are shown in B, KB, MB or GB with one decimal place."""
+        assert format_size(512) == "512.0 B"
+        assert format_size(1536) == "1.5 KB"
+        assert format_size(3 * 1024**3) == "3.0 GB"
+
+
+class TestDedupeProject:
+    """Tests for dedupe_project function and generation with dedup."""
+
+    def test_generated_projects_share_identical_files(self, tmp_path, mock_logger):
+        """Files linked across configurations are identical and share inodes."""
+        configs = load_test_configs()
+        test_configs = {name: configs[name] for name in ("minimal", "conda_env")}
+
+        projects, failed = generate_all(test_configs, tmp_path, ExistsStrategy.CLEAN, dedup=True)
+
+        assert not failed
+        first, second = (project / "CODE_OF_CONDUCT.md" for project in projects)
+        assert first.read_bytes() == second.read_bytes()
+        assert first.stat().st_ino == second.stat().st_ino
+        assert ContentStore(tmp_path / STORE_DIR).savings()[0] > 0
+
+    def test_is_idempotent(self, tmp_path, mock_logger):
+        """Deduplicating an already linked project links nothing new."""
+        project = tmp_path / "config" / "project"
+        project.mkdir(parents=True)
+        (project / "a.txt").write_text("same")
+        (project / "b.txt").write_text("same")
+        store = ContentStore(tmp_path / STORE_DIR)
+
+        assert dedupe_project(project, store) == 1
+        assert dedupe_project(project, store) == 0
@@ -0,0 +1,189 @@
+"""Tests for the template-variable dependency index in generate_projects."""
+
+import json
+
+import pytest
+
+from nhse_rap_cookiecutter.rendering import get_environment
+from scripts.generate_projects import (
+    HOOK_PATH,
+    FileDependencies,
+    build_dependency_index,
+    group_file_variants,
+    prune_redundant_configs,
+    template_references,
+)
+
+
+@pytest.fixture
+def env():
+    """Jinja environment with the cookiecutter extensions loaded."""
+    return get_environment({"cookiecutter": {}})
+
+
+@pytest.fixture
+def template_repo(tmp_path):
+    """Create a small template repository with conditional and derived variables.
+
+    Returns
+    -------
+    Path
+        Repository root
+    """
+    repo = tmp_path / "repo"
+    project = repo / "{{ cookiecutter.repo_name }}"
+    (project / "{{ cookiecutter.module_name }}").mkdir(parents=True)
+    (project / "Makefile").write_text(
+        "NAME = {{ cookiecutter.repo_name }}\n{% if cookiecutter.docs == 'mkdocs' %}docs:{% endif %}\n"
+    )
+    (project / "{{ cookiecutter.module_name }}" / "__init__.py").write_text("")
+    (project / "logo.png").write_bytes(b"\x89PNG\r\n\x1a\n\x00\x00\x00")
+    (repo / "hooks").mkdir()
+    (repo / "hooks" / "post_gen_project.py").write_text(
+        'if "{{ cookiecutter.environment_manager }}" == "conda": pass\n'
+    )
+    (repo / "cookiecutter.json").write_text(
+        json.dumps(
+            {
+                "project_name": "project_name",
+                "repo_name": "{{ cookiecutter.project_name.lower() }}",
+                "module_name": "{{ cookiecutter.repo_name.replace('-', '_') }}",
+                "environment_manager": ["uv", "conda"],
+                "docs": ["mkdocs", "none"],
+            }
+        )
+    )
+    return repo
+
+
+class TestTemplateReferences:
+    """Tests for template_references function."""
+
+    def test_separates_branches_from_substitutions(self, env):
+        """Variables in if-tests are branches, plain output is substitution."""
+        branches, substitutions = template_references(
+            "{{ cookiecutter.name }}{% if cookiecutter.docs == 'x' %}{{ cookiecutter.url }}{% endif %}",
+            env,
+        )
+
+        assert branches == {"docs"}
+        assert substitutions == {"name", "url"}
+
+    def test_for_loops_and_conditional_expressions_are_branches(self, env):
+        """Loop iterables and inline-if tests select branches."""
+        branches, _ = template_references(
+            "{% for x in cookiecutter.items %}{{ x }}{% endfor %}"
+            "{{ 'a' if cookiecutter.flag else 'b' }}",
+            env,
+        )
+
+        assert branches == {"items", "flag"}
+
+    def test_subscript_access_is_recorded(self, env):
+        """cookiecutter['var'] is recorded like attribute access."""
+        _, substitutions = template_references("{{ cookiecutter['team_name'] }}", env)
+
+        assert substitutions == {"team_name"}
+
+    def test_bare_cookiecutter_depends_on_everything(self, env):
+        """Passing the whole cookiecutter dict is recorded as a wildcard."""
+        _, substitutions = template_references("{{ cookiecutter | jsonify }}", env)
+
+        assert substitutions == {"*"}
+
+
+class TestBuildDependencyIndex:
+    """Tests for build_dependency_index function."""
+
+    def test_indexes_content_and_path_variables(self, template_repo):
+        """Content branches and templated paths are both indexed."""
+        index = build_dependency_index(template_repo)
+
+        assert index["Makefile"].branches == {"docs"}
+        assert index["Makefile"].substitutions == {"repo_name", "project_name"}
+        init = index["{{ cookiecutter.module_name }}/__init__.py"]
+        assert init.substitutions == {"module_name", "repo_name", "project_name"}
+
+    def test_binary_files_only_depend_on_path(self, template_repo):
+        """Binary files are not parsed as templates."""
+        index = build_dependency_index(template_repo)
+
+        assert index["logo.png"] == FileDependencies()
+
+    def test_hook_variables_are_branches(self, template_repo):
+        """Variables used by the post-generation hook decide which files exist."""
+        index = build_dependency_index(template_repo)
+
+        assert index[HOOK_PATH].branches == {"environment_manager"}
+
+    def test_real_template_makefile_dependencies(self):
+        """Makefile branches on the environment, linting, docs and scaffold choices."""
+        index = build_dependency_index()
+
+        assert index["Makefile"].branches == {
+            "environment_manager",
+            "linting_and_formatting",
+            "docs",
+            "include_code_scaffold",
+        }
+        # environment_manager decides whether the file is included at all
+        assert index["_environment.yml"].branches == {
+            "environment_manager",
+            "linting_and_formatting",
+            "docs",
+        }
+
+    def test_file_rules_decide_hook_variables(self):
+        """The hook applies the file rules, so it only depends on the variables they test."""
+        index = build_dependency_index()
+
+        assert index[HOOK_PATH].branches == {
+            "environment_manager",
+            "linting_and_formatting",
+            "docs",
+        }
+        assert "linting_and_formatting" in index["setup.cfg"].branches
+
+
+class TestVariantGrouping:
+    """Tests for grouping and pruning configurations by file variant."""
+
+    def test_groups_configs_per_file(self, mock_logger):
+        """Configurations differing only in substituted text share a variant."""
+        index = {"Makefile": FileDependencies(branches=frozenset({"docs"}))}
+        configs = {
+            "a": {"project_name": "a", "docs": "mkdocs"},
+            "b": {"project_name": "b", "docs": "mkdocs"},
+            "c": {"project_name": "c", "docs": "none"},
+        }
+
+        groups = group_file_variants(configs, index)
+
+        assert sorted(groups["Makefile"].values()) == [["a", "b"], ["c"]]
+
+    def test_prunes_configs_with_no_new_variant(self, mock_logger):
+        """A configuration whose every variant is covered is pruned."""
+        index = {
+            "Makefile": FileDependencies(branches=frozenset({"docs"})),
+            "pyproject": FileDependencies(branches=frozenset({"environment_manager"})),
+        }
+        configs = {
+            "a": {"docs": "mkdocs", "environment_manager": "uv"},
+            "b": {"docs": "none", "environment_manager": "conda"},
+            "c": {"docs": "mkdocs", "environment_manager": "conda"},
+            "d": {"docs": "none", "environment_manager": "pixi"},
+        }
+
+        kept, pruned = prune_redundant_configs(configs, index)
+
+        assert list(kept) == ["a", "b", "d"]
+        assert pruned == ["c"]
+
+    def test_missing_values_use_cookiecutter_defaults(self, mock_logger):
+        """Unset variables fall back to the first cookiecutter.json choice."""
+        index = {"Makefile": FileDependencies(branches=frozenset({"docs"}))}
+        configs = {"explicit": {"docs": "mkdocs"}, "default": {}}
+
+        kept, pruned = prune_redundant_configs(configs, index)
+
+        assert pruned == ["default"]
@@ -0,0 +1,145 @@
+"""Tests for golden manifest validation in generate_projects."""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from scripts.generate_projects import (
+    GOLDEN_DIR,
+    GOLDEN_VOLATILE,
+    MANIFEST_CACHE_FILE,
+    TEMPLATE_PATHS,
+    GoldenMismatchError,
+    build_manifest,
+    check_golden_manifest,
+    compare_manifests,
+    load_test_configs,
+    scan_project,
+)
+
+
+@pytest.fixture
+def project(tmp_path):
+    """Create a small generated project inside a config output directory.
+
+    Returns
+    -------
+    Path
+        Project directory
+    """
+    project = tmp_path / "config" / "project"
+    (project / "src" / "pkg").mkdir(parents=True)
+    (project / "README.md").write_text("# Project\n")
+    (project / "src" / "pkg" / "__init__.py").write_text("")
+    (project / "LICENSE").write_text("Copyright 2025\n")
+    return project
+
+
+class TestScanProject:
+    """Tests for scan_project function."""
+
+    def test_lists_nested_files_with_posix_paths(self, project):
+        """Every file is listed relative to the project, directories are not."""
+        files = scan_project(project)
+
+        assert sorted(files) == ["LICENSE", "README.md", "src/pkg/__init__.py"]
+        assert files["README.md"][0] == len("# Project\n")
+
+
+class TestBuildManifest:
+    """Tests for build_manifest function."""
+
+    def test_reuses_hash_when_size_and_mtime_match(self, project, mocker):
+        """Unchanged files are not read again when a cached manifest is given."""
+        first = build_manifest(project)
+        hash_file = mocker.patch("scripts.generate_projects.hash_file", return_value="new")
+        (project / "README.md").write_text("# Edited project\n")
+
+        second = build_manifest(project, first)
+
+        hash_file.assert_called_once_with(project / "README.md")
+        assert second["README.md"]["sha256"] == "new"
+        assert second["LICENSE"] == first["LICENSE"]
+
+
+class TestCompareManifests:
+    """Tests for compare_manifests function."""
+
+    def test_reports_added_removed_and_changed(self):
+        """Each kind of difference is reported separately."""
+        expected = {
+            "a.txt": {"size": 1, "sha256": "x"},
+            "b.txt": {"size": 1, "sha256": "y"},
+        }
+        actual = {
+            "a.txt": {"size": 1, "sha256": "changed"},
+            "c.txt": {"size": 1, "sha256": "z"},
+        }
+
+        diff = compare_manifests(expected, actual)
+
+        assert diff.added == ["c.txt"]
+        assert diff.removed == ["b.txt"]
+        assert diff.changed == ["a.txt"]
+
+    def test_volatile_files_only_need_to_exist(self):
+        """Date-stamped files may change content without a difference."""
+        expected = {"LICENSE": {"size": 10, "sha256": "old"}}
+        actual = {"LICENSE": {"size": 12, "sha256": "new"}}
+
+        assert not compare_manifests(expected, actual)
+
+
+class TestCheckGoldenManifest:
+    """Tests for check_golden_manifest function."""
+
+    def test_update_then_match(self, project, tmp_path, mock_logger):
+        """A freshly recorded golden manifest matches the project."""
+        golden = tmp_path / "golden" / "config.json"
+
+        check_golden_manifest(project, golden, update=True)
+
+        assert set(json.loads(golden.read_text())) == set(scan_project(project))
+        assert not check_golden_manifest(project, golden)
+        assert (project.parent / MANIFEST_CACHE_FILE).exists()
+
+    def test_mismatch_raises_with_exact_files(self, project, tmp_path, mock_logger):
+        """Edited, new and deleted files are listed in the raised error."""
+        golden = tmp_path / "config.json"
+        check_golden_manifest(project, golden, update=True)
+        (project / "README.md").write_text("# Different\n")
+        (project / "extra.txt").write_text("new")
+        (project / "src" / "pkg" / "__init__.py").unlink()
+
+        with pytest.raises(GoldenMismatchError) as exc_info:
+            check_golden_manifest(project, golden)
+
+        diff = exc_info.value.diff
+        assert diff.added == ["extra.txt"]
+        assert diff.removed == ["src/pkg/__init__.py"]
+        assert diff.changed == ["README.md"]
+
+    def test_missing_golden_is_skipped(self, project, tmp_path, mock_logger):
+        """Configurations without a golden manifest are not compared."""
+        assert not check_golden_manifest(project, tmp_path / "missing.json")
+
+
+class TestGoldenManifests:
+    """Tests for the golden manifests stored in the repository."""
+
+    def test_every_config_has_golden_manifest(self):
+        """Each configs.yaml entry has a recorded golden manifest."""
+        for config_name in load_test_configs():
+            assert (GOLDEN_DIR / f"{config_name}.json").exists(), config_name
+
+    def test_date_stamped_templates_are_volatile(self):
+        """Templates rendered with {% now %} are excluded from content checks."""
+        project_template = Path(__file__).parent.parent.parent / TEMPLATE_PATHS[0]
+        date_stamped = {
+            path.relative_to(project_template).as_posix()
+            for path in project_template.rglob("*")
+            if path.is_file() and "{% now" in path.read_text(errors="ignore")
+        }
+
+        assert date_stamped <= set(GOLDEN_VOLATILE)
@@ -0,0 +1,187 @@
+"""Tests for the in-memory render engine in generate_projects."""
+
+import json
+import tarfile
+
+import pytest
+from typer.testing import CliRunner
+
+from nhse_rap_cookiecutter.archive import ArchiveFormat
+from scripts.generate_projects import (
+    RENDER_KEY_FILE,
+    ExistsStrategy,
+    GoldenMismatchError,
+    PhaseTimer,
+    RenderEngine,
+    app,
+    generate_project,
+    load_test_configs,
+    validate_rendered_files,
+)
+
+
+def read_tree(root):
+    """Return every file under root as relative path to bytes."""
+    return {
+        path.relative_to(root).as_posix(): path.read_bytes()
+        for path in root.rglob("*")
+        if path.is_file()
+    }
+
+
+class TestGenerateInMemory:
+    """Tests for generate_project with the in-memory engine."""
+
+    def test_passing_project_is_not_written(self, tmp_path, mock_logger):
+        """A project that validates leaves the output directory empty."""
+        config = load_test_configs()["minimal"]
+
+        project_path = generate_project(
+            "minimal", config, tmp_path, ExistsStrategy.CLEAN, RenderEngine.IN_MEMORY
+        )
+
+        assert project_path == tmp_path / "minimal" / "minimal_project"
+        assert list(tmp_path.iterdir()) == []
+
+    def test_materialized_project_matches_in_process_render(self, tmp_path, mock_logger):
+        """Materialized output is byte-identical to rendering with cookiecutter."""
+        config = load_test_configs()["conda_env"]
+
+        in_memory = generate_project(
+            "conda_env",
+            config,
+            tmp_path / "memory",
+            ExistsStrategy.CLEAN,
+            RenderEngine.IN_MEMORY,
+            materialize=True,
+        )
+        in_process = generate_project("conda_env", config, tmp_path / "disk")
+
+        assert read_tree(in_memory) == read_tree(in_process)
+        assert (in_memory.parent / RENDER_KEY_FILE).exists()
+
+    def test_archived_project_matches_in_process_render(self, tmp_path, mock_logger):
+        """An archived project holds the same files as rendering with cookiecutter."""
+        config = load_test_configs()["conda_env"]
+
+        archive_path = generate_project(
+            "conda_env",
+            config,
+            tmp_path / "archive",
+            ExistsStrategy.CLEAN,
+            RenderEngine.IN_MEMORY,
+            archive=ArchiveFormat.TAR_GZ,
+        )
+        in_process = generate_project("conda_env", config, tmp_path / "disk")
+
+        assert archive_path == tmp_path / "archive" / "conda_env" / "conda_project.tar.gz"
+        assert sorted(p.name for p in archive_path.parent.iterdir()) == [
+            RENDER_KEY_FILE,
+            "conda_project.tar.gz",
+        ]
+        with tarfile.open(archive_path) as tar:
+            tar.extractall(tmp_path / "extracted", filter="data")
+        assert read_tree(tmp_path / "extracted" / "conda_project") == read_tree(in_process)
+
+    def test_archive_is_timed_as_its_own_phase(self, tmp_path, mock_logger):
+        """Writing the archive is timed under "archive", not as a second render."""
+        timer = PhaseTimer("minimal")
+
+        generate_project(
+            "minimal",
+            load_test_configs()["minimal"],
+            tmp_path,
+            ExistsStrategy.CLEAN,
+            RenderEngine.IN_MEMORY,
+            archive=ArchiveFormat.TAR_GZ,
+            timer=timer,
+        )
+
+        phases = [timing.phase for timing in timer.timings]
+        assert phases.count("render") == 1
+        assert phases.count("archive") == 1
+
+    def test_failed_project_is_written_for_inspection(self, tmp_path, mock_logger):
+        """A project that fails validation is written to the output directory."""
+        golden_dir = tmp_path / "golden"
+        golden_dir.mkdir()
+        (golden_dir / "minimal.json").write_text(
+            json.dumps({"README.md": {"size": 0, "sha256": ""}})
+        )
+        config = load_test_configs()["minimal"]
+
+        with pytest.raises(GoldenMismatchError):
+            generate_project(
+                "minimal",
+                config,
+                tmp_path / "out",
+                ExistsStrategy.CLEAN,
+                RenderEngine.IN_MEMORY,
+                golden_dir,
+            )
+
+        assert (tmp_path / "out" / "minimal" / "minimal_project" / "README.md").exists()
+
+
+class TestGenerateCommandInMemory:
+    """Tests for the generate command with --in-memory."""
+
+    def test_writes_nothing_to_output_dir(self, tmp_path, mock_logger):
+        """Without --materialize, not even timings.jsonl is written."""
+        output_dir = tmp_path / "out"
+
+        result = CliRunner().invoke(
+            app, ["generate", "--in-memory", "-c", "minimal", "-o", str(output_dir), "-v"]
+        )
+
+        assert result.exit_code == 0, result.output
+        assert not output_dir.exists()
+        validated = [call.args[0] for call in mock_logger["success"].call_args_list]
+        assert "Validated project in memory: minimal/minimal_project" in validated
+
+    def test_writes_timings_to_explicit_path(self, tmp_path, mock_logger):
+        """Timings are still written when a file is given with --timings."""
+        timings_file = tmp_path / "timings.jsonl"
+
+        result = CliRunner().invoke(
+            app,
+            [
+                "generate",
+                "--in-memory",
+                "-c",
+                "minimal",
+                "-o",
+                str(tmp_path / "out"),
+                "--timings",
+                str(timings_file),
+                "-v",
+            ],
+        )
+
+        assert result.exit_code == 0, result.output
+        assert timings_file.read_text()
+        assert not (tmp_path / "out").exists()
+
+
+class TestValidateRenderedFiles:
+    """Tests for validate_rendered_files function."""
+
+    def test_directories_are_derived_from_file_paths(self, mock_logger):
+        """Expected directories count as present if any file is inside them."""
+        files = {
+            "README.md": b"#",
+            ".gitignore": b"",
+            "data/raw/.gitkeep": b"",
+            "notebooks/.gitkeep": b"",
+            "tests/test_x.py": b"",
+            "test_project/__init__.py": b"",
+        }
+
+        validate_rendered_files("x", files, {"project_name": "Test Project"})
+
+        mock_logger["warning"].assert_not_called()
+
+    def test_missing_critical_file_raises(self, mock_logger):
+        """A project without README.md fails like it does on disk."""
+        with pytest.raises(FileNotFoundError, match="README.md"):
+            validate_rendered_files("x", {".gitignore": b""}, {})
@@ -0,0 +1,121 @@
+"""Tests for covering-array matrix expansion in generate_projects."""
+
+import itertools
+
+import pytest
+
+from scripts.generate_projects import (
+    MatrixMode,
+    build_matrix_configs,
+    covering_array,
+    get_choice_parameters,
+    load_configs,
+    load_cookiecutter_config,
+    validate_config,
+)
+
+
+def uncovered_interactions(rows, parameters, strength):
+    """Return every strength-way combination of choices missing from rows."""
+    missing = []
+    for names in itertools.combinations(parameters, strength):
+        seen = {tuple(row[name] for name in names) for row in rows}
+        for values in itertools.product(*(parameters[name] for name in names)):
+            if values not in seen:
+                missing.append(dict(zip(names, values, strict=True)))
+    return missing
+
+
+class TestGetChoiceParameters:
+    """Tests for get_choice_parameters function."""
+
+    def test_returns_only_public_list_options(self, sample_cookiecutter_config):
+        """List-valued variables are returned, private and text variables are not."""
+        config = {**sample_cookiecutter_config, "_copy_without_render": ["*.html"]}
+
+        parameters = get_choice_parameters(config)
+
+        assert "project_name" not in parameters
+        assert "_copy_without_render" not in parameters
+        assert parameters["docs"] == ["mkdocs", "none"]
+
+
+class TestCoveringArray:
+    """Tests for covering_array function."""
+
+    @pytest.mark.parametrize("strength", [2, 3])
+    def test_covers_every_interaction(self, sample_cookiecutter_config, strength):
+        """Every strength-way combination of choices appears in some row."""
+        parameters = get_choice_parameters(sample_cookiecutter_config)
+
+        rows = covering_array(parameters, strength)
+
+        assert uncovered_interactions(rows, parameters, strength) == []
+
+    def test_pairwise_is_smaller_than_full_product(self, sample_cookiecutter_config):
+        """Pairwise array is much smaller than the cartesian product."""
+        parameters = get_choice_parameters(sample_cookiecutter_config)
+        full_size = 1
+        for values in parameters.values():
+            full_size *= len(values)
+
+        rows = covering_array(parameters, 2)
+
+        assert len(rows) < full_size
+        assert len(rows) >= 4 * 3
+
+    def test_rows_only_use_valid_choices(self, sample_cookiecutter_config):
+        """Every value in every row is one of that variable's choices."""
+        parameters = get_choice_parameters(sample_cookiecutter_config)
+
+        for row in covering_array(parameters, 2):
+            assert set(row) == set(parameters)
+            for name, value in row.items():
+                assert value in parameters[name]
+
+    def test_strength_above_parameter_count_is_full_product(self):
+        """Strength greater than the number of variables yields the full product."""
+        parameters = {"a": [1, 2], "b": ["x", "y", "z"]}
+
+        rows = covering_array(parameters, 5)
+
+        assert len(rows) == 6
+
+
+class TestBuildMatrixConfigs:
+    """Tests for build_matrix_configs function."""
+
+    def test_pairwise_covers_real_template_choices(self, mock_logger):
+        """Pairwise matrix of cookiecutter.json covers all pairs in a few dozen rows."""
+        configs = build_matrix_configs(MatrixMode.PAIRWISE)
+        parameters = get_choice_parameters(load_cookiecutter_config())
+        rows = [{k: config[k] for k in parameters} for config in configs.values()]
+
+        assert len(configs) < 50
+        assert uncovered_interactions(rows, parameters, 2) == []
+
+    def test_configs_pass_validation_with_unique_names(self, mock_logger):
+        """Generated configurations validate and have unique project names."""
+        configs = build_matrix_configs(MatrixMode.NWISE, strength=3)
+
+        for name, values in configs.items():
+            validate_config(name, values)
+        project_names = [values["project_name"] for values in configs.values()]
+        assert len(set(project_names)) == len(project_names)
+        assert next(iter(configs)).startswith("3wise_")
+
+    def test_full_matrix_is_cartesian_product(self, mock_logger):
+        """Full matrix has one configuration per combination of choices."""
+        parameters = get_choice_parameters(load_cookiecutter_config())
+        expected = 1
+        for values in parameters.values():
+            expected *= len(values)
+
+        assert len(build_matrix_configs(MatrixMode.FULL)) == expected
+
+    def test_configs_mode_loads_yaml(self, mock_logger):
+        """CONFIGS mode returns the hand-picked configs.yaml entries."""
+        assert "minimal" in load_configs(MatrixMode.CONFIGS)
+
+        with pytest.raises(ValueError):
+            build_matrix_configs(MatrixMode.CONFIGS)
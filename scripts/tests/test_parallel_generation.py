@@ -0,0 +1,105 @@
+"""Tests for serial and parallel matrix generation in generate_projects."""
+
+from pathlib import Path
+
+from scripts.generate_projects import (
+    ConfigResult,
+    ExistsStrategy,
+    generate_all,
+    generate_config_worker,
+    load_test_configs,
+)
+
+
+class TestGenerateConfigWorker:
+    """Tests for generate_config_worker function."""
+
+    def test_captures_logs_and_project_path(self, tmp_path, mocker):
+        """Successful generation returns the project path and buffered log lines."""
+
+        def fake_generate(config_name, config_values, output_dir, *args):
+            from loguru import logger
+
+            logger.info(f"rendering {config_name}")
+            return output_dir / config_name / "project"
+
+        mocker.patch("scripts.generate_projects.generate_project", side_effect=fake_generate)
+
+        result = generate_config_worker("minimal", {}, tmp_path, ExistsStrategy.CLEAN)
+
+        assert result.project_path == tmp_path / "minimal" / "project"
+        assert result.error is None
+        assert any("rendering minimal" in line for line in result.logs)
+
+    def test_records_error_message_on_failure(self, tmp_path, mocker):
+        """Exceptions are captured as an error string rather than raised."""
+        mocker.patch(
+            "scripts.generate_projects.generate_project",
+            side_effect=ValueError("bad value"),
+        )
+
+        result = generate_config_worker("broken", {}, tmp_path, ExistsStrategy.CLEAN)
+
+        assert result.project_path is None
+        assert result.error == "bad value"
+
+    def test_debug_messages_only_captured_when_verbose(self, tmp_path, mocker):
+        """Debug records are dropped unless verbose is set."""
+
+        def fake_generate(config_name, config_values, output_dir, *args):
+            from loguru import logger
+
+            logger.debug("debug detail")
+            return None
+
+        mocker.patch("scripts.generate_projects.generate_project", side_effect=fake_generate)
+
+        quiet = generate_config_worker("a", {}, tmp_path, ExistsStrategy.CLEAN)
+        verbose = generate_config_worker("a", {}, tmp_path, ExistsStrategy.CLEAN, verbose=True)
+
+        assert not any("debug detail" in line for line in quiet.logs)
+        assert any("debug detail" in line for line in verbose.logs)
+
+
+class TestGenerateAll:
+    """Tests for generate_all function."""
+
+    def test_serial_results_in_config_order(self, tmp_path, mocker, mock_logger):
+        """Serial generation returns successes and failures in configuration order."""
+
+        def fake_generate(config_name, config_values, output_dir, *args):
+            if config_name == "bad":
+                raise ValueError("invalid")
+            return output_dir / config_name
+
+        mocker.patch("scripts.generate_projects.generate_project", side_effect=fake_generate)
+        configs = {"first": {}, "bad": {}, "second": {}}
+
+        generated, failed = generate_all(configs, tmp_path, ExistsStrategy.CLEAN)
+
+        assert generated == [tmp_path / "first", tmp_path / "second"]
+        assert failed == ["bad"]
+
+    def test_parallel_matches_serial_summary(self, tmp_path):
+        """Parallel generation renders each config into its own directory."""
+        real_configs = load_test_configs()
+        configs = {
+            "minimal": real_configs["minimal"],
+            "invalid": {**real_configs["minimal"], "environment_manager": "nope"},
+            "conda_env": real_configs["conda_env"],
+        }
+
+        generated, failed = generate_all(configs, tmp_path, ExistsStrategy.CLEAN, jobs=2)
+
+        assert [Path(p).parent.name for p in generated] == ["minimal", "conda_env"]
+        assert failed == ["invalid"]
+        assert (tmp_path / "minimal" / "minimal_project" / "README.md").exists()
+        assert (tmp_path / "conda_env" / "conda_project" / "environment.yml").exists()
+
+    def test_config_result_defaults(self):
+        """ConfigResult starts with no path, no error and an empty log buffer."""
+        result = ConfigResult(config_name="x")
+
+        assert result.project_path is None
+        assert result.error is None
+        assert result.logs == []
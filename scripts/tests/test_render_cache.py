@@ -0,0 +1,173 @@
+"""Tests for the content-addressed REUSE strategy in generate_projects."""
+
+import pytest
+
+from scripts.generate_projects import (
+    RENDER_KEY_FILE,
+    ExistsStrategy,
+    RenderEngine,
+    compute_render_key,
+    generate_project,
+    handle_existing_project,
+    hash_template_tree,
+    load_test_configs,
+)
+
+
+@pytest.fixture
+def template_repo(tmp_path):
+    """Create a minimal template repository layout.
+
+    Returns
+    -------
+    Path
+        Repository root with cookiecutter.json, hooks/ and a template directory
+    """
+    repo = tmp_path / "repo"
+    template = repo / "{{ cookiecutter.repo_name }}"
+    template.mkdir(parents=True)
+    (template / "README.md").write_text("# {{ cookiecutter.project_name }}")
+    (repo / "hooks").mkdir()
+    (repo / "hooks" / "post_gen_project.py").write_text("print('hook')")
+    (repo / "cookiecutter.json").write_text('{"project_name": "x"}')
+    (repo / "unrelated.txt").write_text("not part of the template")
+    return repo
+
+
+class TestHashTemplateTree:
+    """Tests for hash_template_tree function."""
+
+    def test_changes_when_template_file_changes(self, template_repo):
+        """Editing a template file changes the hash."""
+        before = hash_template_tree(template_repo)
+        hash_template_tree.cache_clear()
+        (template_repo / "{{ cookiecutter.repo_name }}" / "README.md").write_text("changed")
+
+        assert hash_template_tree(template_repo) != before
+        hash_template_tree.cache_clear()
+
+    def test_ignores_files_outside_template(self, template_repo):
+        """Editing files outside the template paths leaves the hash unchanged."""
+        before = hash_template_tree(template_repo)
+        hash_template_tree.cache_clear()
+        (template_repo / "unrelated.txt").write_text("edited")
+
+        assert hash_template_tree(template_repo) == before
+        hash_template_tree.cache_clear()
+
+    def test_changes_when_hook_renamed(self, template_repo):
+        """Renaming a file changes the hash even if contents are identical."""
+        before = hash_template_tree(template_repo)
+        hash_template_tree.cache_clear()
+        hooks = template_repo / "hooks"
+        (hooks / "post_gen_project.py").rename(hooks / "pre_gen_project.py")
+
+        assert hash_template_tree(template_repo) != before
+        hash_template_tree.cache_clear()
+
+
+class TestComputeRenderKey:
+    """Tests for compute_render_key function."""
+
+    def test_is_stable_for_same_values(self):
+        """Same configuration values produce the same key."""
+        assert compute_render_key({"docs": "mkdocs"}) == compute_render_key({"docs": "mkdocs"})
+
+    def test_changes_with_config_values(self):
+        """Different configuration values produce different keys."""
+        assert compute_render_key({"docs": "mkdocs"}) != compute_render_key({"docs": "none"})
+
+    def test_ignores_config_description(self):
+        """config_description does not affect the rendered output or the key."""
+        assert compute_render_key({"docs": "none", "config_description": "a"}) == (
+            compute_render_key({"docs": "none", "config_description": "b"})
+        )
+
+
+class TestHandleExistingProjectReuse:
+    """Tests for the REUSE strategy of handle_existing_project."""
+
+    def test_matching_key_keeps_project(self, tmp_path, mock_logger):
+        """Matching stored key returns False and leaves the project in place."""
+        project_path = tmp_path / "project"
+        project_path.mkdir()
+        (tmp_path / RENDER_KEY_FILE).write_text("abc")
+
+        result = handle_existing_project(project_path, ExistsStrategy.REUSE, "abc")
+
+        assert result is False
+        assert project_path.exists()
+
+    def test_stale_key_cleans_project(self, tmp_path, mock_logger):
+        """Different stored key removes the project and returns True."""
+        project_path = tmp_path / "project"
+        project_path.mkdir()
+        (tmp_path / RENDER_KEY_FILE).write_text("old")
+
+        result = handle_existing_project(project_path, ExistsStrategy.REUSE, "new")
+
+        assert result is True
+        assert not project_path.exists()
+
+    def test_missing_key_cleans_project(self, tmp_path, mock_logger):
+        """Project without a stored key is regenerated."""
+        project_path = tmp_path / "project"
+        project_path.mkdir()
+
+        result = handle_existing_project(project_path, ExistsStrategy.REUSE, "abc")
+
+        assert result is True
+        assert not project_path.exists()
+
+
+class TestGenerateProjectReuse:
+    """Tests for generate_project with the REUSE strategy."""
+
+    def test_second_run_skips_rendering(self, tmp_path, mocker):
+        """Unchanged configuration is reused without calling cookiecutter again."""
+        config = load_test_configs()["minimal"]
+        first = generate_project("minimal", config, tmp_path, ExistsStrategy.REUSE)
+        render = mocker.patch("scripts.generate_projects.run_cookiecutter")
+
+        second = generate_project("minimal", config, tmp_path, ExistsStrategy.REUSE)
+
+        assert second == first
+        render.assert_not_called()
+        assert (tmp_path / "minimal" / RENDER_KEY_FILE).read_text() == compute_render_key(config)
+
+    def test_changed_config_is_regenerated(self, tmp_path):
+        """Changing a value invalidates the stored key and re-renders."""
+        config = load_test_configs()["minimal"]
+        generate_project("minimal", config, tmp_path, ExistsStrategy.REUSE)
+
+        changed = {**config, "environment_manager": "conda"}
+        project_path = generate_project("minimal", changed, tmp_path, ExistsStrategy.REUSE)
+
+        assert (project_path / "environment.yml").exists()
+        assert not (project_path / "pyproject.toml").exists()
+
+    def test_in_memory_materialized_project_is_reused(self, tmp_path, mocker):
+        """An unchanged materialized in-memory project is not written again."""
+        config = load_test_configs()["minimal"]
+        first = generate_project(
+            "minimal",
+            config,
+            tmp_path,
+            ExistsStrategy.REUSE,
+            RenderEngine.IN_MEMORY,
+            materialize=True,
+        )
+        materialize = mocker.patch("scripts.generate_projects.materialize_files")
+
+        second = generate_project(
+            "minimal",
+            config,
+            tmp_path,
+            ExistsStrategy.REUSE,
+            RenderEngine.IN_MEMORY,
+            materialize=True,
+        )
+
+        assert second == first
+        materialize.assert_not_called()
+        assert (first / "README.md").exists()
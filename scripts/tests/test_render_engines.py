@@ -0,0 +1,49 @@
+"""Tests for the cookiecutter render engines in generate_projects."""
+
+import subprocess
+
+import pytest
+
+from scripts.generate_projects import RenderEngine, load_test_configs, run_cookiecutter
+
+
+class TestRunCookiecutter:
+    """Tests for run_cookiecutter function."""
+
+    def test_in_process_engine_renders_project(self, tmp_path):
+        """In-process engine renders the project without a subprocess."""
+        config = load_test_configs()["minimal"]
+        extra_context = {k: v for k, v in config.items() if k != "config_description"}
+
+        stdout = run_cookiecutter(
+            ["cookiecutter"], tmp_path, extra_context, RenderEngine.IN_PROCESS
+        )
+
+        assert stdout == ""
+        assert (tmp_path / "minimal_project" / "README.md").exists()
+
+    def test_in_process_errors_map_to_called_process_error(self, tmp_path, mocker):
+        """In-process failures raise the same exception as a failed subprocess."""
+        mocker.patch(
+            "scripts.generate_projects.render_project",
+            side_effect=RuntimeError("template exploded"),
+        )
+        cmd = ["cookiecutter", ".", "--no-input"]
+
+        with pytest.raises(subprocess.CalledProcessError) as exc_info:
+            run_cookiecutter(cmd, tmp_path, {}, RenderEngine.IN_PROCESS)
+
+        assert exc_info.value.cmd == cmd
+        assert "template exploded" in exc_info.value.stderr
+
+    def test_subprocess_engine_runs_cookiecutter_cli(self, tmp_path, mocker):
+        """Subprocess engine shells out with the given command."""
+        run = mocker.patch(
+            "scripts.generate_projects.subprocess.run",
+            return_value=subprocess.CompletedProcess([], 0, stdout="done"),
+        )
+
+        stdout = run_cookiecutter(["cookiecutter", "."], tmp_path, {}, RenderEngine.SUBPROCESS)
+
+        assert stdout == "done"
+        assert run.call_args.args[0] == ["cookiecutter", "."]
@@ -0,0 +1,122 @@
+"""Tests for per-phase timing instrumentation in generate_projects."""
+
+import json
+
+from scripts.generate_projects import (
+    PHASES,
+    ExistsStrategy,
+    PhaseTimer,
+    PhaseTiming,
+    generate_all,
+    load_test_configs,
+    percentile,
+    summarize_timings,
+    write_chrome_trace,
+    write_timings,
+)
+
+
+def make_timing(phase, self_us, config_name="a"):
+    """Build a PhaseTiming with the given self time."""
+    return PhaseTiming(config_name, phase, 0, self_us, self_us, 1)
+
+
+class TestPhaseTimer:
+    """Tests for PhaseTimer class."""
+
+    def test_nested_phase_is_excluded_from_self_time(self):
+        """The enclosing phase's self time excludes its nested phases."""
+        timer = PhaseTimer("a")
+
+        with timer.phase("render"), timer.phase("post_gen_hook"):
+            sum(range(10000))
+
+        hook, render = timer.timings
+        assert (hook.phase, render.phase) == ("post_gen_hook", "render")
+        assert render.duration_us >= hook.duration_us
+        assert render.self_us == render.duration_us - hook.duration_us
+
+    def test_records_phase_when_block_raises(self):
+        """A failing phase is still recorded."""
+        timer = PhaseTimer("a")
+
+        try:
+            with timer.phase("render"):
+                raise ValueError("boom")
+        except ValueError:
+            pass
+
+        assert [t.phase for t in timer.timings] == ["render"]
+
+
+class TestSummarizeTimings:
+    """Tests for percentile and summarize_timings functions."""
+
+    def test_percentile_uses_nearest_rank(self):
+        """p50 and p95 pick values from the list."""
+        values = list(range(1, 101))
+
+        assert percentile(values, 50) == 50
+        assert percentile(values, 95) == 95
+        assert percentile([7], 95) == 7
+
+    def test_summary_is_in_phase_order_in_milliseconds(self):
+        """Phases are summarised in PHASES order with millisecond statistics."""
+        timings = [make_timing("render", 2000), make_timing("validate_config", 1000)]
+        timings += [make_timing("render", 4000, "b")]
+
+        summary = summarize_timings(timings)
+
+        assert list(summary) == ["validate_config", "render"]
+        assert summary["render"] == {"count": 2, "p50": 2.0, "p95": 4.0, "total": 6.0}
+
+
+class TestTimingOutput:
+    """Tests for write_timings and write_chrome_trace functions."""
+
+    def test_writes_one_json_line_per_phase(self, tmp_path):
+        """Each timing is a JSON object on its own line."""
+        path = tmp_path / "timings.jsonl"
+
+        write_timings([make_timing("render", 5), make_timing("post_gen_hook", 3)], path)
+
+        lines = [json.loads(line) for line in path.read_text().splitlines()]
+        assert [line["phase"] for line in lines] == ["render", "post_gen_hook"]
+        assert lines[0]["self_us"] == 5
+
+    def test_writes_complete_trace_events(self, tmp_path):
+        """Trace events use the complete-event phase with microsecond timestamps."""
+        path = tmp_path / "trace.json"
+
+        write_chrome_trace([make_timing("render", 5)], path)
+
+        event = json.loads(path.read_text())["traceEvents"][0]
+        assert event["ph"] == "X"
+        assert event["dur"] == 5
+        assert event["args"] == {"config": "a"}
+
+
+class TestGenerateTimings:
+    """Tests for timings collected during generation."""
+
+    def test_every_phase_is_timed(self, tmp_path, mock_logger):
+        """An in-process render records every phase but archive and dedup, with the hook inside render."""
+        timings = []
+
+        generate_all(
+            {"minimal": load_test_configs()["minimal"]},
+            tmp_path,
+            ExistsStrategy.CLEAN,
+            timings=timings,
+        )
+
+        assert [t.phase for t in timings] == [
+            "validate_config",
+            "handle_existing_project",
+            "post_gen_hook",
+            "render",
+            "validate_generated_project",
+        ]
+        assert set(PHASES) - {"archive", "dedup"} == {t.phase for t in timings}
+        render = next(t for t in timings if t.phase == "render")
+        assert render.self_us < render.duration_us
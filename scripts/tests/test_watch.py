@@ -0,0 +1,199 @@
+"""Tests for incremental re-rendering used by the watch command in generate_projects."""
+
+import shutil
+from pathlib import Path
+
+import pytest
+
+import scripts.generate_projects as generate_projects
+from nhse_rap_cookiecutter.rendering import load_context, render_project
+from scripts.generate_projects import (
+    TEMPLATE_PATHS,
+    WatchedProject,
+    apply_template_changes,
+    build_dependency_index,
+    diff_snapshots,
+    post_gen_path,
+    remove_template_file,
+    rerender_template_file,
+    snapshot_template,
+)
+
+REPO_ROOT = Path(__file__).parent.parent.parent
+
+
+@pytest.fixture
+def template_copy(tmp_path):
+    """Copy the template into a scratch repository that tests may edit.
+
+    Returns
+    -------
+    Path
+        Root of the copied template repository
+    """
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    for name in TEMPLATE_PATHS:
+        source = REPO_ROOT / name
+        if source.is_dir():
+            shutil.copytree(source, repo / name, ignore=shutil.ignore_patterns("__pycache__"))
+        else:
+            shutil.copy2(source, repo / name)
+    yield repo
+    build_dependency_index.cache_clear()
+
+
+@pytest.fixture
+def watched(template_copy, tmp_path):
+    """Render a conda project from the copied template and return its watch state."""
+    extra_context = {"project_name": "Watch Me", "environment_manager": "conda"}
+    project_path = render_project(template_copy, tmp_path / "out", extra_context)
+    context = load_context(template_copy, extra_context)
+    return WatchedProject("conda", extra_context, project_path, context)
+
+
+@pytest.fixture
+def watch_project(template_copy, tmp_path):
+    """Return a function rendering a project from the copied template to watch."""
+
+    def make(config_name, **extra_context):
+        project_path = render_project(template_copy, tmp_path / config_name, extra_context)
+        context = load_context(template_copy, extra_context)
+        return WatchedProject(config_name, extra_context, project_path, context)
+
+    return make
+
+
+@pytest.fixture
+def render_calls(monkeypatch):
+    """Count the contexts render_file is called with."""
+    calls = []
+    render_file = generate_projects.render_file
+
+    def counting_render_file(template_dir, relative, context):
+        calls.append(context["cookiecutter"]["project_name"])
+        return render_file(template_dir, relative, context)
+
+    monkeypatch.setattr(generate_projects, "render_file", counting_render_file)
+    return calls
+
+
+class TestSnapshots:
+    """Tests for snapshot_template and diff_snapshots functions."""
+
+    def test_detects_modified_added_and_removed_files(self, template_copy):
+        """Edits, new files and deletions are each reported once."""
+        before = snapshot_template(template_copy)
+        project = template_copy / TEMPLATE_PATHS[0]
+        (project / "README.md").write_text("changed length")
+        (project / "NEW.md").write_text("new")
+        (project / "Makefile").unlink()
+
+        changed, removed = diff_snapshots(before, snapshot_template(template_copy))
+
+        assert changed == [f"{TEMPLATE_PATHS[0]}/NEW.md", f"{TEMPLATE_PATHS[0]}/README.md"]
+        assert removed == [f"{TEMPLATE_PATHS[0]}/Makefile"]
+
+    def test_unchanged_tree_has_no_differences(self, template_copy):
+        """Two snapshots of an untouched tree are equal."""
+        assert snapshot_template(template_copy) == snapshot_template(template_copy)
+
+
+class TestPostGenPath:
+    """Tests for post_gen_path function."""
+
+    @pytest.mark.parametrize(
+        ("output_path", "environment_manager", "expected"),
+        [
+            ("_pyproject.toml", "uv", "pyproject.toml"),
+            ("_pyproject.toml", "conda", None),
+            ("_environment.yml", "conda", "environment.yml"),
+            ("_data/raw/.gitkeep", "uv", "data/raw/.gitkeep"),
+            ("README.md", "uv", "README.md"),
+        ],
+    )
+    def test_follows_hook_renames_and_deletions(
+        self, template_copy, output_path, environment_manager, expected
+    ):
+        """The hook's renames and deletions are applied to a single path."""
+        context = load_context(template_copy, {"environment_manager": environment_manager})
+
+        assert post_gen_path(output_path, context, {}, template_copy) == expected
+
+    def test_caches_result_per_hook_variant(self, template_copy):
+        """A second lookup for the same path and variant does not rerun the hook."""
+        context = load_context(template_copy)
+        cache = {}
+        post_gen_path("_.env", context, cache, template_copy)
+        cache[next(iter(cache))] = "cached"
+
+        assert post_gen_path("_.env", context, cache, template_copy) == "cached"
+
+
+class TestRerenderTemplateFile:
+    """Tests for rerender_template_file and remove_template_file functions."""
+
+    def test_rerenders_edited_file(self, template_copy, watched):
+        """Editing a template file updates that file in the project."""
+        readme = template_copy / TEMPLATE_PATHS[0] / "README.md"
+        readme.write_text("# {{ cookiecutter.project_name }} edited\n")
+
+        affected = rerender_template_file("README.md", [watched], {}, template_copy)
+
+        assert affected == [watched]
+        assert (watched.project_path / "README.md").read_text() == "# Watch Me edited\n"
+
+    def test_unchanged_output_is_not_rewritten(self, template_copy, watched):
+        """A file whose rendered output is identical leaves the project untouched."""
+        affected = rerender_template_file("Makefile", [watched], {}, template_copy)
+
+        assert affected == []
+
+    def test_output_removed_by_hook_is_not_written(self, template_copy, watched):
+        """Files the hook deletes for a configuration are not recreated."""
+        pyproject = template_copy / TEMPLATE_PATHS[0] / "_pyproject.toml"
+        pyproject.write_text(pyproject.read_text() + "\n# edited\n")
+
+        affected = rerender_template_file("_pyproject.toml", [watched], {}, template_copy)
+
+        assert affected == []
+        assert not (watched.project_path / "pyproject.toml").exists()
+        assert not (watched.project_path / "_pyproject.toml").exists()
+
+    def test_renders_once_per_variant(self, template_copy, watch_project, render_calls):
+        """Projects agreeing on the file's variables share a single render."""
+        projects = [
+            watch_project("uv", project_name="Same Name", environment_manager="uv"),
+            watch_project("conda", project_name="Same Name", environment_manager="conda"),
+            watch_project("other", project_name="Other Name", environment_manager="uv"),
+        ]
+        notice = template_copy / TEMPLATE_PATHS[0] / "NOTICE.md"
+        notice.write_text("{{ cookiecutter.project_name }}\n")
+
+        affected = rerender_template_file("NOTICE.md", projects, {}, template_copy)
+
+        assert sorted(render_calls) == ["Other Name", "Same Name"]
+        assert sorted(p.config_name for p in affected) == ["conda", "other", "uv"]
+        assert [(p.project_path / "NOTICE.md").read_text() for p in projects] == [
+            "Same Name\n",
+            "Same Name\n",
+            "Other Name\n",
+        ]
+
+    def test_removes_output_of_deleted_file(self, template_copy, watched):
+        """Deleting a template file deletes its output after hook renames."""
+        (template_copy / TEMPLATE_PATHS[0] / "_environment.yml").unlink()
+
+        affected = remove_template_file("_environment.yml", [watched], {}, template_copy)
+
+        assert affected == [watched]
+        assert not (watched.project_path / "environment.yml").exists()
+
+
+class TestApplyTemplateChanges:
+    """Tests for apply_template_changes function."""
+
+    def test_hook_or_config_change_needs_full_regeneration(self):
+        """Changes outside the project template cannot be applied per file."""
+        assert apply_template_changes(["hooks/post_gen_project.py"], [], [], {}) is None
+        assert apply_template_changes([], ["cookiecutter.json"], [], {}) is None
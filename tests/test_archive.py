@@ -0,0 +1,142 @@
+"""Tests for writing generated projects straight into archives."""
+
+import io
+import json
+import tarfile
+import zipfile
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from nhse_rap_cookiecutter.archive import ArchiveFormat, archive_project, write_archive
+from nhse_rap_cookiecutter.cli import main
+from nhse_rap_cookiecutter.rendering import RenderedFile, render_project
+from nhse_rap_cookiecutter.update import ANSWERS_FILE
+
+REPO_ROOT = Path(__file__).parent.parent
+
+
+def read_tree(root):
+    """Return every file under root as relative path to bytes."""
+    return {
+        path.relative_to(root).as_posix(): path.read_bytes()
+        for path in root.rglob("*")
+        if path.is_file()
+    }
+
+
+def extract(archive_path, destination):
+    """Extract a tar.gz or zip archive into destination."""
+    if archive_path.suffix == ".zip":
+        with zipfile.ZipFile(archive_path) as zf:
+            zf.extractall(destination)
+    else:
+        with tarfile.open(archive_path) as tar:
+            tar.extractall(destination, filter="data")
+
+
+class TestWriteArchive:
+    """Tests for write_archive function."""
+
+    @pytest.fixture
+    def files(self, tmp_path):
+        """Return two rendered files, one of them executable."""
+        script = tmp_path / "run.sh"
+        script.write_text("#!/bin/sh\n")
+        script.chmod(0o755)
+        readme = tmp_path / "README.md"
+        readme.write_text("# Project\n")
+        readme.chmod(0o644)
+        return {
+            "README.md": RenderedFile("README.md", b"# Project\n", readme),
+            "bin/run.sh": RenderedFile("bin/run.sh", b"#!/bin/sh\n", script),
+        }
+
+    def test_tar_gz_keeps_content_and_modes(self, files):
+        """Members are stored under the root directory with the template file modes."""
+        buffer = io.BytesIO()
+
+        write_archive(files, "project", buffer, ArchiveFormat.TAR_GZ)
+
+        buffer.seek(0)
+        with tarfile.open(fileobj=buffer) as tar:
+            members = {member.name: member for member in tar.getmembers()}
+            assert tar.extractfile("project/bin/run.sh").read() == b"#!/bin/sh\n"
+        assert sorted(members) == ["project/README.md", "project/bin/run.sh"]
+        assert members["project/bin/run.sh"].mode == 0o755
+        assert members["project/README.md"].mode == 0o644
+
+    def test_zip_keeps_content_and_modes(self, files):
+        """Zip members record the template file modes as Unix attributes."""
+        buffer = io.BytesIO()
+
+        write_archive(files, "project", buffer, ArchiveFormat.ZIP)
+
+        with zipfile.ZipFile(buffer) as zf:
+            assert zf.read("project/README.md") == b"# Project\n"
+            assert zf.getinfo("project/bin/run.sh").external_attr >> 16 & 0o777 == 0o755
+
+
+class TestArchiveProject:
+    """Tests for archive_project function."""
+
+    @pytest.mark.parametrize("archive_format", list(ArchiveFormat))
+    def test_matches_project_rendered_to_disk(self, tmp_path, archive_format):
+        """Extracting the archive gives the tree cookiecutter writes, hook included."""
+        context = {"project_name": "Archived", "environment_manager": "conda"}
+
+        archive_path = archive_project(REPO_ROOT, tmp_path / "out", archive_format, context)
+        project_dir = render_project(REPO_ROOT, tmp_path / "disk", context)
+        extract(archive_path, tmp_path / "extracted")
+
+        assert archive_path.name == f"archived.{archive_format.value}"
+        assert list((tmp_path / "out").iterdir()) == [archive_path]
+        extracted = read_tree(tmp_path / "extracted" / "archived")
+        assert extracted == read_tree(project_dir)
+        assert "environment.yml" in extracted
+        assert "_pyproject.toml" not in extracted
+
+    def test_records_template_source(self, tmp_path):
+        """The archived answers file records the template and commit."""
+        archive_path = archive_project(
+            REPO_ROOT, tmp_path, ArchiveFormat.ZIP, source="gh:org/template", commit="abc123"
+        )
+
+        with zipfile.ZipFile(archive_path) as zf:
+            answers = json.loads(zf.read(f"project_name/{ANSWERS_FILE}"))
+        assert answers["_template"] == "gh:org/template"
+        assert answers["_commit"] == "abc123"
+
+    def test_refuses_to_overwrite(self, tmp_path):
+        """An existing archive is kept unless overwriting is requested."""
+        (tmp_path / "project_name.tar.gz").write_bytes(b"old")
+
+        with pytest.raises(FileExistsError):
+            archive_project(REPO_ROOT, tmp_path, ArchiveFormat.TAR_GZ)
+        assert (tmp_path / "project_name.tar.gz").read_bytes() == b"old"
+
+        archive_project(REPO_ROOT, tmp_path, ArchiveFormat.TAR_GZ, overwrite_if_exists=True)
+        assert tarfile.is_tarfile(tmp_path / "project_name.tar.gz")
+
+
+class TestCreateArchiveCommand:
+    """Tests for nhs-rap-template --archive."""
+
+    def test_writes_only_the_archive(self, tmp_path):
+        """The command writes the archive and prints its path, without a project directory."""
+        result = CliRunner().invoke(
+            main,
+            [str(REPO_ROOT), "--no-input", "--no-cache", "--archive", "zip", "-o", str(tmp_path)],
+        )
+
+        assert result.exit_code == 0, result.output
+        assert result.output.strip() == str(tmp_path / "project_name.zip")
+        assert [path.name for path in tmp_path.iterdir()] == ["project_name.zip"]
+
+    def test_rejects_unknown_format(self, tmp_path):
+        """Only tar.gz and zip are accepted."""
+        result = CliRunner().invoke(main, [str(REPO_ROOT), "--archive", "rar"])
+
+        assert result.exit_code == 2
+        assert "rar" in result.output
@@ -0,0 +1,151 @@
+"""Tests for the nhs-rap-template batch command."""
+
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from nhse_rap_cookiecutter.batch import ManifestError, generate_batch, load_manifest
+from nhse_rap_cookiecutter.cli import main
+from nhse_rap_cookiecutter.rendering import template_variables
+
+TEMPLATE_DIR = str(Path(__file__).parent.parent)
+
+
+class TestLoadManifest:
+    """Tests for load_manifest function."""
+
+    def test_applies_defaults_to_each_project(self, tmp_path):
+        """Project values override the shared defaults."""
+        manifest = tmp_path / "manifest.yaml"
+        manifest.write_text(
+            "checkout: main\n"
+            "defaults:\n  environment_manager: conda\n"
+            "projects:\n"
+            "  - project_name: Team A\n"
+            "  - project_name: Team B\n    environment_manager: uv\n"
+        )
+
+        loaded = load_manifest(manifest)
+
+        assert loaded.checkout == "main"
+        assert loaded.template is None
+        assert [p["environment_manager"] for p in loaded.projects] == ["conda", "uv"]
+
+    def test_accepts_plain_list(self, tmp_path):
+        """A manifest may be just a list of project contexts."""
+        manifest = tmp_path / "manifest.yaml"
+        manifest.write_text("- project_name: Team A\n")
+
+        assert load_manifest(manifest).projects == [{"project_name": "Team A"}]
+
+    @pytest.mark.parametrize(
+        "content",
+        ["projects: Team A\n", "- Team A\n", "projects: []\nextra: 1\n"],
+    )
+    def test_rejects_malformed_manifest(self, tmp_path, content):
+        """Manifests that are not lists of mappings are rejected."""
+        manifest = tmp_path / "manifest.yaml"
+        manifest.write_text(content)
+
+        with pytest.raises(ManifestError):
+            load_manifest(manifest)
+
+    def test_rejects_unknown_template_variable(self, tmp_path):
+        """A key that is not in cookiecutter.json is reported with its project."""
+        manifest = tmp_path / "manifest.yaml"
+        manifest.write_text(
+            "projects:\n  - project_name: Team A\n  - project_name: Team B\n    organization: X\n"
+        )
+
+        with pytest.raises(
+            ManifestError, match="Project 2: unknown template variable 'organization'"
+        ):
+            load_manifest(manifest, template_variables(TEMPLATE_DIR))
+
+    def test_rejects_private_template_setting(self, tmp_path):
+        """Template settings such as _copy_without_render cannot be overridden."""
+        manifest = tmp_path / "manifest.yaml"
+        manifest.write_text("defaults:\n  _copy_without_render: []\nprojects:\n  - {}\n")
+
+        with pytest.raises(ManifestError, match="Project 1: .*'_copy_without_render'"):
+            load_manifest(manifest, template_variables(TEMPLATE_DIR))
+
+
+class TestGenerateBatch:
+    """Tests for generate_batch function."""
+
+    def test_reports_each_project_in_manifest_order(self, tmp_path):
+        """A failing project does not stop the others and results keep their order."""
+        projects = [
+            {"project_name": "Team A"},
+            {"project_name": "Team B", "environment_manager": "not-a-manager"},
+            {"project_name": "Team C"},
+        ]
+
+        results = generate_batch(TEMPLATE_DIR, projects, tmp_path, jobs=2)
+
+        assert [r.name for r in results] == ["Team A", "Team B", "Team C"]
+        assert [r.error is None for r in results] == [True, False, True]
+        assert (tmp_path / "team_a" / "pyproject.toml").exists()
+
+
+class TestBatchCommand:
+    """Tests for the batch subcommand."""
+
+    def test_generates_all_projects(self, tmp_path):
+        """Every project in the manifest is generated and reported."""
+        manifest = tmp_path / "manifest.yaml"
+        manifest.write_text(
+            f"template: {TEMPLATE_DIR}\n"
+            "projects:\n  - project_name: Team A\n  - project_name: Team B\n"
+        )
+
+        result = CliRunner().invoke(main, ["batch", str(manifest), "-o", str(tmp_path)])
+
+        assert result.exit_code == 0, result.output
+        assert "2 succeeded, 0 failed" in result.output
+        assert (tmp_path / "team_a").is_dir()
+        assert (tmp_path / "team_b").is_dir()
+
+    def test_rejects_unknown_variable_before_generating(self, tmp_path):
+        """A manifest setting an unknown variable fails without generating anything."""
+        manifest = tmp_path / "manifest.yaml"
+        manifest.write_text("- project_name: Team A\n  organization: NHS England\n")
+
+        result = CliRunner().invoke(
+            main, ["batch", str(manifest), "-t", TEMPLATE_DIR, "-o", str(tmp_path)]
+        )
+
+        assert result.exit_code == 1
+        assert "unknown template variable 'organization'" in result.output
+        assert not (tmp_path / "team_a").exists()
+
+    def test_exits_with_error_when_a_project_fails(self, tmp_path):
+        """A project that already exists fails the batch."""
+        manifest = tmp_path / "manifest.yaml"
+        manifest.write_text("- project_name: Team A\n")
+        (tmp_path / "team_a").mkdir()
+
+        result = CliRunner().invoke(
+            main, ["batch", str(manifest), "-t", TEMPLATE_DIR, "-o", str(tmp_path)]
+        )
+
+        assert result.exit_code == 1
+        assert "0 succeeded, 1 failed" in result.output
+
+    def test_top_level_help_lists_subcommands(self):
+        """--help shows the default command's options and every subcommand."""
+        result = CliRunner().invoke(main, ["--help"])
+
+        assert result.exit_code == 0
+        assert "--checkout" in result.output
+        commands = result.output.split("Commands:")[1].split()
+        assert {"batch", "create", "serve", "update"} <= set(commands)
+
+    def test_default_command_still_creates_one_project(self, tmp_path):
+        """Without a subcommand the CLI generates a single project as before."""
+        result = CliRunner().invoke(main, [TEMPLATE_DIR, "--no-input", "-o", str(tmp_path)])
+
+        assert result.exit_code == 0, result.output
+        assert (tmp_path / "project_name").is_dir()
@@ -90,6 +90,7 @@ class TestCLIProjectGeneration:
             "pyproject.toml",
             "Makefile",
             ".gitignore",
+            ".nhs-rap-template.json",
             ".pre-commit-config.yaml",
             "LICENSE",
             "LICENSE-OGL",
@@ -189,6 +190,7 @@ class TestCLIModuleStructure:
             "config.py",
             "dataset.py",
             "features.py",
+            "logs.py",
             "plots.py",
         }
         actual_files = {f.name for f in module_path.iterdir() if f.is_file()}
@@ -0,0 +1,72 @@
+"""Tests that the nhs-rap-template CLI starts quickly.
+
+Each test runs the CLI in a new interpreter with ``python -X importtime`` and
+checks which modules were imported and how long importing the CLI took.
+"""
+
+import subprocess
+import sys
+
+import pytest
+
+# Modules only needed once a project is actually generated
+HEAVY_MODULES = ("cookiecutter", "jinja2", "yaml", "requests", "binaryornot")
+
+# Cumulative import time allowed for nhse_rap_cookiecutter.cli, in milliseconds.
+# It takes about 25ms with lazy imports and about 200ms without.
+IMPORT_BUDGET_MS = 100
+
+
+def run_cli(*args):
+    """Run the CLI with -X importtime and return its exit code and import times.
+
+    Returns
+    -------
+    tuple[int, dict[str, float]]
+        Exit code, and cumulative import time in milliseconds per module
+    """
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-X",
+            "importtime",
+            "-c",
+            "from nhse_rap_cookiecutter.cli import main; main()",
+            *args,
+        ],
+        capture_output=True,
+        text=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _self_us, cumulative_us, module = line.removeprefix("import time:").split("|")
+        times[module.strip()] = int(cumulative_us) / 1000
+    return result.returncode, times
+
+
+@pytest.mark.parametrize(
+    ("args", "exit_code"),
+    [
+        (["--help"], 0),
+        (["batch", "--help"], 0),
+        (["batch", "missing.yaml"], 2),
+        (["--offline", "--no-cache"], 2),
+    ],
+)
+def test_help_and_bad_arguments_skip_heavy_imports(args, exit_code):
+    """Help and argument errors never import cookiecutter or Jinja2."""
+    returncode, times = run_cli(*args)
+
+    assert returncode == exit_code
+    heavy = sorted(module for module in times if module.split(".")[0] in HEAVY_MODULES)
+    assert heavy == []
+
+
+def test_cli_import_is_within_budget():
+    """Importing the CLI module stays within the startup budget."""
+    # Take the best of three runs to keep a busy machine from failing the test
+    best = min(run_cli("--help")[1]["nhse_rap_cookiecutter.cli"] for _ in range(3))
+
+    assert best < IMPORT_BUDGET_MS
@@ -51,6 +51,7 @@ class TestCookiecutterProjectGeneration:
             "pyproject.toml",
             "Makefile",
             ".gitignore",
+            ".nhs-rap-template.json",
             ".pre-commit-config.yaml",
             "LICENSE",
             "LICENSE-OGL",
@@ -114,6 +115,7 @@ class TestCookiecutterModuleStructure:
             "config.py",
             "dataset.py",
             "features.py",
+            "logs.py",
             "plots.py",
         }
         actual_files = {f.name for f in module_path.iterdir() if f.is_file()}
@@ -2,6 +2,15 @@
 
 import pytest
 
+from nhse_rap_cookiecutter.rendering import hooks_in_process
+
+
+@pytest.fixture(autouse=True, params=["subprocess", "in-process"])
+def hook_mode(request):
+    """Run every test with the post-generation hook in a subprocess and in process."""
+    with hooks_in_process(request.param == "in-process"):
+        yield request.param
+
 
 class TestDependencyFileGeneration:
     """Test that correct dependency files are created based on environment manager."""
@@ -41,6 +50,26 @@ class TestDependencyFileGeneration:
         assert not (result.project_path / "pyproject.toml").exists()
 
 
+class TestDocsFiles:
+    """Test which documentation files are created."""
+
+    def test_docs_files_created_when_enabled(self, cookies):
+        """mkdocs.yml and the docs content are created when docs are enabled."""
+        result = cookies.bake(extra_context={"docs": "mkdocs"})
+
+        assert (result.project_path / "mkdocs.yml").is_file()
+        assert (result.project_path / "docs" / "content" / "index.md").is_file()
+
+    def test_docs_files_not_created_when_disabled(self, cookies):
+        """Only the empty docs directory is kept when docs are disabled."""
+        result = cookies.bake(extra_context={"docs": "none"})
+
+        assert not (result.project_path / "mkdocs.yml").exists()
+        assert not (result.project_path / "docs" / "content").exists()
+        assert not (result.project_path / "docs" / "README.md").exists()
+        assert (result.project_path / "docs" / ".gitkeep").is_file()
+
+
 class TestPyprojectTomlContent:
     """Test pyproject.toml content."""
 
@@ -56,11 +85,13 @@ class TestPyprojectTomlContent:
             "openpyxl",
             "pandas",
             "plotly",
+            "pyarrow",
             "requests",
             "scikit-learn",
             "scipy",
             "seaborn",
             "tqdm",
+            "typer",
         ],
     )
     def test_core_dependency_present(self, cookies, package):
@@ -143,6 +174,7 @@ class TestEnvironmentYmlContent:
             "jupyterlab",
             "notebook",
             "ipython",
+            "pyarrow",
             "pytest",
         ],
     )
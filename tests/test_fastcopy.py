@@ -0,0 +1,98 @@
+"""Tests for copying template assets with the fastest available mechanism."""
+
+import errno
+import os
+
+import pytest
+
+from nhse_rap_cookiecutter import fastcopy
+
+
+@pytest.fixture
+def source(tmp_path):
+    """Create a binary file larger than one read buffer."""
+    path = tmp_path / "logo.png"
+    path.write_bytes(os.urandom(300_000))
+    return path
+
+
+@pytest.fixture(autouse=True)
+def reset_unsupported():
+    """Forget mechanisms recorded as unsupported by other tests."""
+    fastcopy._unsupported.clear()
+    yield
+    fastcopy._unsupported.clear()
+
+
+@pytest.mark.parametrize("mechanism", fastcopy.MECHANISMS, ids=lambda m: m[0])
+def test_each_mechanism_copies_exact_content(source, tmp_path, monkeypatch, mechanism):
+    """Every mechanism either copies the file exactly or falls back to one that does."""
+    monkeypatch.setattr(fastcopy, "MECHANISMS", [mechanism])
+    target = tmp_path / "copy.png"
+
+    used = fastcopy.copy_file(source, target)
+
+    assert used in (mechanism[0], "copy")
+    assert target.read_bytes() == source.read_bytes()
+
+
+def test_falls_back_and_remembers_unsupported_mechanism(source, tmp_path, monkeypatch):
+    """A mechanism the filesystem rejects is skipped, and not retried for that device."""
+    calls = []
+
+    def unsupported(src_fd, dst_fd, size):
+        calls.append(size)
+        os.write(dst_fd, b"partial")
+        raise OSError(errno.EOPNOTSUPP, "not supported")
+
+    monkeypatch.setattr(fastcopy, "MECHANISMS", [("reflink", unsupported)])
+    first, second = tmp_path / "first.png", tmp_path / "second.png"
+
+    assert fastcopy.copy_file(source, first) == "copy"
+    assert fastcopy.copy_file(source, second) == "copy"
+    assert first.read_bytes() == source.read_bytes()
+    assert len(calls) == 1
+
+
+def test_real_errors_are_raised(source, tmp_path, monkeypatch):
+    """Errors other than "unsupported" are not hidden by the fallback."""
+
+    def full_disk(src_fd, dst_fd, size):
+        raise OSError(errno.ENOSPC, "no space left")
+
+    monkeypatch.setattr(fastcopy, "MECHANISMS", [("copy_file_range", full_disk)])
+
+    with pytest.raises(OSError, match="no space left"):
+        fastcopy.copy_file(source, tmp_path / "copy.png")
+
+
+@pytest.mark.parametrize("syscall", ["copy_file_range", "sendfile"])
+def test_short_copy_falls_back(source, tmp_path, monkeypatch, syscall):
+    """A mechanism that stops copying partway through is not reported as a success."""
+    if not hasattr(os, syscall):
+        pytest.skip(f"os.{syscall} is not available")
+    calls = []
+
+    def first_chunk_then_nothing(*args):
+        calls.append(args)
+        if len(calls) > 1:
+            return 0
+        # Copy only the first chunk of the file
+        if syscall == "sendfile":
+            dst_fd, src_fd, offset, count = args
+            return os.write(dst_fd, os.pread(src_fd, 1000, offset))
+        src_fd, dst_fd, count = args
+        return os.write(dst_fd, os.read(src_fd, 1000))
+
+    monkeypatch.setattr(fastcopy, "_CHUNK_SIZE", 1000)
+    monkeypatch.setattr(fastcopy.os, syscall, first_chunk_then_nothing)
+    monkeypatch.setattr(fastcopy, "MECHANISMS", [(syscall, getattr(fastcopy, f"_{syscall}"))])
+    target = tmp_path / "copy.png"
+
+    used = fastcopy.copy_file(source, target)
+
+    assert used == "copy"
+    assert len(calls) == 2
+    assert target.read_bytes() == source.read_bytes()
+    # A short copy is not a sign the mechanism is unsupported on this device
+    assert not fastcopy._unsupported
@@ -0,0 +1,72 @@
+"""Tests for the declarative file inclusion and rename rules."""
+
+import pytest
+
+from nhse_rap_cookiecutter.file_rules import is_included, renamed, rule_variables
+
+RULES = {
+    "include": {
+        "setup.cfg": {"linting_and_formatting": ["flake8+black+isort"]},
+        "docs/content": {"docs": ["mkdocs"]},
+    },
+    "rename": {"_data": "data", "_.env": ".env"},
+}
+
+
+def make_context(**values):
+    """Return a rendered context with the test rules and the given values."""
+    return {"cookiecutter": {"_file_rules": RULES, **values}}
+
+
+class TestIsIncluded:
+    """Tests for is_included function."""
+
+    @pytest.mark.parametrize(
+        ("relative", "docs", "expected"),
+        [
+            ("docs/content/index.md", "mkdocs", True),
+            ("docs/content/index.md", "none", False),
+            ("docs/content", "none", False),
+            ("docs/.gitkeep", "none", True),
+            ("docs/contents.md", "none", True),
+        ],
+    )
+    def test_directory_rules_cover_everything_below(self, relative, docs, expected):
+        """A directory rule covers the directory and its contents, not similarly named paths."""
+        assert is_included(relative, make_context(docs=docs)) is expected
+
+    def test_file_rule_checks_listed_values(self):
+        """A file is only included for the listed values of its variable."""
+        assert is_included("setup.cfg", make_context(linting_and_formatting="flake8+black+isort"))
+        assert not is_included("setup.cfg", make_context(linting_and_formatting="ruff"))
+
+    def test_everything_included_without_rules(self):
+        """A template without file rules includes every file."""
+        assert is_included("setup.cfg", {"cookiecutter": {"linting_and_formatting": "ruff"}})
+
+
+class TestRenamed:
+    """Tests for renamed function."""
+
+    @pytest.mark.parametrize(
+        ("relative", "expected"),
+        [
+            ("_data/raw/.gitkeep", "data/raw/.gitkeep"),
+            ("_.env", ".env"),
+            ("_database.md", "_database.md"),
+            ("README.md", "README.md"),
+        ],
+    )
+    def test_renames_leading_path(self, relative, expected):
+        """Renamed files and directories keep the rest of their path."""
+        assert renamed(relative, make_context()) == expected
+
+
+class TestRuleVariables:
+    """Tests for rule_variables function."""
+
+    def test_returns_all_or_per_path_variables(self):
+        """All tested variables, or only those deciding one path."""
+        assert rule_variables(RULES) == {"linting_and_formatting", "docs"}
+        assert rule_variables(RULES, "docs/content/index.md") == {"docs"}
+        assert rule_variables(RULES, "README.md") == set()
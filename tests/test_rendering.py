@@ -0,0 +1,291 @@
+"""Tests for in-process project rendering."""
+
+import os
+import shutil
+from pathlib import Path
+
+import cookiecutter.generate
+import cookiecutter.hooks
+import cookiecutter.main
+import pytest
+from cookiecutter.exceptions import FailedHookException
+from jinja2 import DictLoader, Environment
+
+from nhse_rap_cookiecutter import rendering
+
+
+@pytest.fixture
+def template_dir():
+    """Return the path to the template directory."""
+    return Path.cwd()
+
+
+class TestRenderProject:
+    """Tests for render_project function."""
+
+    def test_generates_project_with_extra_context(self, tmp_path, template_dir):
+        """Extra context values are applied to the rendered project."""
+        project_path = rendering.render_project(
+            template_dir, tmp_path, {"project_name": "My Render Test"}
+        )
+
+        assert project_path == tmp_path / "my_render_test"
+        assert (project_path / "my_render_test" / "__init__.py").is_file()
+        assert "# My Render Test" in (project_path / "README.md").read_text()
+
+    def test_runs_post_generation_hook(self, tmp_path, template_dir):
+        """Post-generation hook renames and removes files as usual."""
+        project_path = rendering.render_project(
+            template_dir, tmp_path, {"environment_manager": "conda"}
+        )
+
+        assert (project_path / "environment.yml").is_file()
+        assert (project_path / "data").is_dir()
+        assert not (project_path / "_pyproject.toml").exists()
+
+    def test_excluded_files_are_never_generated(self, tmp_path, template_dir):
+        """Files excluded by the file rules are skipped before cookiecutter renders them."""
+        template = tmp_path / "template"
+        shutil.copytree(
+            template_dir / "{{ cookiecutter.repo_name }}",
+            template / "{{ cookiecutter.repo_name }}",
+        )
+        shutil.copy(template_dir / "cookiecutter.json", template)
+
+        # No hook: anything excluded must never have been written
+        project_path = rendering.render_project(
+            template, tmp_path / "out", {"environment_manager": "conda", "docs": "none"}
+        )
+
+        assert (project_path / "_environment.yml").is_file()
+        assert not (project_path / "_pyproject.toml").exists()
+        assert not (project_path / "setup.cfg").exists()
+        assert not (project_path / "mkdocs.yml").exists()
+        assert not (project_path / "docs" / "content").exists()
+        assert (project_path / "docs" / ".gitkeep").is_file()
+
+    def test_repeated_renders_reuse_compiled_templates(self, tmp_path, template_dir, monkeypatch):
+        """A second render loads templates from the warm bytecode cache."""
+        rendering.render_project(template_dir, tmp_path / "first")
+        dumped = []
+        cache = rendering._BYTECODE_CACHE
+        original_dump = cache.dump_bytecode
+        monkeypatch.setattr(
+            cache, "dump_bytecode", lambda bucket: dumped.append(original_dump(bucket))
+        )
+
+        rendering.render_project(template_dir, tmp_path / "second")
+
+        assert cache._store
+        assert dumped == []
+
+
+class TestPersistentBytecodeCache:
+    """Tests for PersistentBytecodeCache class."""
+
+    @staticmethod
+    def environment(cache, source="{% if x %}yes{% endif %}"):
+        """Return an environment with one template, backed by the given cache."""
+        return Environment(loader=DictLoader({"t.txt": source}), bytecode_cache=cache)
+
+    def test_new_process_skips_compiling(self, tmp_path, monkeypatch):
+        """A fresh cache over the same directory loads the compiled template from disk."""
+        self.environment(rendering.PersistentBytecodeCache(tmp_path)).get_template("t.txt")
+        env = self.environment(rendering.PersistentBytecodeCache(tmp_path))
+        monkeypatch.setattr(env, "compile", lambda *args, **kwargs: pytest.fail("compiled"))
+
+        assert env.get_template("t.txt").render(x=True) == "yes"
+
+    def test_changed_source_gets_new_entry(self, tmp_path):
+        """Entries are keyed on template content, so edits never reuse stale bytecode."""
+        self.environment(rendering.PersistentBytecodeCache(tmp_path)).get_template("t.txt")
+        env = self.environment(rendering.PersistentBytecodeCache(tmp_path), "{{ x }}!")
+
+        assert env.get_template("t.txt").render(x=1) == "1!"
+        assert len(list(tmp_path.glob("*.cache"))) == 2
+
+    def test_can_be_disabled(self, tmp_path, monkeypatch):
+        """Setting the environment variable to 0 keeps bytecode in memory only."""
+        monkeypatch.setenv(rendering.BYTECODE_CACHE_ENV_VAR, "0")
+
+        self.environment(rendering.PersistentBytecodeCache(tmp_path)).get_template("t.txt")
+
+        assert list(tmp_path.iterdir()) == []
+
+
+class TestHooksInProcess:
+    """Tests for running hooks in the generating process."""
+
+    def test_same_files_as_subprocess_hook(self, tmp_path, template_dir):
+        """Running the hook in process leaves exactly the files the subprocess hook does."""
+        extra_context = {"environment_manager": "conda", "docs": "none"}
+        subprocess_dir = rendering.render_project(
+            template_dir, tmp_path / "subprocess", extra_context, in_process_hooks=False
+        )
+        in_process_dir = rendering.render_project(
+            template_dir, tmp_path / "in_process", extra_context, in_process_hooks=True
+        )
+
+        def tree(root):
+            return sorted(p.relative_to(root).as_posix() for p in root.rglob("*"))
+
+        assert tree(in_process_dir) == tree(subprocess_dir)
+
+    def test_enabled_by_environment_variable(self, monkeypatch):
+        """Hooks run in process when the environment variable is set."""
+        monkeypatch.setenv(rendering.IN_PROCESS_HOOKS_ENV_VAR, "1")
+
+        with rendering.hooks_in_process():
+            assert cookiecutter.hooks.run_script_with_context is rendering.run_script_in_process
+
+    def test_restores_script_runner_on_exit(self):
+        """Cookiecutter's script runner is only replaced inside the block."""
+        original = cookiecutter.hooks.run_script_with_context
+
+        with rendering.hooks_in_process(True):
+            assert cookiecutter.hooks.run_script_with_context is rendering.run_script_in_process
+        with rendering.hooks_in_process(False):
+            assert cookiecutter.hooks.run_script_with_context is original
+
+        assert cookiecutter.hooks.run_script_with_context is original
+
+    def test_renders_and_runs_script_in_working_directory(self, tmp_path):
+        """The script is rendered with the context and run from the given directory."""
+        script = tmp_path / "post_gen_project.py"
+        script.write_text(
+            'from pathlib import Path\nPath("out.txt").write_text("{{ cookiecutter.name }}")\n'
+        )
+        project = tmp_path / "project"
+        project.mkdir()
+
+        rendering.run_script_in_process(script, project, {"cookiecutter": {"name": "hello"}})
+
+        assert (project / "out.txt").read_text() == "hello"
+
+    @pytest.mark.parametrize("body", ["import sys\nsys.exit(3)\n", "raise ValueError('bad')\n"])
+    def test_failing_script_raises_failed_hook(self, tmp_path, body):
+        """A script that exits non-zero or raises fails like a subprocess hook."""
+        script = tmp_path / "post_gen_project.py"
+        script.write_text(body)
+
+        with pytest.raises(FailedHookException):
+            rendering.run_script_in_process(script, tmp_path, {"cookiecutter": {}})
+
+
+class TestWarmEnvironment:
+    """Tests for the shared Jinja environment."""
+
+    def test_same_settings_share_environment(self):
+        """Contexts with the same extensions and env vars share one environment."""
+        first = rendering.get_environment({"cookiecutter": {"project_name": "a"}})
+        second = rendering.get_environment({"cookiecutter": {"project_name": "b"}})
+
+        assert first is second
+
+    def test_different_env_vars_get_separate_environment(self):
+        """Different _jinja2_env_vars build a separate environment."""
+        default = rendering.get_environment({"cookiecutter": {}})
+        custom = rendering.get_environment(
+            {"cookiecutter": {"_jinja2_env_vars": {"lstrip_blocks": True}}}
+        )
+
+        assert default is not custom
+        assert custom.lstrip_blocks is True
+
+    def test_copies_and_detects_binaries_with_fast_paths(self):
+        """Cookiecutter's binary detection and file copies are replaced only inside the block."""
+        original_is_binary = cookiecutter.generate.is_binary
+
+        with rendering.warm_environment():
+            assert cookiecutter.generate.is_binary is rendering.is_binary_file
+            assert cookiecutter.generate.shutil.copyfile is rendering._FastShutil.copyfile
+            assert cookiecutter.generate.shutil.rmtree is shutil.rmtree
+
+        assert cookiecutter.generate.is_binary is original_is_binary
+        assert cookiecutter.generate.shutil is shutil
+
+    def test_applies_file_rules_only_inside_the_block(self):
+        """Cookiecutter's template walk and generate_files are wrapped only inside the block."""
+        original_generate_files = cookiecutter.main.generate_files
+
+        with rendering.warm_environment():
+            assert cookiecutter.generate.os.walk == rendering._RULE_FILTERED_OS.walk
+            assert cookiecutter.generate.os.path is os.path
+
+        assert cookiecutter.generate.os is os
+        assert cookiecutter.main.generate_files is original_generate_files
+
+    def test_restores_cookiecutter_factory_on_exit(self):
+        """The original environment factory is restored after the block."""
+        original = cookiecutter.generate.create_env_with_context
+
+        with rendering.warm_environment():
+            assert cookiecutter.generate.create_env_with_context is rendering.get_environment
+
+        assert cookiecutter.generate.create_env_with_context is original
+
+
+class TestRenderFile:
+    """Tests for rendering single template files in memory."""
+
+    def test_matches_generated_project(self, tmp_path, template_dir):
+        """Files rendered one at a time are byte-identical to a full render."""
+        extra_context = {"project_name": "Single File"}
+        project_path = rendering.render_project(template_dir, tmp_path, extra_context)
+        context = rendering.load_context(template_dir, extra_context)
+
+        for relative in ["README.md", "Makefile", "{{ cookiecutter.module_name }}/config.py"]:
+            rendered = rendering.render_file(template_dir, relative, context)
+
+            assert rendered.content == (project_path / rendered.path).read_bytes()
+
+    def test_renders_templated_output_path(self, template_dir):
+        """The output path is rendered from the template path."""
+        context = rendering.load_context(template_dir, {"project_name": "Path Test"})
+
+        assert (
+            rendering.render_path(
+                template_dir, "{{ cookiecutter.module_name }}/config.py", context
+            )
+            == "path_test/config.py"
+        )
+
+    def test_renders_every_project_file(self, template_dir):
+        """Every template file is rendered, keyed by its output path."""
+        context = rendering.load_context(template_dir, {"project_name": "All Files"})
+
+        files = rendering.render_project_files(template_dir, context)
+
+        assert "all_files/config.py" in files
+        assert "pyproject.toml" in files
+        assert "data/raw/.gitkeep" in files
+        assert "_environment.yml" not in files
+        assert "environment.yml" not in files
+        assert files["README.md"].content.startswith(b"# All Files")
+
+    def test_marks_binary_and_copy_only_files_verbatim(self, template_dir):
+        """Binary and _copy_without_render files are flagged for copying, not writing."""
+        context = rendering.load_context(template_dir)
+
+        files = rendering.render_project_files(template_dir, context)
+
+        assert files["docs/content/images/logo/nhs-logo.png"].verbatim
+        assert files["docs/content/overrides/main.html"].verbatim
+        assert not files["README.md"].verbatim
+
+
+class TestIsBinaryFile:
+    """Tests for is_binary_file function."""
+
+    def test_rechecks_file_only_after_it_changes(self, tmp_path, monkeypatch):
+        """The answer is reused until the file's size or mtime changes."""
+        path = tmp_path / "data.bin"
+        path.write_bytes(b"\x00\x01\x02")
+        assert rendering.is_binary_file(path)
+        monkeypatch.setattr(rendering, "is_binary", lambda p: pytest.fail("rechecked"))
+
+        assert rendering.is_binary_file(path)
+
+        monkeypatch.setattr(rendering, "is_binary", lambda p: False)
+        path.write_text("now text, and longer")
+        assert not rendering.is_binary_file(path)
@@ -0,0 +1,158 @@
+"""Tests for the local project generation service."""
+
+import http.client
+import io
+import json
+import socket
+import tarfile
+import threading
+from pathlib import Path
+
+import cookiecutter.hooks
+import pytest
+
+from nhse_rap_cookiecutter.rendering import render_project
+from nhse_rap_cookiecutter.server import is_loopback, make_server
+from nhse_rap_cookiecutter.update import ANSWERS_FILE
+
+TEMPLATE_DIR = Path(__file__).parent.parent
+
+
+@pytest.fixture(scope="module")
+def server():
+    """Run a generation server on a free loopback port for the tests in this module."""
+    server = make_server(TEMPLATE_DIR, "gh:example/template", "abc123", port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def request(server, method, path, body=None, content_type="application/json"):
+    """Send a request to the server and return the response status, headers and body."""
+    connection = http.client.HTTPConnection(*server.server_address, timeout=30)
+    headers = {"Content-Type": content_type} if body is not None else {}
+    connection.request(method, path, body=body, headers=headers)
+    response = connection.getresponse()
+    result = response.status, dict(response.getheaders()), response.read()
+    connection.close()
+    return result
+
+
+def test_health_reports_template(server):
+    """The health endpoint names the template and commit being served."""
+    status, _, body = request(server, "GET", "/health")
+
+    assert status == 200
+    assert json.loads(body) == {
+        "status": "ok",
+        "template": "gh:example/template",
+        "commit": "abc123",
+    }
+
+
+def test_generates_project_tarball(server):
+    """A JSON context is answered with the generated project as a tar.gz."""
+    status, headers, body = request(
+        server, "POST", "/generate", json.dumps({"project_name": "Served Project"})
+    )
+
+    assert status == 200
+    assert headers["X-Project-Name"] == "served_project"
+    with tarfile.open(fileobj=io.BytesIO(body), mode="r:gz") as tar:
+        names = tar.getnames()
+        answers = json.load(tar.extractfile(f"served_project/{ANSWERS_FILE}"))
+    assert "served_project/served_project/__init__.py" in names
+    assert answers["_commit"] == "abc123"
+
+
+def test_tarball_matches_project_rendered_to_disk(server, tmp_path, monkeypatch):
+    """The streamed project has the files cookiecutter writes, without a hook subprocess."""
+    context = {"project_name": "Served Project", "environment_manager": "conda"}
+    expected = render_project(TEMPLATE_DIR, tmp_path, context)
+
+    def no_subprocess(*args, **kwargs):
+        raise AssertionError("hook run in a subprocess")
+
+    monkeypatch.setattr(cookiecutter.hooks, "run_script", no_subprocess)
+    status, _, body = request(server, "POST", "/generate", json.dumps(context))
+
+    assert status == 200
+    with tarfile.open(fileobj=io.BytesIO(body), mode="r:gz") as tar:
+        names = {name.removeprefix("served_project/") for name in tar.getnames()}
+    assert names == {
+        path.relative_to(expected).as_posix() for path in expected.rglob("*") if path.is_file()
+    }
+
+
+@pytest.mark.parametrize(
+    ("body", "message"),
+    [
+        ("not json", "Invalid JSON"),
+        ("[]", "JSON object"),
+        ('{"environment_manager": "bad"}', "environment_manager"),
+        ('{"project_name": "x{{ cycler.__init__.__globals__.os.getpid() }}"}', "Jinja"),
+        ('{"description": "{% for x in range(9) %}{% endfor %}"}', "Jinja"),
+        ('{"description": "{# comment #}"}', "Jinja"),
+        ('{"_copy_without_render": []}', "Unknown template variable"),
+        ('{"_extensions": "x"}', "Unknown template variable"),
+        ('{"not_a_variable": "x"}', "Unknown template variable"),
+        ('{"author_name": ["x"]}', "must be a string"),
+        ('{"project_name": "../escape"}', "project_name"),
+        ('{"project_name": "a/b"}', "project_name"),
+        ('{"project_name": ".."}', "project_name"),
+        ('{"repo_name": "/tmp/elsewhere"}', "repo_name"),
+    ],
+)
+def test_rejects_invalid_context(server, body, message):
+    """Malformed bodies, unsafe values and invalid choices are reported as client errors."""
+    status, _, response = request(server, "POST", "/generate", body)
+
+    assert status == 400
+    assert message in json.loads(response)["error"]
+
+
+@pytest.mark.parametrize("content_type", ["text/plain", "application/x-www-form-urlencoded"])
+def test_requires_json_content_type(server, content_type):
+    """Bodies a browser could send cross-site without a preflight are refused."""
+    status, _, response = request(
+        server, "POST", "/generate", '{"project_name": "x"}', content_type
+    )
+
+    assert status == 415
+    assert "application/json" in json.loads(response)["error"]
+
+
+def test_refuses_non_loopback_host():
+    """Listening on an address other machines can reach must be asked for."""
+    with pytest.raises(ValueError, match="allow_remote"):
+        make_server(TEMPLATE_DIR, "template", host="0.0.0.0", port=0)
+
+
+@pytest.mark.parametrize(
+    ("host", "expected"),
+    [("127.0.0.1", True), ("::1", True), ("localhost", True), ("0.0.0.0", False), ("", False)],
+)
+def test_is_loopback(host, expected):
+    """Only loopback addresses count as local."""
+    assert is_loopback(host) is expected
+
+
+def test_serves_on_unix_socket(tmp_path):
+    """The service can listen on a Unix socket instead of a TCP port."""
+    socket_path = tmp_path / "generate.sock"
+    server = make_server(TEMPLATE_DIR, "template", unix_socket=socket_path)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        with socket.socket(socket.AF_UNIX) as client:
+            client.connect(str(socket_path))
+            client.sendall(b"GET /health HTTP/1.0\r\n\r\n")
+            response = b"".join(iter(lambda: client.recv(65536), b""))
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert response.startswith(b"HTTP/1.0 200")
+    assert not socket_path.exists()
@@ -0,0 +1,126 @@
+"""Tests for the local template cache used by the nhs-rap-template CLI."""
+
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from nhse_rap_cookiecutter.template_cache import (
+    TemplateCacheError,
+    cache_entry,
+    cached_template,
+    read_metadata,
+)
+
+
+def git(*args, cwd=None):
+    """Run git quietly in a directory and return its output."""
+    return subprocess.run(
+        ["git", "-c", "user.name=Test", "-c", "user.email=test@example.com", *args],
+        cwd=cwd,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout.strip()
+
+
+def commit_file(work, name, content):
+    """Commit a file in a working copy, push it and return the new commit."""
+    (work / name).write_text(content)
+    git("add", name, cwd=work)
+    git("commit", "--quiet", "-m", f"Update {name}", cwd=work)
+    git("push", "--quiet", "origin", "HEAD:main", cwd=work)
+    return git("rev-parse", "HEAD", cwd=work)
+
+
+@pytest.fixture
+def remote(tmp_path):
+    """Create a bare repository with one commit on main and a working copy.
+
+    Returns
+    -------
+    tuple[str, Path]
+        file:// URL of the bare repository, and a working copy pushing to it
+    """
+    bare = tmp_path / "template.git"
+    git("init", "--quiet", "--bare", "--initial-branch", "main", str(bare))
+    work = tmp_path / "work"
+    git("clone", "--quiet", str(bare), str(work))
+    git("checkout", "--quiet", "-b", "main", cwd=work)
+    commit_file(work, "cookiecutter.json", "{}")
+    return f"file://{bare}", work
+
+
+class TestCachedTemplate:
+    """Tests for cached_template function."""
+
+    def test_local_paths_are_not_cached(self, tmp_path):
+        """Local templates are passed through with their checkout."""
+        assert cached_template(str(tmp_path), "main", root=tmp_path) == (str(tmp_path), "main")
+
+    def test_clones_once_then_reuses_checkout(self, remote, tmp_path):
+        """An unchanged remote ref serves the cached checkout without cloning again."""
+        url, _work = remote
+        root = tmp_path / "cache"
+
+        template, checkout = cached_template(url, root=root)
+        marker = Path(template) / ".git" / "marker"
+        marker.write_text("kept")
+
+        assert cached_template(url, root=root) == (template, None)
+        assert checkout is None
+        assert marker.exists()
+
+    def test_refetches_when_ref_moves(self, remote, tmp_path):
+        """A new commit on the branch replaces the cached checkout."""
+        url, work = remote
+        root = tmp_path / "cache"
+        template, _ = cached_template(url, "main", root=root)
+
+        new_commit = commit_file(work, "README.md", "new")
+        cached_template(url, "main", root=root)
+
+        assert read_metadata(cache_entry(url, "main", root))["commit"] == new_commit
+        assert (Path(template) / "README.md").read_text() == "new"
+
+    def test_refs_are_cached_separately(self, remote, tmp_path):
+        """Each --checkout ref has its own cache entry."""
+        url, work = remote
+        first = git("rev-parse", "HEAD", cwd=work)
+        commit_file(work, "README.md", "new")
+
+        pinned, _ = cached_template(url, first, root=tmp_path)
+        latest, _ = cached_template(url, "main", root=tmp_path)
+
+        assert pinned != latest
+        assert not (Path(pinned) / "README.md").exists()
+
+    def test_offline_uses_cache_even_if_remote_is_gone(self, remote, tmp_path):
+        """Offline mode never contacts the remote."""
+        url, _work = remote
+        template, _ = cached_template(url, root=tmp_path / "cache")
+        subprocess.run(["rm", "-rf", url.removeprefix("file://")], check=True)
+
+        assert cached_template(url, offline=True, root=tmp_path / "cache") == (template, None)
+
+    def test_offline_without_cache_fails(self, remote, tmp_path):
+        """Offline mode cannot fetch a template that was never cached."""
+        url, _work = remote
+
+        with pytest.raises(TemplateCacheError, match="not cached"):
+            cached_template(url, offline=True, root=tmp_path)
+
+    def test_unreachable_remote_falls_back_to_cache(self, remote, tmp_path):
+        """A cached checkout is used when the remote cannot be reached."""
+        url, _work = remote
+        template, _ = cached_template(url, root=tmp_path / "cache")
+        subprocess.run(["rm", "-rf", url.removeprefix("file://")], check=True)
+
+        assert cached_template(url, root=tmp_path / "cache") == (template, None)
+
+    def test_missing_ref_raises(self, remote, tmp_path):
+        """A branch that does not exist is reported as a cache error."""
+        url, _work = remote
+
+        with pytest.raises(TemplateCacheError, match="no-such-branch"):
+            cached_template(url, "no-such-branch", root=tmp_path)
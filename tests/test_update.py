@@ -0,0 +1,197 @@
+"""Tests for updating a generated project to a newer template version."""
+
+import json
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from nhse_rap_cookiecutter.cli import main
+from nhse_rap_cookiecutter.update import ANSWERS_FILE, apply_update, merge_file
+
+REPO_ROOT = Path(__file__).parent.parent
+
+
+class TestMergeFile:
+    """Tests for merge_file function."""
+
+    def test_combines_separate_edits(self):
+        """Edits to different lines by the user and the template are both kept."""
+        base = b"one\ntwo\nthree\n"
+
+        merged, conflict = merge_file(b"ONE\ntwo\nthree\n", base, b"one\ntwo\nTHREE\n")
+
+        assert merged == b"ONE\ntwo\nTHREE\n"
+        assert not conflict
+
+    def test_marks_overlapping_edits(self):
+        """Edits to the same line leave conflict markers."""
+        merged, conflict = merge_file(b"mine\n", b"base\n", b"theirs\n")
+
+        assert conflict
+        assert b"<<<<<<< yours" in merged
+        assert b">>>>>>> new template" in merged
+
+
+class TestApplyUpdate:
+    """Tests for apply_update function."""
+
+    @pytest.fixture
+    def project(self, tmp_path):
+        """Create a project with untouched, edited and deleted files."""
+        (tmp_path / "untouched.txt").write_text("old\n")
+        (tmp_path / "edited.txt").write_text("local\nold\n")
+        (tmp_path / "obsolete.txt").write_text("old\n")
+        (tmp_path / "obsolete_edited.txt").write_text("local\n")
+        return tmp_path
+
+    @pytest.fixture
+    def renders(self):
+        """Return the old and new template renders of the project."""
+        base = {
+            "untouched.txt": b"old\n",
+            "edited.txt": b"old\n",
+            "obsolete.txt": b"old\n",
+            "obsolete_edited.txt": b"old\n",
+            "deleted_by_user.txt": b"old\n",
+            "same.txt": b"same\n",
+        }
+        new = {
+            "untouched.txt": b"new\n",
+            "edited.txt": b"new\n",
+            "deleted_by_user.txt": b"new\n",
+            "same.txt": b"same\n",
+            "docs/added.txt": b"added\n",
+        }
+        return base, new
+
+    def test_applies_only_template_changes(self, project, renders):
+        """Changed files are replaced or merged, and local edits are preserved."""
+        report = apply_update(project, *renders)
+
+        assert report.updated == ["untouched.txt"]
+        assert report.added == ["docs/added.txt"]
+        assert report.removed == ["obsolete.txt"]
+        assert report.conflicts == ["edited.txt", "obsolete_edited.txt"]
+        assert (project / "untouched.txt").read_text() == "new\n"
+        assert not (project / "obsolete.txt").exists()
+        assert (project / "obsolete_edited.txt").read_text() == "local\n"
+        assert not (project / "deleted_by_user.txt").exists()
+        assert not (project / "same.txt").exists()
+
+    def test_added_file_keeps_template_mode(self, project, renders):
+        """A file the new template adds gets the permission bits it was rendered with."""
+        base, new = renders
+        new["scripts/run.sh"] = b"#!/bin/sh\n"
+
+        apply_update(project, base, new, new_modes={"scripts/run.sh": 0o755})
+
+        assert (project / "scripts" / "run.sh").stat().st_mode & 0o777 == 0o755
+
+    def test_dry_run_changes_nothing(self, project, renders):
+        """A dry run reports the same changes without writing them."""
+        report = apply_update(project, *renders, dry_run=True)
+
+        assert report.updated == ["untouched.txt"]
+        assert (project / "untouched.txt").read_text() == "old\n"
+        assert (project / "obsolete.txt").exists()
+        assert not (project / "docs").exists()
+
+
+def git(*args, cwd):
+    """Run git in a directory with a fixed identity."""
+    subprocess.run(
+        ["git", "-c", "user.name=Test", "-c", "user.email=test@example.com", *args],
+        cwd=cwd,
+        check=True,
+        capture_output=True,
+    )
+
+
+def make_template_repo(path):
+    """Copy the template into a new git repository with one commit."""
+    path.mkdir()
+    for name in ("cookiecutter.json", "hooks", "{{ cookiecutter.repo_name }}"):
+        source = REPO_ROOT / name
+        if source.is_dir():
+            shutil.copytree(source, path / name)
+        else:
+            shutil.copy2(source, path / name)
+    git("init", "--quiet", "--initial-branch", "main", cwd=path)
+    git("add", "--all", cwd=path)
+    git("commit", "--quiet", "-m", "v1", cwd=path)
+    return path
+
+
+class TestUpdateCommand:
+    """Tests for the update subcommand."""
+
+    def test_updates_project_to_new_template_commit(self, tmp_path, monkeypatch):
+        """Template changes are merged into a project that has local edits."""
+        monkeypatch.setenv("NHS_RAP_TEMPLATE_CACHE", str(tmp_path / "cache"))
+        template = make_template_repo(tmp_path / "template")
+
+        runner = CliRunner()
+        result = runner.invoke(main, [str(template), "--no-input", "-o", str(tmp_path / "out")])
+        assert result.exit_code == 0, result.output
+        project = tmp_path / "out" / "project_name"
+
+        makefile = template / "{{ cookiecutter.repo_name }}" / "Makefile"
+        makefile.write_text("# Template header\n" + makefile.read_text())
+        script = template / "{{ cookiecutter.repo_name }}" / "check.sh"
+        script.write_text("#!/bin/sh\n")
+        script.chmod(0o755)
+        git("add", "--all", cwd=template)
+        git("commit", "--quiet", "-m", "v2", cwd=template)
+        (project / "Makefile").write_text((project / "Makefile").read_text() + "local:\n")
+
+        result = runner.invoke(main, ["update", str(project)])
+
+        assert result.exit_code == 0, result.output
+        assert "updated  Makefile" in result.output
+        assert "added    check.sh" in result.output
+        assert (project / "check.sh").stat().st_mode & 0o777 == 0o755
+        content = (project / "Makefile").read_text()
+        assert content.startswith("# Template header\n")
+        assert content.endswith("local:\n")
+        answers = json.loads((project / ANSWERS_FILE).read_text())
+        assert answers["_template"] == str(template)
+        assert "Already up to date" in runner.invoke(main, ["update", str(project)]).output
+
+    def test_expands_abbreviations_from_user_config(self, tmp_path, monkeypatch):
+        """A project created from a custom abbreviation can be updated."""
+        monkeypatch.setenv("NHS_RAP_TEMPLATE_CACHE", str(tmp_path / "cache"))
+        make_template_repo(tmp_path / "template")
+        config_file = tmp_path / "config.yaml"
+        config_file.write_text(f'abbreviations:\n  local: "{tmp_path.as_uri()}/{{0}}"\n')
+
+        runner = CliRunner()
+        result = runner.invoke(
+            main,
+            [
+                "local:template",
+                "--no-input",
+                "--config-file",
+                str(config_file),
+                "-o",
+                str(tmp_path / "out"),
+            ],
+        )
+        assert result.exit_code == 0, result.output
+
+        result = runner.invoke(
+            main,
+            ["update", str(tmp_path / "out" / "project_name"), "--config-file", str(config_file)],
+        )
+
+        assert result.exit_code == 0, result.output
+        assert "Already up to date" in result.output
+
+    def test_project_without_answers_cannot_be_updated(self, tmp_path):
+        """Projects that do not record their answers are rejected."""
+        result = CliRunner().invoke(main, ["update", str(tmp_path)])
+
+        assert result.exit_code == 1
+        assert ANSWERS_FILE in result.output
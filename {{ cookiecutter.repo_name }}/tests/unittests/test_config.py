@@ -0,0 +1,113 @@
+"""Tests for the project settings in config.py."""
+
+import dataclasses
+from pathlib import Path
+import subprocess
+import sys
+
+import pytest
+
+from {{ cookiecutter.module_name }} import config
+
+PROJ_ROOT = Path(__file__).resolve().parents[2]
+
+# Cumulative import time allowed for the package and its config module
+IMPORT_BUDGET_MS = 50
+
+# Modules that must only be imported when they are actually used
+LAZY_MODULES = {"dotenv", "loguru", "tqdm"}
+
+
+@pytest.fixture(autouse=True)
+def fresh_settings(monkeypatch):
+    """Read the settings afresh from a clean environment in each test."""
+    for name in config._NAMES:
+        monkeypatch.delenv(name, raising=False)
+    monkeypatch.setattr(config, "_load_dotenv", lambda proj_root: None)
+    config.get_settings.cache_clear()
+    yield
+    config.get_settings.cache_clear()
+
+
+class TestSettings:
+    """Tests for the lazily resolved project directories."""
+
+    def test_default_directories_are_under_project_root(self):
+        """Without overrides every directory sits in the standard project layout."""
+        settings = config.get_settings()
+
+        assert settings.proj_root == PROJ_ROOT
+        assert settings.raw_data_dir == PROJ_ROOT / "data" / "raw"
+        assert settings.figures_dir == PROJ_ROOT / "reports" / "figures"
+
+    def test_module_constants_come_from_settings(self):
+        """The module-level constants are the cached settings values."""
+        assert config.PROCESSED_DATA_DIR == config.get_settings().processed_data_dir
+
+    def test_environment_variable_overrides_directory(self, monkeypatch, tmp_path):
+        """A directory's environment variable replaces its default."""
+        monkeypatch.setenv("RAW_DATA_DIR", str(tmp_path))
+
+        assert config.RAW_DATA_DIR == tmp_path
+
+    def test_data_dir_override_moves_data_subdirectories(self, monkeypatch, tmp_path):
+        """Data subdirectories follow an overridden DATA_DIR."""
+        monkeypatch.setenv("DATA_DIR", str(tmp_path))
+
+        assert config.INTERIM_DATA_DIR == tmp_path / "interim"
+
+    def test_relative_override_is_taken_from_project_root(self, monkeypatch):
+        """A relative override is resolved against the project root, not the working directory."""
+        monkeypatch.setenv("MODELS_DIR", "artifacts/models")
+
+        assert config.MODELS_DIR == PROJ_ROOT / "artifacts" / "models"
+
+    def test_environment_is_read_once(self, monkeypatch, tmp_path):
+        """Later changes to the environment do not affect the cached settings."""
+        first = config.REPORTS_DIR
+        monkeypatch.setenv("REPORTS_DIR", str(tmp_path))
+
+        assert config.REPORTS_DIR == first
+
+    def test_settings_are_frozen(self):
+        """Settings cannot be changed after they are resolved."""
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            config.get_settings().data_dir = Path("elsewhere")
+
+    def test_unknown_attribute_raises(self):
+        """Names that are not settings still raise AttributeError."""
+        with pytest.raises(AttributeError):
+            config.NOT_A_SETTING
+
+
+class TestImportTime:
+    """Tests that importing the package stays cheap."""
+
+    @pytest.mark.parametrize(
+        "module", ["{{ cookiecutter.module_name }}", "{{ cookiecutter.module_name }}.config"]
+    )
+    def test_import_within_budget(self, module):
+        """Importing reads no files and pulls in none of the logging or .env packages."""
+        result = subprocess.run(
+            [
+                sys.executable,
+                "-X",
+                "importtime",
+                "-c",
+                f"import sys, {module}; print(','.join(sorted(sys.modules)))",
+            ],
+            cwd=PROJ_ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        # Lines are "import time: <self us> | <cumulative us> | <module>"
+        cumulative_us = sum(
+            int(line.split("|")[1])
+            for line in result.stderr.splitlines()
+            if line.startswith("import time:")
+            and line.split("|")[2].strip().startswith("{{ cookiecutter.module_name }}")
+        )
+
+        assert LAZY_MODULES.isdisjoint(result.stdout.strip().split(","))
+        assert cumulative_us / 1000 < IMPORT_BUDGET_MS
@@ -0,0 +1,99 @@
+"""Tests for the chunked CSV to Parquet conversion in dataset.py."""
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from {{ cookiecutter.module_name }}.dataset import csv_to_parquet
+
+# Smallest chunk size, so a small test file still spans several chunks
+CHUNK_SIZE_MB = 1
+ROWS = 100_000
+
+
+@pytest.fixture
+def csv_path(tmp_path):
+    """Write a CSV file several megabytes long."""
+    path = tmp_path / "dataset.csv"
+    lines = ["id,value,label"] + [f"{i},{i / 2},row-{i:08d}" for i in range(ROWS)]
+    path.write_text("\n".join(lines) + "\n")
+    return path
+
+
+class TestCsvToParquet:
+    """Tests for csv_to_parquet."""
+
+    def test_writes_every_row(self, csv_path, tmp_path):
+        """All rows of the CSV end up in the Parquet file, in order."""
+        output_path = tmp_path / "processed" / "dataset.parquet"
+
+        rows = csv_to_parquet(csv_path, output_path, CHUNK_SIZE_MB)
+
+        table = pq.read_table(output_path)
+        assert rows == ROWS
+        assert table.num_rows == ROWS
+        assert table.column("id")[-1].as_py() == ROWS - 1
+
+    def test_writes_one_row_group_per_chunk(self, csv_path, tmp_path):
+        """Each chunk read from the CSV is written as its own row group."""
+        output_path = tmp_path / "dataset.parquet"
+
+        csv_to_parquet(csv_path, output_path, CHUNK_SIZE_MB)
+
+        assert pq.ParquetFile(output_path).num_row_groups > 1
+
+    def test_pins_schema_from_first_chunk(self, csv_path, tmp_path):
+        """Column types inferred from the first chunk apply to the whole file."""
+        output_path = tmp_path / "dataset.parquet"
+
+        csv_to_parquet(csv_path, output_path, CHUNK_SIZE_MB)
+
+        schema = pq.read_schema(output_path)
+        assert schema.field("id").type == pa.int64()
+        assert schema.field("value").type == pa.float64()
+        assert schema.field("label").type == pa.string()
+
+    def test_header_only_file_raises(self, tmp_path):
+        """A CSV file without data rows is an error."""
+        csv_path = tmp_path / "empty.csv"
+        csv_path.write_text("id,value,label\n")
+
+        with pytest.raises(ValueError):
+            csv_to_parquet(csv_path, tmp_path / "dataset.parquet")
+
+    def test_value_not_matching_schema_raises(self, csv_path, tmp_path):
+        """A later value that does not fit the pinned type is an error, not a new type."""
+        with csv_path.open("a") as f:
+            f.write("not-a-number,0.5,last\n")
+
+        with pytest.raises(pa.ArrowInvalid):
+            csv_to_parquet(csv_path, tmp_path / "dataset.parquet", CHUNK_SIZE_MB)
+
+    def test_failed_conversion_leaves_no_output(self, csv_path, tmp_path):
+        """A failed conversion keeps the previous output and leaves no partial file."""
+        output_path = tmp_path / "dataset.parquet"
+        csv_to_parquet(csv_path, output_path, CHUNK_SIZE_MB)
+        with csv_path.open("a") as f:
+            f.write("not-a-number,0.5,last\n")
+
+        with pytest.raises(pa.ArrowInvalid):
+            csv_to_parquet(csv_path, output_path, CHUNK_SIZE_MB)
+
+        assert pq.read_table(output_path).num_rows == ROWS
+        assert sorted(path.name for path in tmp_path.iterdir()) == ["dataset.csv", "dataset.parquet"]
+
+    def test_column_blank_in_first_chunk_is_read_as_string(self, tmp_path):
+        """A sparse column with no values in the first chunk does not reject later values."""
+        csv_path = tmp_path / "sparse.csv"
+        # Enough blank rows to fill the whole first chunk
+        blank_rows = 3 * ROWS
+        lines = ["id,diagnosis"] + [f"{i}," for i in range(blank_rows)] + [f"{blank_rows},A01"]
+        csv_path.write_text("\n".join(lines) + "\n")
+        output_path = tmp_path / "sparse.parquet"
+
+        rows = csv_to_parquet(csv_path, output_path, CHUNK_SIZE_MB)
+
+        table = pq.read_table(output_path)
+        assert rows == blank_rows + 1
+        assert table.schema.field("diagnosis").type == pa.string()
+        assert table.column("diagnosis")[-1].as_py() == "A01"
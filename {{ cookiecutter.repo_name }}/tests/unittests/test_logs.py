@@ -0,0 +1,92 @@
+"""Tests for the logging pipeline in logs.py."""
+
+import json
+import sys
+
+from loguru import logger
+import pytest
+
+from {{ cookiecutter.module_name }} import config, logs
+
+
+def log_rows(start: int, stop: int) -> None:
+    """Log one message per row, all from the same call site."""
+    for i in range(start, stop):
+        logger.info("row {}", i)
+
+
+@pytest.fixture
+def messages():
+    """Collect the records a rate-limited sink receives."""
+    received = []
+    handler_id = logger.add(
+        lambda message: received.append(message.record),
+        filter=logs.RateLimit(burst=3, interval=60),
+        format="{message}",
+    )
+    yield received
+    logger.remove(handler_id)
+
+
+@pytest.fixture
+def restore_logger():
+    """Put loguru's default handler back after a test reconfigures logging."""
+    yield
+    logger.remove()
+    logger.add(sys.stderr)
+
+
+class TestRateLimit:
+    """Tests for the per-call-site rate limit."""
+
+    def test_drops_messages_over_burst(self, messages):
+        """Only the first messages from a call site in an interval get through."""
+        log_rows(0, 10)
+
+        assert [record["message"] for record in messages] == ["row 0", "row 1", "row 2"]
+
+    def test_call_sites_are_limited_separately(self, messages):
+        """A busy call site does not use up another call site's allowance."""
+        log_rows(0, 10)
+        logger.info("quiet")
+
+        assert messages[-1]["message"] == "quiet"
+
+    def test_reports_suppressed_count_in_next_interval(self):
+        """The first message after an interval carries the number dropped."""
+        limit = logs.RateLimit(burst=3, interval=60)
+        records = []
+        handler_id = logger.add(lambda message: records.append(message.record), filter=limit)
+        log_rows(0, 10)
+        limit.interval = 0
+        log_rows(10, 11)
+        logger.remove(handler_id)
+
+        assert records[-1]["message"] == "row 10"
+        assert records[-1]["extra"]["suppressed"] == 7
+
+    def test_never_drops_warnings(self, messages):
+        """Warnings and errors always get through."""
+        for i in range(10):
+            logger.warning("warning {}", i)
+
+        assert len(messages) == 10
+
+
+class TestConfigureLogging:
+    """Tests for the project's logging pipeline."""
+
+    def test_writes_json_lines_under_reports(self, monkeypatch, tmp_path, restore_logger):
+        """With JSON logs on, each message is appended to reports/logs/pipeline.jsonl."""
+        monkeypatch.setenv("REPORTS_DIR", str(tmp_path))
+        monkeypatch.setattr(config, "_load_dotenv", lambda proj_root: None)
+        config.get_settings.cache_clear()
+
+        logs.configure_logging(json_logs=True)
+        logger.info("hello")
+        logger.complete()
+        logger.remove()
+        config.get_settings.cache_clear()
+
+        lines = (tmp_path / "logs" / "pipeline.jsonl").read_text().splitlines()
+        assert json.loads(lines[-1])["record"]["message"] == "hello"
@@ -1 +1,10 @@
-from {{ cookiecutter.module_name }} import config  # noqa: F401
+import importlib
+
+# Imported on first access, so `import {{ cookiecutter.module_name }}` stays cheap
+_LAZY_SUBMODULES = {"config"}
+
+
+def __getattr__(name: str):
+    if name in _LAZY_SUBMODULES:
+        return importlib.import_module(f"{__name__}.{name}")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -3,7 +3,13 @@
 This module provides project-wide configuration including:
 - Directory paths for data, models, and reports
 - Environment variable loading from .env files
-- Logger configuration with tqdm integration
+
+Nothing is read when this module is imported. The directories are resolved on
+first use and cached, so importing the package stays cheap. Each directory can
+be overridden with an environment variable of the same name, set in the shell
+or in the project's .env file (relative paths are taken from PROJ_ROOT):
+
+    RAW_DATA_DIR=/mnt/shared/raw
 
 Attributes:
     PROJ_ROOT: Root directory of the project.
@@ -17,35 +23,94 @@ Attributes:
     FIGURES_DIR: Directory for generated figures and plots.
 """
 
+from dataclasses import dataclass, fields
+from functools import cache
+import os
 from pathlib import Path
 
-from dotenv import load_dotenv
-from loguru import logger
 
-# Load environment variables from .env file if it exists
-load_dotenv()
+@dataclass(frozen=True)
+class Settings:
+    """Project directories, resolved once from the environment.
+
+    Attributes:
+        proj_root: Root directory of the project.
+        data_dir: Base directory for all data storage.
+        raw_data_dir: Directory for original, immutable data.
+        interim_data_dir: Directory for intermediate transformed data.
+        processed_data_dir: Directory for final, canonical datasets.
+        external_data_dir: Directory for data from third-party sources.
+        models_dir: Directory for trained model files.
+        reports_dir: Directory for generated reports.
+        figures_dir: Directory for generated figures and plots.
+    """
+
+    proj_root: Path
+    data_dir: Path
+    raw_data_dir: Path
+    interim_data_dir: Path
+    processed_data_dir: Path
+    external_data_dir: Path
+    models_dir: Path
+    reports_dir: Path
+    figures_dir: Path
+
+
+# Module attribute (and environment variable) name for each setting
+_NAMES = {field.name.upper(): field.name for field in fields(Settings)}
+
+
+def _load_dotenv(proj_root: Path) -> None:
+    """Load the project's .env file into the environment, if python-dotenv is installed."""
+    try:
+        from dotenv import load_dotenv
+    except ModuleNotFoundError:
+        return
+    load_dotenv(proj_root / ".env")
+
+
+def _directory(name: str, default: Path, proj_root: Path) -> Path:
+    """Return a directory from its environment variable, or the default if unset."""
+    value = os.environ.get(name)
+    if not value:
+        return default
+    path = Path(value).expanduser()
+    return path if path.is_absolute() else proj_root / path
+
+
+@cache
+def get_settings() -> Settings:
+    """Return the project settings, reading .env and the environment on first call.
 
-# Paths
-PROJ_ROOT = Path(__file__).resolve().parents[1]
-logger.info(f"PROJ_ROOT path is: {PROJ_ROOT}")
+    Returns:
+        The cached settings. Call ``get_settings.cache_clear()`` to read the
+        environment again.
+    """
+    proj_root = Path(__file__).resolve().parents[1]
+    _load_dotenv(proj_root)
 
-DATA_DIR = PROJ_ROOT / "data"
-RAW_DATA_DIR = DATA_DIR / "raw"
-INTERIM_DATA_DIR = DATA_DIR / "interim"
-PROCESSED_DATA_DIR = DATA_DIR / "processed"
-EXTERNAL_DATA_DIR = DATA_DIR / "external"
+    data_dir = _directory("DATA_DIR", proj_root / "data", proj_root)
+    reports_dir = _directory("REPORTS_DIR", proj_root / "reports", proj_root)
+    return Settings(
+        proj_root=proj_root,
+        data_dir=data_dir,
+        raw_data_dir=_directory("RAW_DATA_DIR", data_dir / "raw", proj_root),
+        interim_data_dir=_directory("INTERIM_DATA_DIR", data_dir / "interim", proj_root),
+        processed_data_dir=_directory("PROCESSED_DATA_DIR", data_dir / "processed", proj_root),
+        external_data_dir=_directory("EXTERNAL_DATA_DIR", data_dir / "external", proj_root),
+        models_dir=_directory("MODELS_DIR", proj_root / "models", proj_root),
+        reports_dir=reports_dir,
+        figures_dir=_directory("FIGURES_DIR", reports_dir / "figures", proj_root),
+    )
 
-MODELS_DIR = PROJ_ROOT / "models"
 
-REPORTS_DIR = PROJ_ROOT / "reports"
-FIGURES_DIR = REPORTS_DIR / "figures"
+def __getattr__(name: str) -> Path:
+    """Resolve the directory constants (e.g. ``RAW_DATA_DIR``) from the settings."""
+    if name in _NAMES:
+        return getattr(get_settings(), _NAMES[name])
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-# If tqdm is installed, configure loguru with tqdm.write
-# https://github.com/Delgan/loguru/issues/135
-try:
-    from tqdm import tqdm
 
-    logger.remove(0)
-    logger.add(lambda msg: tqdm.write(msg, end=""), colorize=True)
-except ModuleNotFoundError:
-    pass
+def __dir__() -> list[str]:
+    """List the directory constants alongside the module's functions."""
+    return sorted([*globals(), *_NAMES])
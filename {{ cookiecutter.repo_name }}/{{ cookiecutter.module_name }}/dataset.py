@@ -2,40 +2,146 @@
 
 This module handles data loading, cleaning, and preprocessing tasks.
 Use this as a starting point for your data pipeline.
+
+The raw CSV is read in chunks of a fixed size and written to Parquet one row
+group per chunk, so memory use stays flat however large the file is. Column
+types are inferred from the first chunk and kept for the rest of the file.
 """
 
+from collections.abc import Iterator
+import io
+import os
 from pathlib import Path
 
 from loguru import logger
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
 from tqdm import tqdm
 import typer
 
 from {{ cookiecutter.module_name }}.config import PROCESSED_DATA_DIR, RAW_DATA_DIR
+from {{ cookiecutter.module_name }}.logs import configure_logging
 
 app = typer.Typer()
 
+# Size of each chunk read from the CSV, and so of each Parquet row group
+CHUNK_SIZE_MB = 64
+
+
+def _widen_null_columns(schema: pa.Schema) -> pa.Schema:
+    """Return the schema with all-blank (null) columns typed as strings.
+
+    Sparse columns can be blank for a whole chunk; pinning them to null would
+    reject the first value a later chunk has.
+    """
+    return pa.schema(
+        [
+            field.with_type(pa.string()) if pa.types.is_null(field.type) else field
+            for field in schema
+        ]
+    )
+
+
+def read_csv_chunks(input_path: Path, chunk_size_mb: int = CHUNK_SIZE_MB) -> Iterator[pa.Table]:
+    """Read a CSV file as a sequence of tables, one chunk of the file at a time.
+
+    Each chunk is about ``chunk_size_mb`` of the file, extended to the end of
+    its last line. Column types are inferred from the first chunk and used
+    for every later chunk, so all the tables share one schema. Columns that
+    are blank throughout the first chunk are read as strings. As with
+    pyarrow's defaults, quoted values must not contain line breaks.
+
+    Args:
+        input_path: Path to the CSV file.
+        chunk_size_mb: Size of each chunk, in megabytes.
+
+    Yields:
+        One table per chunk.
+
+    Raises:
+        pyarrow.ArrowInvalid: If a value in a later chunk does not fit the
+            type inferred from the first chunk.
+    """
+    chunk_bytes = chunk_size_mb * 1024 * 1024
+    convert_options = None
+    with open(input_path, "rb") as f:
+        header = f.readline()
+        while chunk := f.read(chunk_bytes):
+            chunk += f.readline()
+            table = pa_csv.read_csv(io.BytesIO(header + chunk), convert_options=convert_options)
+            if convert_options is None:
+                table = table.cast(_widen_null_columns(table.schema))
+                logger.info(f"Schema from first chunk: {table.schema}")
+                convert_options = pa_csv.ConvertOptions(column_types=table.schema)
+            yield table
+
+
+def csv_to_parquet(input_path: Path, output_path: Path, chunk_size_mb: int = CHUNK_SIZE_MB) -> int:
+    """Convert a CSV file to Parquet, writing one row group per chunk.
+
+    Chunks are written as they are read, so memory use depends on the chunk
+    size and not on the size of the file. They are written to a temporary file
+    next to ``output_path``, which replaces it only once every chunk has been
+    written, so a failed conversion never leaves a partial Parquet file.
+
+    Args:
+        input_path: Path to the CSV file.
+        output_path: Path where the Parquet file will be saved.
+        chunk_size_mb: Size of each chunk read from the CSV, in megabytes.
+
+    Returns:
+        Number of rows written.
+
+    Raises:
+        ValueError: If the CSV file has no data rows.
+        pyarrow.ArrowInvalid: If a value in a later chunk does not fit the
+            type inferred from the first chunk.
+    """
+    rows = 0
+    writer = None
+    partial_path = output_path.with_name(f".{output_path.name}.partial")
+    try:
+        for table in tqdm(read_csv_chunks(input_path, chunk_size_mb), desc="Chunks", unit="chunk"):
+            # ---- TRANSFORM EACH CHUNK HERE, KEEPING ITS SCHEMA ----
+            if writer is None:
+                output_path.parent.mkdir(parents=True, exist_ok=True)
+                writer = pq.ParquetWriter(partial_path, table.schema)
+            writer.write_table(table, row_group_size=table.num_rows)
+            rows += table.num_rows
+    except BaseException:
+        if writer is not None:
+            writer.close()
+            partial_path.unlink(missing_ok=True)
+        raise
+
+    if writer is None:
+        raise ValueError(f"{input_path} has no data rows")
+    writer.close()
+    os.replace(partial_path, output_path)
+    return rows
+
 
 @app.command()
 def main(
     # ---- REPLACE DEFAULT PATHS AS APPROPRIATE ----
     input_path: Path = RAW_DATA_DIR / "dataset.csv",
-    output_path: Path = PROCESSED_DATA_DIR / "dataset.csv",
+    output_path: Path = PROCESSED_DATA_DIR / "dataset.parquet",
     # ----------------------------------------------
+    chunk_size_mb: int = CHUNK_SIZE_MB,
 ) -> None:
     """Process raw data into cleaned dataset.
 
     Args:
         input_path: Path to the raw input data file.
         output_path: Path where processed data will be saved.
+        chunk_size_mb: Size of each chunk read from the CSV, in megabytes.
     """
-    # ---- REPLACE THIS WITH YOUR OWN CODE ----
     logger.info("Processing dataset...")
-    for i in tqdm(range(10), total=10):
-        if i == 5:
-            logger.info("Something happened for iteration 5.")
-    logger.success("Processing dataset complete.")
-    # -----------------------------------------
+    rows = csv_to_parquet(input_path, output_path, chunk_size_mb)
+    logger.success(f"Processing dataset complete: {rows} rows written to {output_path}.")
 
 
 if __name__ == "__main__":
+    configure_logging()
     app()
@@ -11,6 +11,7 @@ from tqdm import tqdm
 import typer
 
 from {{ cookiecutter.module_name }}.config import PROCESSED_DATA_DIR
+from {{ cookiecutter.module_name }}.logs import configure_logging
 
 app = typer.Typer()
 
@@ -38,4 +39,5 @@ def main(
 
 
 if __name__ == "__main__":
+    configure_logging()
     app()
@@ -11,6 +11,7 @@ from tqdm import tqdm
 import typer
 
 from {{ cookiecutter.module_name }}.config import MODELS_DIR, PROCESSED_DATA_DIR
+from {{ cookiecutter.module_name }}.logs import configure_logging
 
 app = typer.Typer()
 
@@ -40,4 +41,5 @@ def main(
 
 
 if __name__ == "__main__":
+    configure_logging()
     app()